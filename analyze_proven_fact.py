@@ -13,14 +13,44 @@ Changes from v1.1.0:
   BUG-C : generate_referee_analysis() – v1.1.0 실제 주기로 수정 (5n/5n-3, 7n/7n-3/7n-5)
   NEW   : redundancy 분석 섹션 추가
   NEW   : confirmed_logic 통계 표시
+  PERF-11 : 여러 결과 파일(디렉토리 / glob) 집계 분석 – 워커 프로세스에서 파일별 요약 행으로
+            축약한 뒤 주제 / 스테이지 / 심판 수별 교차 표를 한 번에 생성 (AggregateAnalyzer)
+  PERF-12 : ResultsFileReader – 필요한 최상위 섹션만 증분 파싱 (ijson, 없으면 내장 스캐너).
+            all_records는 접근 시에만 로드, --summary-only / 집계 워커는 레코드를 스트리밍
+  PERF-13 : AnalysisFrames – 레코드 / 할루시네이션을 한 번만 컬럼형으로 만들고
+            모든 표와 그림을 pandas group-by (없으면 단일 패스 파이썬)로 계산
+  PERF-14 : ReportRenderer – 그림 / LaTeX / JSON 출력을 프로세스 풀에서 렌더링,
+            입력 해시가 같으면 재렌더링 생략 (.render_cache.json), --preview 저해상도
+  PERF-15 : AnalysisCache – 계산된 요약(표 / 분석 / 집계 행)을 결과 파일 옆 sidecar에 저장.
+            size + mtime이 같으면 바로 사용, mtime만 다르면 sha256으로 내용 확인.
+            --summary-only는 기존 캐시를 읽기만 하고 (--cache-dir를 주면 그곳에 기록),
+            집계 모드는 결과 디렉토리 대신 <output>/.analysis_cache/에 기록
+  PERF-16 : 심판 reset 분석이 referee_schedule.RefereeResetScheduler를 공유 (N명 심판)
 """
 
+import csv
+import functools
+import glob
+import hashlib
 import json
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import argparse
 
+from referee_schedule import RefereeResetScheduler
+
+try:
+    import ijson
+    _IJSON = True
+    _PARSE_ERRORS: Tuple[type, ...] = (ValueError, ijson.JSONError)
+except ImportError:
+    _IJSON = False
+    _PARSE_ERRORS = (ValueError,)
+
 try:
     import pandas as pd
     _PANDAS = True
@@ -37,75 +67,633 @@ except ImportError:
     _MATPLOTLIB = False
 
 
+# ---------------------------------------------------------------------------
+# PERF-12 : Lazy / streaming results loader
+# ---------------------------------------------------------------------------
+# 문자열 토큰 | 구조 문자 | 닫히지 않은 문자열 시작 (→ 다음 청크 필요)
+_SCAN_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\],:]|"')
+
+
+def _builtin_scan(f, load_keys, stream_keys, chunk_size: int = 1 << 20) -> Iterator[Tuple]:
+    """
+    최상위 JSON 객체를 청크 단위로 훑으며 이벤트를 yield 한다.
+      ("value", key, obj) : load_keys 섹션 전체
+      ("item",  key, obj) : stream_keys 배열의 원소 하나씩
+      ("end",   key, None): stream_keys 배열 끝
+    원하는 섹션이 모두 나오면 파일 끝까지 읽지 않고 멈춘다.
+    버퍼에는 현재 캡처 중인 값(또는 배열 원소 1개)만 유지된다.
+    """
+    remaining = set(load_keys) | set(stream_keys)
+    buf, pos, eof = "", 0, False
+    depth, expect_key = 0, False
+    key, mode = None, None
+    value_start: Optional[int] = None      # load 모드: 섹션 값 시작 위치
+    item_start: Optional[int] = None       # stream 모드: 현재 원소 시작 위치
+
+    while remaining:
+        m = _SCAN_TOKEN_RE.search(buf, pos)
+        if m is None or m.group() == '"':
+            if eof:
+                if m is None and depth == 0 and not buf[pos:].strip():
+                    return
+                raise ValueError("Unexpected end of JSON data")
+            resume = m.start() if m else len(buf)
+            cut = min(x for x in (resume, value_start, item_start) if x is not None)
+            buf, pos = buf[cut:], resume - cut
+            value_start = None if value_start is None else value_start - cut
+            item_start = None if item_start is None else item_start - cut
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buf += chunk
+            continue
+
+        tok, pos = m.group(), m.end()
+        if tok[0] == '"':
+            if depth == 1 and expect_key:
+                key, expect_key = json.loads(tok), False
+            continue
+
+        if tok == ':':
+            if depth == 1:
+                mode = "load" if key in load_keys else "stream" if key in stream_keys else None
+                value_start = pos if mode == "load" else None
+            continue
+
+        if tok in '{[':
+            depth += 1
+            if depth == 1:
+                if tok != '{':
+                    raise ValueError("Results file must contain a JSON object")
+                expect_key = True
+            elif depth == 2 and mode == "stream" and tok == '[':
+                item_start = pos
+            continue
+
+        # ',' '}' ']'
+        if mode == "stream" and depth == 2 and item_start is not None:
+            text = buf[item_start:m.start()].strip()
+            if text:
+                yield ("item", key, json.loads(text))
+            item_start = pos if tok == ',' else None
+        if tok in '}]':
+            depth -= 1
+        if depth == 1 and tok == ',' or depth == 0 and tok == '}':
+            if mode == "load":
+                yield ("value", key, json.loads(buf[value_start:m.start()]))
+            elif mode == "stream":
+                yield ("end", key, None)
+            remaining.discard(key)
+            mode, value_start, expect_key = None, None, True
+            if depth == 0:
+                return
+
+
+def _ijson_scan(f, load_keys, stream_keys) -> Iterator[Tuple]:
+    """_builtin_scan과 같은 이벤트를 ijson 이벤트 스트림으로 만든다."""
+    remaining = set(load_keys) | set(stream_keys)
+    depth, key, mode, builder = 0, None, None, None
+
+    for _prefix, event, value in ijson.parse(f, use_float=True):
+        if depth == 1 and event == 'map_key':
+            key = value
+            mode = "load" if key in load_keys else "stream" if key in stream_keys else None
+            continue
+        opening = event in ('start_map', 'start_array')
+        if event in ('end_map', 'end_array'):
+            depth -= 1
+        level = depth                       # 이 이벤트가 속한 깊이
+
+        target = 1 if mode == "load" else 2 if mode == "stream" else None
+        if target is not None and level >= target:
+            if level == target and not opening and builder is None:     # 스칼라 값 / 원소
+                yield ("value" if mode == "load" else "item", key, value)
+            else:
+                if level == target and opening:
+                    builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                if level == target and not opening:
+                    yield ("value" if mode == "load" else "item", key, builder.value)
+                    builder = None
+        if level == 1 and not opening and mode is not None:
+            # 값 끝: load → 위에서 yield 완료, stream → 배열 종료(또는 null 등 스칼라)
+            if mode == "stream":
+                yield ("end", key, None)
+            remaining.discard(key)
+            mode = None
+            if not remaining:
+                return
+        if opening:
+            depth += 1
+
+
+class ResultsFileReader:
+    """
+    Incremental access to top-level sections of a results JSON file.
+
+    • load(*keys)       : 필요한 섹션만 dict로 (all_records / sft_data 같은 큰 섹션은 건너뜀)
+    • iter_items(key)   : 배열 섹션의 원소를 하나씩 (전체 배열을 메모리에 올리지 않음)
+    • scan(load, stream): 위 두 가지를 파일 한 번 읽기로 – 이벤트 튜플 generator
+    ijson이 설치되어 있으면 사용하고, 없으면 내장 정규식 스캐너를 쓴다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def scan(self, load: Iterable[str] = (), stream: Iterable[str] = ()) -> Iterator[Tuple]:
+        load, stream = frozenset(load), frozenset(stream)
+        if _IJSON:
+            with open(self.path, 'rb') as f:
+                yield from _ijson_scan(f, load, stream)
+        else:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                yield from _builtin_scan(f, load, stream)
+
+    def load(self, *keys: str) -> Dict:
+        return {key: value for _kind, key, value in self.scan(load=keys)}
+
+    def iter_items(self, key: str) -> Iterator:
+        for kind, _key, value in self.scan(stream=(key,)):
+            if kind == "item":
+                yield value
+
+
+# ---------------------------------------------------------------------------
+# PERF-15 : Sidecar analysis cache
+# ---------------------------------------------------------------------------
+class AnalysisCache:
+    """
+    Computed analysis results stored next to a results file.
+
+    <dir>/.<results name>.analysis_cache.json
+      {"version", "size", "mtime_ns", "sha256", "entries": {이름: 값}}
+    cache_dir를 주면 <cache_dir>/<results name>.<디렉토리 해시>.analysis_cache.json
+    (결과 디렉토리에는 아무것도 쓰지 않는다).
+    유효성: size + mtime_ns가 같으면 그대로 사용. size만 같고 mtime이 다르면
+    (복사 / touch) 내용 sha256을 다시 계산해 같을 때만 사용하고 mtime을 갱신한다.
+    write=False면 읽기 전용 (계산 결과는 이 인스턴스 안에서만 재사용).
+    sidecar를 쓸 수 없는 디렉토리(읽기 전용)에서는 조용히 캐시 없이 동작한다.
+    """
+
+    VERSION = 1                  # 분석 로직이 바뀌면 올려서 전체 무효화
+    SUFFIX = ".analysis_cache.json"
+
+    def __init__(self, results_file: str, enabled: bool = True,
+                 cache_dir: Optional[str] = None, write: bool = True):
+        self.results_file = results_file
+        directory, name = os.path.split(results_file)
+        if cache_dir:
+            # 다른 디렉토리의 같은 파일 이름이 섞이지 않도록 디렉토리 해시를 붙인다
+            tag = hashlib.sha1(os.path.abspath(directory).encode('utf-8')).hexdigest()[:10]
+            self.path = os.path.join(cache_dir, f"{name}.{tag}{self.SUFFIX}")
+        else:
+            self.path = os.path.join(directory, f".{name}{self.SUFFIX}")
+        self.enabled = enabled
+        self.write = write
+        self._entries: Optional[Dict] = None
+        self._sha256: Optional[str] = None
+
+    def _file_sha256(self) -> str:
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            with open(self.results_file, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(block)
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+    def _load(self) -> Dict:
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        if not self.enabled:
+            return self._entries
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            st = os.stat(self.results_file)
+        except (OSError, ValueError):
+            return self._entries
+        if cached.get('version') != self.VERSION or cached.get('size') != st.st_size:
+            return self._entries
+        if cached.get('mtime_ns') != st.st_mtime_ns:
+            if cached.get('sha256') != self._file_sha256():
+                return self._entries
+            self._entries = cached.get('entries', {})
+            self._save()                                   # mtime 갱신
+            return self._entries
+        self._sha256 = cached.get('sha256')
+        self._entries = cached.get('entries', {})
+        return self._entries
+
+    def _save(self):
+        if not self.write:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            st = os.stat(self.results_file)
+            payload = {'version': self.VERSION, 'size': st.st_size,
+                       'mtime_ns': st.st_mtime_ns, 'sha256': self._file_sha256(),
+                       'entries': self._entries}
+            tmp = f"{self.path}.tmp{os.getpid()}"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def get(self, name: str):
+        return self._load().get(name)
+
+    def put(self, name: str, value):
+        if not self.enabled:
+            return
+        self._load()[name] = value
+        self._save()
+
+
+def cached_analysis(name: str):
+    """ProvenFactAnalyzer 메서드 결과를 self.cache에 저장 / 재사용하는 데코레이터."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self):
+            value = self.cache.get(name)
+            if value is None:
+                value = method(self)
+                self.cache.put(name, value)
+            return value
+        return wrapper
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Table helpers
+# ---------------------------------------------------------------------------
+def generate_latex_table(rows: List[Dict], caption: str = "", label: str = "") -> str:
+    if not rows:
+        return ""
+    columns = list(rows[0].keys())
+    latex = "\\begin{table}[h]\n\\centering\n"
+    if caption:
+        latex += f"\\caption{{{caption}}}\n"
+    if label:
+        latex += f"\\label{{{label}}}\n"
+    latex += "\\begin{tabular}{" + "l" * len(columns) + "}\n\\hline\n"
+    latex += " & ".join(columns) + " \\\\\n\\hline\n"
+    for row in rows:
+        latex += " & ".join(str(row.get(c, '')) for c in columns) + " \\\\\n"
+    latex += "\\hline\n\\end{tabular}\n\\end{table}\n"
+    return latex
+
+
+def print_table(rows: List[Dict]):
+    if not rows:
+        print("  (none)")
+        return
+    if _PANDAS:
+        print(pd.DataFrame(rows).to_string(index=False))
+        return
+    headers = list(rows[0].keys())
+    print("  " + "  ".join(f"{h:>14}" for h in headers))
+    for row in rows:
+        print("  " + "  ".join(f"{str(row[h]):>14}" for h in headers))
+
+
+# ---------------------------------------------------------------------------
+# PERF-13 : Columnar analysis frames
+# ---------------------------------------------------------------------------
+class AnalysisFrames:
+    """
+    Columnar view of records and hallucinations, built in a single pass.
+
+    records        : session, exchange, tokens, redundant
+    hallucinations : session, professor, type, severity
+    pandas가 있으면 DataFrame + group-by, 없으면 dict-of-lists + 단일 패스 집계.
+    모든 반환값은 파이썬 기본 타입 (JSON 직렬화 가능).
+    """
+
+    RECORD_COLUMNS = ('session', 'exchange', 'tokens', 'redundant')
+    HALLUCINATION_COLUMNS = ('session', 'professor', 'type', 'severity')
+
+    def __init__(self, records: Iterable[Dict], hallucinations: Iterable[Dict]):
+        rec: Dict[str, list] = {c: [] for c in self.RECORD_COLUMNS}
+        for r in records:
+            rec['session'].append(r.get('session', -1))
+            rec['exchange'].append(r.get('exchange', 0))
+            rec['tokens'].append(r.get('estimated_tokens', 0))
+            rec['redundant'].append(
+                r.get('redundancy_assessment', {}).get('status') == 'redundant')
+
+        hal: Dict[str, list] = {c: [] for c in self.HALLUCINATION_COLUMNS}
+        for h in hallucinations:
+            hal['session'].append(h.get('session', -1))
+            hal['professor'].append(h.get('professor_index', -1))
+            hal['type'].append(h.get('type', 'unknown'))
+            hal['severity'].append(h.get('severity', 'unknown'))
+
+        if _PANDAS:
+            self.records = pd.DataFrame(rec, columns=list(self.RECORD_COLUMNS))
+            self.hallucinations = pd.DataFrame(hal, columns=list(self.HALLUCINATION_COLUMNS))
+        else:
+            self.records = rec
+            self.hallucinations = hal
+
+    # ------------------------------------------------------------------
+    def record_totals(self) -> Dict[str, int]:
+        if _PANDAS:
+            df = self.records
+            return {'exchanges': int(len(df)), 'redundant': int(df['redundant'].sum()),
+                    'tokens': int(df['tokens'].sum())}
+        return {'exchanges': len(self.records['session']),
+                'redundant': sum(self.records['redundant']),
+                'tokens': sum(self.records['tokens'])}
+
+    def hallucination_counts(self, column: str) -> Dict:
+        """column 값별 할루시네이션 수 (첫 등장 순서)."""
+        if _PANDAS:
+            counts = self.hallucinations[column].value_counts(sort=False)
+            return {k.item() if hasattr(k, 'item') else k: int(v) for k, v in counts.items()}
+        counts: Dict = {}
+        for value in self.hallucinations[column]:
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+    def per_session(self) -> List[Dict]:
+        """레코드가 있는 세션별 exchanges / tokens / redundant / hallucinations (세션 오름차순)."""
+        hall = self.hallucination_counts('session')
+        if _PANDAS:
+            grouped = self.records.groupby('session', sort=True).agg(
+                exchanges=('exchange', 'size'), tokens=('tokens', 'sum'),
+                redundant=('redundant', 'sum'))
+            return [{'session': int(sn), 'exchanges': int(row.exchanges),
+                     'tokens': int(row.tokens), 'redundant': int(row.redundant),
+                     'hallucinations': hall.get(int(sn), 0)}
+                    for sn, row in grouped.iterrows()]
+        sessions: Dict[int, Dict] = {}
+        for sn, tokens, redundant in zip(self.records['session'], self.records['tokens'],
+                                         self.records['redundant']):
+            row = sessions.setdefault(sn, {'session': sn, 'exchanges': 0, 'tokens': 0,
+                                           'redundant': 0, 'hallucinations': hall.get(sn, 0)})
+            row['exchanges'] += 1
+            row['tokens'] += tokens
+            row['redundant'] += int(redundant)
+        return [sessions[sn] for sn in sorted(sessions)]
+
+
+# ---------------------------------------------------------------------------
+# PERF-14 : Report rendering (module-level → 프로세스 풀에서 실행 가능)
+# ---------------------------------------------------------------------------
+REPORT_DPI = 300
+PREVIEW_DPI = 72
+
+_SEVERITY_COLORS = {'Critical': '#d62728', 'High': '#ff7f0e',
+                    'Medium': '#ffbb78', 'Low': '#aec7e8'}
+
+
+def _finish_plot(output_file: Optional[str], dpi: int) -> str:
+    plt.tight_layout()
+    if output_file:
+        plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
+        message = f"  📊 Plot saved: {output_file}"
+    else:
+        plt.show()
+        message = ""
+    plt.close()
+    return message
+
+
+def render_severity_plot(output_file: Optional[str], data: List[Dict], dpi: int = REPORT_DPI) -> str:
+    if not _MATPLOTLIB:
+        return "  ⚠️  matplotlib not installed – skipping plot."
+    labels = [d['Severity'] for d in data]
+    counts = [d['Count'] for d in data]
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bars = ax.bar(labels, counts,
+                  color=[_SEVERITY_COLORS[l] for l in labels], alpha=0.8)
+    ax.set_xlabel('Severity Level', fontsize=12)
+    ax.set_ylabel('Count', fontsize=12)
+    ax.set_title('Hallucination Distribution by Severity', fontsize=14, fontweight='bold')
+    ax.grid(axis='y', alpha=0.3)
+
+    for bar, count in zip(bars, counts):
+        ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1,
+                str(count), ha='center', va='bottom', fontsize=10)
+    return _finish_plot(output_file, dpi)
+
+
+def render_session_plot(output_file: Optional[str], sessions: List[int], counts: List[int],
+                        dpi: int = REPORT_DPI) -> str:
+    if not _MATPLOTLIB:
+        return "  ⚠️  matplotlib not installed – skipping plot."
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.bar(sessions, counts, color='coral', alpha=0.7)
+    ax.set_xlabel('Session Number', fontsize=12)
+    ax.set_ylabel('Hallucinations Detected', fontsize=12)
+    ax.set_title('Hallucination Count per Session', fontsize=14, fontweight='bold')
+    ax.set_xticks(sessions)
+    ax.grid(axis='y', alpha=0.3)
+    return _finish_plot(output_file, dpi)
+
+
+def render_latex_tables(output_file: str, tables: List[Dict], dpi: int = REPORT_DPI) -> str:
+    """tables: [{"comment", "rows", "caption", "label"}]"""
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write("\n\n".join(
+            f"% {t['comment']}\n" + generate_latex_table(t['rows'], caption=t['caption'],
+                                                         label=t['label'])
+            for t in tables
+        ))
+    return f"  📄 LaTeX tables saved: {output_file}"
+
+
+def render_json(output_file: str, payload: Dict, dpi: int = REPORT_DPI) -> str:
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, indent=2, ensure_ascii=False)
+    return f"  📄 Summary JSON saved: {output_file}"
+
+
+def _render_task(func_name: str, output_file: str, payload: Dict, dpi: int) -> str:
+    return _RENDER_FUNCTIONS[func_name](output_file, dpi=dpi, **payload)
+
+
+_RENDER_FUNCTIONS: Dict[str, Callable[..., str]] = {
+    'severity_plot': render_severity_plot,
+    'session_plot': render_session_plot,
+    'latex_tables': render_latex_tables,
+    'json': render_json,
+}
+
+
+class ReportRenderer:
+    """
+    Renders queued report artefacts, in parallel, skipping unchanged outputs.
+
+    • add()로 (렌더 함수, 출력 파일, 입력 데이터)를 쌓고 run()에서 한 번에 렌더링.
+      여러 실행의 리포트를 하나의 renderer에 모으면 전체가 한 풀에서 병렬 처리된다.
+    • 입력 해시(함수 + 데이터 + dpi)가 출력 디렉토리의 .render_cache.json과 같고
+      파일이 남아 있으면 렌더링하지 않는다.
+    • preview=True → PREVIEW_DPI (빠른 확인용 저해상도)
+    """
+
+    CACHE_FILE = ".render_cache.json"
+    VERSION = 1                  # 렌더 함수가 바뀌면 올려서 캐시 무효화
+
+    def __init__(self, workers: Optional[int] = None, preview: bool = False,
+                 use_cache: bool = True):
+        self.workers = workers or os.cpu_count() or 1
+        self.dpi = PREVIEW_DPI if preview else REPORT_DPI
+        self.use_cache = use_cache
+        self.tasks: List[Tuple[str, str, Dict, str]] = []
+        self.stats = {'rendered': 0, 'cached': 0}
+
+    def add(self, func_name: str, output_file: str, **payload):
+        key = hashlib.sha256(json.dumps(
+            {'v': self.VERSION, 'f': func_name, 'dpi': self.dpi, 'payload': payload},
+            sort_keys=True, ensure_ascii=False, default=str
+        ).encode('utf-8')).hexdigest()
+        self.tasks.append((func_name, str(output_file), payload, key))
+
+    @classmethod
+    def _load_cache(cls, directory: str) -> Dict[str, str]:
+        try:
+            with open(os.path.join(directory, cls.CACHE_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def run(self) -> List[str]:
+        tasks, self.tasks = self.tasks, []
+        caches: Dict[str, Dict[str, str]] = {}
+        pending = []
+        for func_name, output_file, payload, key in tasks:
+            directory, name = os.path.split(os.path.abspath(output_file))
+            cache = caches.setdefault(directory, self._load_cache(directory))
+            if self.use_cache and cache.get(name) == key and os.path.exists(output_file):
+                self.stats['cached'] += 1
+                continue
+            pending.append((func_name, output_file, payload, key))
+
+        messages = []
+        if self.workers <= 1 or len(pending) <= 1:
+            for func_name, output_file, payload, _key in pending:
+                messages.append(_render_task(func_name, output_file, payload, self.dpi))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+                futures = [pool.submit(_render_task, func_name, output_file, payload, self.dpi)
+                           for func_name, output_file, payload, _key in pending]
+                messages = [f.result() for f in as_completed(futures)]
+
+        for func_name, output_file, payload, key in pending:
+            directory, name = os.path.split(os.path.abspath(output_file))
+            caches[directory][name] = key
+        for directory, cache in caches.items():
+            with open(os.path.join(directory, self.CACHE_FILE), 'w', encoding='utf-8') as f:
+                json.dump(cache, f, indent=2)
+        self.stats['rendered'] += len(pending)
+        return [m for m in messages if m]
+
+
 # ---------------------------------------------------------------------------
 # Core Analyzer
 # ---------------------------------------------------------------------------
 class ProvenFactAnalyzer:
-    """Analyze and visualize proven fact simulation results."""
+    """
+    Analyze and visualize proven fact simulation results.
 
-    def __init__(self, results_file: str):
-        try:
-            with open(results_file, 'r', encoding='utf-8') as f:
-                self.data = json.load(f)
-        except json.JSONDecodeError as e:
-            print(f"  ❌ Failed to parse JSON in '{results_file}': {e}")
-            print(f"      The file may be corrupted or incomplete.")
-            raise SystemExit(1)
-        except FileNotFoundError:
-            print(f"  ❌ Results file not found: {results_file}")
-            raise SystemExit(1)
-
-        self.metadata = self.data.get('metadata', {})
-        self.all_records = self.data.get('all_records', [])
-        self.hallucinations = self.data.get('hallucinations', [])
-        self.hallucination_summary = self.data.get('hallucination_summary', {})
-        self.final_audit = self.data.get('final_audit', {})
-        self.confirmed_logic = self.data.get('confirmed_logic', [])
+    PERF-12 : 요약 섹션만 먼저 증분 로드. all_records는 처음 접근할 때 로드하고,
+              요약 통계는 레코드를 메모리에 올리지 않고 스트리밍으로 계산한다.
+    PERF-13 : 표 / 그림은 모두 self.frames (AnalysisFrames) 집계에서 나온다.
+    PERF-15 : 요약 결과는 self.cache (AnalysisCache)에 저장. 캐시가 유효하면
+              결과 파일을 전혀 파싱하지 않는다 (섹션은 처음 접근할 때 로드).
+    """
+
+    # 한 번에 읽는 작은 섹션 (all_records / sft_data 제외)
+    SUMMARY_SECTIONS = ('metadata', 'stage_boundaries', 'confirmed_logic',
+                        'hallucinations', 'hallucination_summary', 'final_audit')
+
+    def __init__(self, results_file: str, use_cache: bool = True,
+                 cache_dir: Optional[str] = None, write_cache: bool = True):
+        self.results_file = results_file
+        self.reader = ResultsFileReader(results_file)
+        self.cache = AnalysisCache(results_file, enabled=use_cache,
+                                   cache_dir=cache_dir, write=write_cache)
+        self._sections: Optional[Dict] = None
+        self._records: Optional[List[Dict]] = None
+        self._data: Optional[Dict] = None
+        self._frames: Optional[AnalysisFrames] = None
+
+    def _section(self, key: str, default):
+        if self._sections is None:
+            try:
+                self._sections = self.reader.load(*self.SUMMARY_SECTIONS)
+            except _PARSE_ERRORS as e:
+                print(f"  ❌ Failed to parse JSON in '{self.results_file}': {e}")
+                print(f"      The file may be corrupted or incomplete.")
+                raise SystemExit(1)
+            except FileNotFoundError:
+                print(f"  ❌ Results file not found: {self.results_file}")
+                raise SystemExit(1)
+        return self._sections.get(key) or default
+
+    metadata = property(lambda self: self._section('metadata', {}))
+    stage_boundaries = property(lambda self: self._section('stage_boundaries', []))
+    hallucinations = property(lambda self: self._section('hallucinations', []))
+    hallucination_summary = property(lambda self: self._section('hallucination_summary', {}))
+    final_audit = property(lambda self: self._section('final_audit', {}))
+    confirmed_logic = property(lambda self: self._section('confirmed_logic', []))
 
     # ------------------------------------------------------------------
-    def generate_session_table(self) -> List[Dict]:
-        """Generate session-by-session performance data."""
-        # 세션별로 기록 그룹화
-        sessions: Dict[int, list] = {}
-        for record in self.all_records:
-            sessions.setdefault(record['session'], []).append(record)
+    @property
+    def all_records(self) -> List[Dict]:
+        if self._records is None:
+            self._records = self.reader.load('all_records').get('all_records', [])
+        return self._records
 
-        # 세션별 hallucination 카운트 (session 필드 기반)
-        hall_per_session: Dict[int, int] = {}
-        for h in self.hallucinations:
-            s = h.get('session', -1)
-            hall_per_session[s] = hall_per_session.get(s, 0) + 1
+    @property
+    def data(self) -> Dict:
+        """결과 파일 전체 (호환용 – 필요할 때만 전체 로드)."""
+        if self._data is None:
+            with open(self.results_file, 'r', encoding='utf-8') as f:
+                self._data = json.load(f)
+        return self._data
 
-        table = []
-        for sn in sorted(sessions.keys()):
-            records = sessions[sn]
-            total_tokens = sum(r.get('estimated_tokens', 0) for r in records)
-            hall_count = hall_per_session.get(sn, 0)
+    def iter_records(self) -> Iterator[Dict]:
+        """이미 로드된 레코드가 있으면 그것을, 없으면 파일에서 스트리밍."""
+        if self._records is not None:
+            return iter(self._records)
+        return self.reader.iter_items('all_records')
 
-            # redundancy 체크
-            redundant = sum(1 for r in records
-                            if r.get('redundancy_assessment', {}).get('status') == 'redundant')
+    @property
+    def frames(self) -> AnalysisFrames:
+        if self._frames is None:
+            self._frames = AnalysisFrames(self.iter_records(), self.hallucinations)
+        return self._frames
 
+    # ------------------------------------------------------------------
+    @cached_analysis('session_table')
+    def generate_session_table(self) -> List[Dict]:
+        """Generate session-by-session performance data."""
+        table = []
+        for row in self.frames.per_session():
+            hall_count = row['hallucinations']
             table.append({
-                'Session': sn,
-                'Exchanges': len(records),
-                'Est. Tokens': total_tokens,
+                'Session': row['session'],
+                'Exchanges': row['exchanges'],
+                'Est. Tokens': row['tokens'],
                 'Hallucinations': hall_count,
-                'Redundant': redundant,
+                'Redundant': row['redundant'],
                 'Status': '✓ Clean' if hall_count == 0 else f'⚠ {hall_count} issues'
             })
         return table
 
     # ------------------------------------------------------------------
+    @cached_analysis('summary_statistics')
     def generate_summary_statistics(self) -> Dict:
         total_sessions = self.metadata.get('total_sessions', 0)
-        total_exchanges = len(self.all_records)
 
-        # redundancy 통계
-        redundant_count = sum(
-            1 for r in self.all_records
-            if r.get('redundancy_assessment', {}).get('status') == 'redundant'
-        )
+        # redundancy 통계 (PERF-12/13: 스트리밍으로 만든 컬럼형 frame에서 집계)
+        totals = self.frames.record_totals()
+        total_exchanges, redundant_count = totals['exchanges'], totals['redundant']
         redundancy_rate = redundant_count / max(1, total_exchanges)
 
         return {
@@ -127,6 +715,7 @@ class ProvenFactAnalyzer:
         }
 
     # ------------------------------------------------------------------
+    @cached_analysis('severity_distribution')
     def analyze_hallucinations_by_severity(self) -> List[Dict]:
         sev = self.hallucination_summary.get('by_severity', {})
         return [
@@ -137,32 +726,19 @@ class ProvenFactAnalyzer:
         ]
 
     # ------------------------------------------------------------------
-    # BUG-C 수정 : v1.1.0 실제 주기 반영
+    # BUG-C 수정 : v1.1.0 실제 주기 반영 (PERF-16: N명 일반화)
+    @cached_analysis('referee_analysis')
     def generate_referee_analysis(self) -> Dict:
         num_referees = self.metadata.get('num_referees', 2)
         total_sessions = self.metadata.get('total_sessions', 0)
 
-        if num_referees == 2:
-            # 5n : 리셋 횟수 = total_sessions // 5
-            # 5n-3 : 리셋 횟수 = (total_sessions + 3) // 5  (근사)
-            reset_counts = [
-                total_sessions // 5,
-                (total_sessions + 3) // 5
-            ]
-            schedule_labels = ["5n (5,10,15…)", "5n-3 (2,7,12…)"]
-        else:  # 3 referees
-            reset_counts = [
-                total_sessions // 7,
-                (total_sessions + 3) // 7,
-                (total_sessions + 5) // 7
-            ]
-            schedule_labels = ["7n (7,14,21…)", "7n-3 (4,11,18…)", "7n-5 (2,9,16…)"]
+        # PERF-16 : proven_fact_system과 같은 스케줄러 (N명 심판, 정확한 횟수)
+        scheduler = RefereeResetScheduler(num_referees)
+        reset_counts = scheduler.reset_counts(total_sessions)
+        schedule_labels = scheduler.labels
 
         # hallucination type별 분류
-        type_counts: Dict[str, int] = {}
-        for h in self.hallucinations:
-            t = h.get('type', 'unknown')
-            type_counts[t] = type_counts.get(t, 0) + 1
+        type_counts = self.frames.hallucination_counts('type')
 
         return {
             'Number of Referees': num_referees,
@@ -175,12 +751,10 @@ class ProvenFactAnalyzer:
 
     # ------------------------------------------------------------------
     # NEW : Redundancy 분석
+    @cached_analysis('redundancy_analysis')
     def analyze_redundancy(self) -> Dict:
-        total = len(self.all_records)
-        redundant = sum(
-            1 for r in self.all_records
-            if r.get('redundancy_assessment', {}).get('status') == 'redundant'
-        )
+        totals = self.frames.record_totals()
+        total, redundant = totals['exchanges'], totals['redundant']
         progressive = total - redundant
         # 토큰 절약 추정 (redundant 교환당 평균 2000 토큰)
         avg_tokens = 2000
@@ -199,209 +773,404 @@ class ProvenFactAnalyzer:
 
     # ------------------------------------------------------------------
     # Plots
-    def plot_severity_distribution(self, output_file: str = None):
-        if not _MATPLOTLIB:
-            print("  ⚠️  matplotlib not installed – skipping plot.")
-            return
-
-        data = self.analyze_hallucinations_by_severity()
-        labels = [d['Severity'] for d in data]
-        counts = [d['Count'] for d in data]
-
-        colors = {'Critical': '#d62728', 'High': '#ff7f0e',
-                  'Medium': '#ffbb78', 'Low': '#aec7e8'}
-
-        fig, ax = plt.subplots(figsize=(10, 6))
-        bars = ax.bar(labels, counts,
-                      color=[colors[l] for l in labels], alpha=0.8)
-        ax.set_xlabel('Severity Level', fontsize=12)
-        ax.set_ylabel('Count', fontsize=12)
-        ax.set_title('Hallucination Distribution by Severity', fontsize=14, fontweight='bold')
-        ax.grid(axis='y', alpha=0.3)
-
-        for bar, count in zip(bars, counts):
-            ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.1,
-                    str(count), ha='center', va='bottom', fontsize=10)
-
-        plt.tight_layout()
-        if output_file:
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
-            print(f"  📊 Plot saved: {output_file}")
-        else:
-            plt.show()
-        plt.close()
+    def plot_severity_distribution(self, output_file: str = None, dpi: int = REPORT_DPI):
+        message = render_severity_plot(output_file, self.analyze_hallucinations_by_severity(), dpi)
+        if message:
+            print(message)
 
     # ------------------------------------------------------------------
-    def plot_hallucinations_per_session(self, output_file: str = None):
-        if not _MATPLOTLIB:
-            print("  ⚠️  matplotlib not installed – skipping plot.")
-            return
-
+    @cached_analysis('session_plot')
+    def _session_plot_data(self) -> Optional[Dict]:
         total_sessions = self.metadata.get('total_sessions', 0)
         if total_sessions == 0:
+            return None
+        # session 필드 group-by (PERF-13)
+        by_session = self.frames.hallucination_counts('session')
+        sessions = list(range(1, total_sessions + 1))
+        return {'sessions': sessions, 'counts': [by_session.get(sn, 0) for sn in sessions]}
+
+    def plot_hallucinations_per_session(self, output_file: str = None, dpi: int = REPORT_DPI):
+        data = self._session_plot_data()
+        if data is None:
             print("  ⚠️  total_sessions is 0 – skipping hallucinations-per-session plot.")
             return
-
-        # session 필드로 직접 카운팅
-        hall_per_session = [0] * (total_sessions + 1)
-        for h in self.hallucinations:
-            s = h.get('session', 0)
-            if 1 <= s <= total_sessions:
-                hall_per_session[s] += 1
-
-        sessions = list(range(1, total_sessions + 1))
-        counts = hall_per_session[1:]
-
-        fig, ax = plt.subplots(figsize=(12, 6))
-        ax.bar(sessions, counts, color='coral', alpha=0.7)
-        ax.set_xlabel('Session Number', fontsize=12)
-        ax.set_ylabel('Hallucinations Detected', fontsize=12)
-        ax.set_title('Hallucination Count per Session', fontsize=14, fontweight='bold')
-        ax.set_xticks(sessions)
-        ax.grid(axis='y', alpha=0.3)
-        plt.tight_layout()
-
-        if output_file:
-            plt.savefig(output_file, dpi=300, bbox_inches='tight')
-            print(f"  📊 Plot saved: {output_file}")
-        else:
-            plt.show()
-        plt.close()
+        message = render_session_plot(output_file, data['sessions'], data['counts'], dpi)
+        if message:
+            print(message)
 
     # ------------------------------------------------------------------
     # LaTeX
     def generate_latex_table(self, rows: List[Dict], caption: str = "", label: str = "") -> str:
-        if not rows:
-            return ""
-        columns = list(rows[0].keys())
-        latex = "\\begin{table}[h]\n\\centering\n"
-        if caption:
-            latex += f"\\caption{{{caption}}}\n"
-        if label:
-            latex += f"\\label{{{label}}}\n"
-        latex += "\\begin{tabular}{" + "l" * len(columns) + "}\n\\hline\n"
-        latex += " & ".join(columns) + " \\\\\n\\hline\n"
-        for row in rows:
-            latex += " & ".join(str(row.get(c, '')) for c in columns) + " \\\\\n"
-        latex += "\\hline\n\\end{tabular}\n\\end{table}\n"
-        return latex
+        return generate_latex_table(rows, caption, label)
 
     # ------------------------------------------------------------------
     # Full Report
-    def generate_full_report(self, output_dir: str = "."):
+    @cached_analysis('confirmed_logic_preview')
+    def confirmed_logic_preview(self) -> List[Dict]:
+        return [{'session': node.get('session', '?'),
+                 'conclusion': node.get('conclusion', 'N/A')[:80]}
+                for node in self.confirmed_logic]
+
+    def generate_report_tables(self) -> Dict:
+        return {
+            'summary': self.generate_summary_statistics(),
+            'session_table': self.generate_session_table(),
+            'severity_data': self.analyze_hallucinations_by_severity(),
+            'ref_analysis': self.generate_referee_analysis(),
+            'redundancy': self.analyze_redundancy(),
+        }
+
+    # PERF-14 : 리포트 파일(그림 / LaTeX / JSON)을 renderer에 등록만 한다
+    def queue_report(self, renderer: ReportRenderer, output_dir: str,
+                     tables: Optional[Dict] = None):
         output_path = Path(output_dir)
-        output_path.mkdir(exist_ok=True)
+        output_path.mkdir(parents=True, exist_ok=True)
+        t = tables or self.generate_report_tables()
+
+        if _MATPLOTLIB:
+            renderer.add('severity_plot', output_path / "severity_distribution.png",
+                         data=t['severity_data'])
+            session_plot = self._session_plot_data()
+            if session_plot is not None:
+                renderer.add('session_plot', output_path / "hallucinations_per_session.png",
+                             **session_plot)
+        renderer.add('latex_tables', output_path / "tables.tex", tables=[
+            {'comment': "Session Performance Table", 'rows': t['session_table'],
+             'caption': "Session-by-Session Performance", 'label': "tab:sessions"},
+            {'comment': "Severity Distribution Table", 'rows': t['severity_data'],
+             'caption': "Hallucination Severity Distribution", 'label': "tab:severity"},
+            {'comment': "Redundancy Analysis Table", 'rows': [t['redundancy']],
+             'caption': "Redundancy Analysis", 'label': "tab:redundancy"},
+        ])
+        renderer.add('json', output_path / "analysis_summary.json", payload={
+            'summary_statistics': t['summary'],
+            'referee_analysis': t['ref_analysis'],
+            'redundancy_analysis': t['redundancy'],
+            'session_table': t['session_table'],
+            'severity_distribution': t['severity_data'],
+            'confirmed_logic_count': len(self.confirmed_logic_preview()),
+        })
 
+    # ------------------------------------------------------------------
+    # Full Report
+    def generate_full_report(self, output_dir: str = ".",
+                             renderer: Optional[ReportRenderer] = None):
         print("\n" + "=" * 70)
         print("  PROVEN FACT SIMULATION ANALYSIS REPORT  v1.4.0-ABSOLUTE-FINAL")
         print("=" * 70 + "\n")
 
+        tables = self.generate_report_tables()
+
         # ---- Summary ----
         print("SUMMARY STATISTICS")
         print("-" * 70)
-        summary = self.generate_summary_statistics()
-        for key, value in summary.items():
+        for key, value in tables['summary'].items():
             print(f"  {key:.<44} {value}")
 
         # ---- Session table ----
         print("\n\nSESSION-BY-SESSION PERFORMANCE")
         print("-" * 70)
-        session_table = self.generate_session_table()
-        if _PANDAS:
-            print(pd.DataFrame(session_table).to_string(index=False))
-        else:
-            # fallback: plain text
-            if session_table:
-                headers = list(session_table[0].keys())
-                print("  " + "  ".join(f"{h:>14}" for h in headers))
-                for row in session_table:
-                    print("  " + "  ".join(f"{str(row[h]):>14}" for h in headers))
+        print_table(tables['session_table'])
 
         # ---- Severity ----
         print("\n\nHALLUCINATION SEVERITY DISTRIBUTION")
         print("-" * 70)
-        severity_data = self.analyze_hallucinations_by_severity()
-        for item in severity_data:
+        for item in tables['severity_data']:
             bar = "█" * item['Count']
             print(f"  {item['Severity']:10} {item['Count']:3}  {bar}")
 
         # ---- Referee analysis (BUG-C 수정) ----
         print("\n\nREFEREE SYSTEM ANALYSIS")
         print("-" * 70)
-        ref_analysis = self.generate_referee_analysis()
-        for key, value in ref_analysis.items():
+        for key, value in tables['ref_analysis'].items():
             print(f"  {key:.<44} {value}")
 
         # ---- Redundancy (NEW) ----
         print("\n\nREDUNDANCY ANALYSIS")
         print("-" * 70)
-        redundancy = self.analyze_redundancy()
-        for key, value in redundancy.items():
+        for key, value in tables['redundancy'].items():
             print(f"  {key:.<44} {value}")
 
         # ---- Confirmed Logic (NEW) ----
         print("\n\nCONFIRMED LOGIC NODES")
         print("-" * 70)
-        if self.confirmed_logic:
-            for i, node in enumerate(self.confirmed_logic, 1):
-                print(f"  {i}. [Session {node.get('session', '?')}] "
-                      f"{node.get('conclusion', 'N/A')[:80]}")
+        confirmed = self.confirmed_logic_preview()
+        if confirmed:
+            for i, node in enumerate(confirmed, 1):
+                print(f"  {i}. [Session {node['session']}] {node['conclusion']}")
         else:
             print("  (none)")
 
-        # ---- Plots ----
-        print("\n\nGENERATING VISUALIZATIONS…")
-        print("-" * 70)
-        self.plot_severity_distribution(
-            output_file=str(output_path / "severity_distribution.png")
-        )
-        self.plot_hallucinations_per_session(
-            output_file=str(output_path / "hallucinations_per_session.png")
-        )
-
-        # ---- LaTeX ----
-        print("\n\nLATEX TABLE GENERATION")
+        # ---- Plots / LaTeX / JSON (PERF-14) ----
+        print("\n\nRENDERING REPORT FILES…")
         print("-" * 70)
-        latex_output = output_path / "tables.tex"
-        with open(latex_output, 'w', encoding='utf-8') as f:
-            f.write("% Session Performance Table\n")
-            f.write(self.generate_latex_table(
-                session_table,
-                caption="Session-by-Session Performance",
-                label="tab:sessions"
-            ))
-            f.write("\n\n% Severity Distribution Table\n")
-            f.write(self.generate_latex_table(
-                severity_data,
-                caption="Hallucination Severity Distribution",
-                label="tab:severity"
-            ))
-            f.write("\n\n% Redundancy Analysis Table\n")
-            f.write(self.generate_latex_table(
-                [redundancy],
-                caption="Redundancy Analysis",
-                label="tab:redundancy"
-            ))
-        print(f"  📄 LaTeX tables saved: {latex_output}")
-
-        # ---- JSON summary ----
-        summary_file = output_path / "analysis_summary.json"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump({
-                'summary_statistics': summary,
-                'referee_analysis': ref_analysis,
-                'redundancy_analysis': redundancy,
-                'session_table': session_table,
-                'severity_distribution': severity_data,
-                'confirmed_logic_count': len(self.confirmed_logic),
-            }, f, indent=2, ensure_ascii=False)
-        print(f"  📄 Summary JSON saved: {summary_file}")
+        if not _MATPLOTLIB:
+            print("  ⚠️  matplotlib not installed – skipping plots.")
+        renderer = renderer or ReportRenderer()
+        self.queue_report(renderer, output_dir, tables)
+        for message in renderer.run():
+            print(message)
+        if renderer.stats['cached']:
+            print(f"  ♻️  {renderer.stats['cached']} unchanged file(s) skipped (render cache)")
 
         print("\n" + "=" * 70)
         print("  ✅ ANALYSIS COMPLETE")
         print("=" * 70 + "\n")
 
 
+# ---------------------------------------------------------------------------
+# PERF-11 : Multi-run aggregate analysis
+# ---------------------------------------------------------------------------
+SEVERITIES = ('critical', 'high', 'medium', 'low')
+
+# 결과 파일이 아닌 JSON (분석 출력 / SFT manifest)은 디렉토리 스캔에서 제외
+_NON_RESULT_SUFFIXES = ('.manifest.json', 'analysis_summary.json', 'aggregate_summary.json',
+                        AnalysisCache.SUFFIX)
+
+
+def _stage_of(session: int, boundaries: List[int]) -> int:
+    for stage_idx, boundary in enumerate(boundaries, 1):
+        if session <= boundary:
+            return stage_idx
+    return len(boundaries) or 1
+
+
+def summarize_results_file(path: str, use_cache: bool = True,
+                           cache_dir: Optional[str] = None, write_cache: bool = True) -> Dict:
+    """
+    워커 프로세스 진입점: 파일 하나를 한 번 훑어 요약 행만 반환한다.
+    PERF-12 : all_records / hallucinations는 원소 단위로 스트리밍, sft_data는 읽지 않음.
+    PERF-15 : 변경되지 않은 파일은 sidecar 캐시의 행을 그대로 반환.
+    """
+    cache = AnalysisCache(path, enabled=use_cache, cache_dir=cache_dir, write=write_cache)
+    row = cache.get('aggregate_row')
+    if row is None:
+        row = _summarize_results_file(path)
+        if not row.get('error'):
+            cache.put('aggregate_row', row)
+    return row
+
+
+def _summarize_results_file(path: str) -> Dict:
+    sections: Dict = {}
+    session_stats: Dict[int, List[int]] = {}        # session → [exchanges, tokens, hallucinations]
+    by_severity = {sev: 0 for sev in SEVERITIES}
+    try:
+        for kind, key, value in ResultsFileReader(path).scan(
+                load=('metadata', 'stage_boundaries', 'failed_turns'),
+                stream=('all_records', 'hallucinations')):
+            if kind == "value":
+                sections[key] = value
+            elif kind == "item" and key == 'all_records':
+                stats = session_stats.setdefault(value.get('session', 0), [0, 0, 0])
+                stats[0] += 1
+                stats[1] += value.get('estimated_tokens', 0)
+            elif kind == "item":
+                session_stats.setdefault(value.get('session', 0), [0, 0, 0])[2] += 1
+                if value.get('severity') in by_severity:
+                    by_severity[value['severity']] += 1
+    except (OSError, *_PARSE_ERRORS) as e:
+        return {'file': path, 'error': f"{type(e).__name__}: {e}"}
+    if 'metadata' not in sections:
+        return {'file': path, 'skipped': True}
+
+    metadata = sections['metadata']
+    boundaries = sections.get('stage_boundaries') or []
+    stages: Dict[int, Dict[str, int]] = {}
+    for session, (exchanges, tokens, hallucinations) in session_stats.items():
+        row = stages.setdefault(_stage_of(session, boundaries),
+                                {'exchanges': 0, 'hallucinations': 0, 'tokens': 0})
+        row['exchanges'] += exchanges
+        row['tokens'] += tokens
+        row['hallucinations'] += hallucinations
+
+    exchanges = sum(v[0] for v in session_stats.values())
+    return {
+        'file': path,
+        'topic': metadata.get('topic', 'N/A'),
+        'num_referees': metadata.get('num_referees', 2),
+        'total_sessions': metadata.get('total_sessions', 0),
+        'api_provider': metadata.get('api_provider', 'N/A'),
+        'exchanges': exchanges,
+        'tokens': sum(v[1] for v in session_stats.values()),
+        'hallucinations': sum(v[2] for v in session_stats.values()),
+        'by_severity': by_severity,
+        'stages': {str(stage): row for stage, row in stages.items()},   # JSON 캐시 호환
+        'failed_turns': len(sections.get('failed_turns') or []),
+        'sft_examples': exchanges,          # sft_data는 레코드와 1:1
+    }
+
+
+def collect_results_files(inputs: List[str]) -> List[str]:
+    """디렉토리(재귀) / glob / 파일 경로를 결과 JSON 목록으로 펼친다."""
+    paths: List[str] = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = glob.glob(os.path.join(item, '**', '*.json'), recursive=True)
+        elif glob.has_magic(item):
+            matches = glob.glob(item, recursive=True)
+        else:
+            matches = [item]
+        paths.extend(m for m in matches if not m.endswith(_NON_RESULT_SUFFIXES))
+    return sorted(dict.fromkeys(paths))
+
+
+class AggregateAnalyzer:
+    """
+    Cross-run analysis over many results files.
+
+    각 파일은 워커 프로세스에서 요약 행(summarize_results_file)으로 스트리밍 축약되고,
+    메인 프로세스는 도착하는 행을 바로 그룹별 누적기에 더한다.
+    → 동시에 메모리에 올라가는 결과 파일은 워커당 1개, 메인에는 요약 행만 남는다.
+    """
+
+    GROUPS = ('topic', 'stage', 'num_referees')
+
+    def __init__(self, inputs: List[str], workers: Optional[int] = None,
+                 use_cache: bool = True, cache_dir: Optional[str] = None,
+                 write_cache: bool = True):
+        self.paths = collect_results_files(inputs)
+        self.workers = workers or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.cache_options = {'cache_dir': cache_dir, 'write_cache': write_cache}
+        self.rows: List[Dict] = []
+        self.errors: List[Dict] = []
+        self.skipped = 0
+        self.tables: Dict[str, Dict] = {group: {} for group in self.GROUPS}
+        self.totals = self._new_bucket()
+
+    @staticmethod
+    def _new_bucket() -> Dict:
+        return {'runs': 0, 'exchanges': 0, 'hallucinations': 0, 'tokens': 0,
+                **{sev: 0 for sev in SEVERITIES}}
+
+    def _add(self, group: str, key, exchanges: int, hallucinations: int, tokens: int,
+             by_severity: Optional[Dict] = None, runs: int = 1):
+        bucket = self.tables[group].setdefault(key, self._new_bucket())
+        bucket['runs'] += runs
+        bucket['exchanges'] += exchanges
+        bucket['hallucinations'] += hallucinations
+        bucket['tokens'] += tokens
+        for sev, n in (by_severity or {}).items():
+            bucket[sev] += n
+
+    def _reduce(self, row: Dict):
+        if row.get('error'):
+            self.errors.append(row)
+            return
+        if row.get('skipped'):
+            self.skipped += 1
+            return
+        self.rows.append({k: v for k, v in row.items() if k != 'stages'})
+        args = (row['exchanges'], row['hallucinations'], row['tokens'], row['by_severity'])
+        self._add('topic', row['topic'], *args)
+        self._add('num_referees', row['num_referees'], *args)
+        for stage, srow in row['stages'].items():
+            self._add('stage', int(stage), srow['exchanges'], srow['hallucinations'], srow['tokens'])
+        for key in ('exchanges', 'hallucinations', 'tokens'):
+            self.totals[key] += row[key]
+        for sev, n in row['by_severity'].items():
+            self.totals[sev] += n
+        self.totals['runs'] += 1
+
+    # ------------------------------------------------------------------
+    def run(self):
+        summarize = functools.partial(summarize_results_file, use_cache=self.use_cache,
+                                      **self.cache_options)
+        if self.workers <= 1 or len(self.paths) <= 1:
+            for path in self.paths:
+                self._reduce(summarize(path))
+            return
+        chunksize = max(1, len(self.paths) // (self.workers * 8))
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for row in pool.map(summarize, self.paths, chunksize=chunksize):
+                self._reduce(row)
+
+    def table(self, group: str) -> List[Dict]:
+        label = {'topic': 'Topic', 'stage': 'Stage', 'num_referees': 'Referees'}[group]
+        rows = []
+        for key in sorted(self.tables[group], key=str):
+            b = self.tables[group][key]
+            rows.append({
+                label: key,
+                'Runs': b['runs'],
+                'Exchanges': b['exchanges'],
+                'Hallucinations': b['hallucinations'],
+                'Rate / Exchange': f"{b['hallucinations'] / max(1, b['exchanges']):.3f}",
+                'Est. Tokens': b['tokens'],
+            })
+        return rows
+
+    # ------------------------------------------------------------------
+    def queue_run_reports(self, renderer: ReportRenderer, output_dir: str):
+        """PERF-14 : 실행별 전체 리포트를 <output>/runs/<이름>/ 에 – 하나의 풀에서 렌더링."""
+        for row in self.rows:
+            name = os.path.splitext(os.path.basename(row['file']))[0]
+            ProvenFactAnalyzer(row['file'], use_cache=self.use_cache,
+                               **self.cache_options).queue_report(
+                renderer, os.path.join(output_dir, 'runs', name))
+
+    def generate_report(self, output_dir: Optional[str] = None):
+        print("\n" + "=" * 70)
+        print("  PROVEN FACT AGGREGATE ANALYSIS")
+        print("=" * 70 + "\n")
+        print(f"  Files scanned  : {len(self.paths)}  (workers: {self.workers})")
+        print(f"  Runs analysed  : {self.totals['runs']}")
+        if self.skipped:
+            print(f"  Skipped        : {self.skipped} (not a results file)")
+        for err in self.errors:
+            print(f"  ❌ {err['file']}: {err['error']}")
+
+        t = self.totals
+        print(f"\n  Exchanges      : {t['exchanges']}")
+        print(f"  Hallucinations : {t['hallucinations']} "
+              f"({t['hallucinations'] / max(1, t['exchanges']):.3f} per exchange)")
+        print("  By severity    : " + ", ".join(f"{sev} {t[sev]}" for sev in SEVERITIES))
+        print(f"  Est. tokens    : {t['tokens']}")
+
+        titles = {'topic': 'BY TOPIC', 'stage': 'BY EVIDENCE STAGE',
+                  'num_referees': 'BY REFEREE COUNT'}
+        for group in self.GROUPS:
+            print(f"\n\nHALLUCINATION RATE {titles[group]}")
+            print("-" * 70)
+            print_table(self.table(group))
+
+        if not output_dir:
+            print()
+            return
+
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+        with open(output_path / "aggregate_summary.json", 'w', encoding='utf-8') as f:
+            json.dump({
+                'totals': self.totals,
+                'by_topic': self.table('topic'),
+                'by_stage': self.table('stage'),
+                'by_referees': self.table('num_referees'),
+                'errors': self.errors,
+            }, f, indent=2, ensure_ascii=False)
+
+        with open(output_path / "runs.csv", 'w', encoding='utf-8', newline='') as f:
+            columns = ['file', 'topic', 'num_referees', 'total_sessions', 'api_provider',
+                       'exchanges', 'tokens', 'hallucinations', *SEVERITIES,
+                       'failed_turns', 'sft_examples']
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            for row in self.rows:
+                writer.writerow({**row, **row['by_severity']})
+
+        with open(output_path / "aggregate_tables.tex", 'w', encoding='utf-8') as f:
+            for group, caption in (('topic', 'Hallucination Rate by Topic'),
+                                   ('stage', 'Hallucination Rate by Evidence Stage'),
+                                   ('num_referees', 'Hallucination Rate by Referee Count')):
+                f.write(f"% {caption}\n")
+                f.write(generate_latex_table(self.table(group), caption=caption,
+                                             label=f"tab:agg_{group}"))
+                f.write("\n")
+        print(f"\n  📄 Aggregate outputs saved: {output_path}/"
+              f"{{aggregate_summary.json, runs.csv, aggregate_tables.tex}}\n")
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -414,10 +1183,32 @@ Examples:
   python analyze_proven_fact.py results.json
   python analyze_proven_fact.py results.json --output analysis_output
   python analyze_proven_fact.py results.json --summary-only
+
+  # Aggregate over many runs (directory, glob or several files)
+  python analyze_proven_fact.py corpus/jobs/ --output agg_output --workers 8
+  python analyze_proven_fact.py "runs/*_results.json" --aggregate
+  python analyze_proven_fact.py corpus/jobs/ --output agg_output --per-run-reports --preview
         """
     )
-    parser.add_argument('results_file', type=str,
-                        help='Path to simulation results JSON file')
+    parser.add_argument('results_file', type=str, nargs='+',
+                        help='Simulation results JSON file (or directories / globs for aggregate mode)')
+    parser.add_argument('--aggregate', action='store_true',
+                        help='Cross-run aggregate analysis (implied by a directory, glob or several files)')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='Worker processes for aggregate analysis and rendering (default: CPU count)')
+    parser.add_argument('--preview', action='store_true',
+                        help=f'Render plots at {PREVIEW_DPI} dpi instead of {REPORT_DPI} (quick look)')
+    parser.add_argument('--no-render-cache', action='store_true',
+                        help='Re-render report files even if their inputs are unchanged')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Ignore and do not write the per-file analysis cache '
+                             '(.<results>.analysis_cache.json)')
+    parser.add_argument('--cache-dir', type=str, default=None,
+                        help='Keep the analysis cache in this directory instead of next to the '
+                             'results files (aggregate default: OUTPUT/.analysis_cache; '
+                             '--summary-only only reads caches unless this is given)')
+    parser.add_argument('--per-run-reports', action='store_true',
+                        help='Aggregate mode: also render a full report for every run under OUTPUT/runs/')
     parser.add_argument('--output', type=str, default='.',
                         help='Output directory (default: current directory)')
     parser.add_argument('--summary-only', action='store_true',
@@ -425,12 +1216,40 @@ Examples:
 
     args = parser.parse_args()
 
-    if not Path(args.results_file).exists():
-        print(f"  ❌ File not found: {args.results_file}")
+    # PERF-11 : 집계 모드
+    inputs = args.results_file
+    # PERF-15 : --summary-only는 파일을 만들지 않는다 – --cache-dir가 없으면 캐시는 읽기만
+    write_cache = not args.summary_only or bool(args.cache_dir)
+
+    if args.aggregate or len(inputs) > 1 or os.path.isdir(inputs[0]) or glob.has_magic(inputs[0]):
+        # 집계 모드는 결과 디렉토리(코퍼스 jobs/ 등)에 sidecar를 흩뿌리지 않고 출력 디렉토리에 둔다
+        cache_dir = args.cache_dir
+        if cache_dir is None and not args.summary_only:
+            cache_dir = os.path.join(args.output, '.analysis_cache')
+        aggregate = AggregateAnalyzer(inputs, workers=args.workers, use_cache=not args.no_cache,
+                                      cache_dir=cache_dir, write_cache=write_cache)
+        if not aggregate.paths:
+            print(f"  ❌ No results files found in: {' '.join(inputs)}")
+            return 1
+        aggregate.run()
+        aggregate.generate_report(output_dir=None if args.summary_only else args.output)
+        if args.per_run_reports and not args.summary_only:
+            renderer = ReportRenderer(workers=args.workers, preview=args.preview,
+                                      use_cache=not args.no_render_cache)
+            aggregate.queue_run_reports(renderer, args.output)
+            renderer.run()
+            print(f"  📊 Per-run reports: {renderer.stats['rendered']} file(s) rendered, "
+                  f"{renderer.stats['cached']} unchanged – {os.path.join(args.output, 'runs')}")
+        return 0
+
+    results_file = inputs[0]
+    if not Path(results_file).exists():
+        print(f"  ❌ File not found: {results_file}")
         return 1
 
     try:
-        analyzer = ProvenFactAnalyzer(args.results_file)
+        analyzer = ProvenFactAnalyzer(results_file, use_cache=not args.no_cache,
+                                      cache_dir=args.cache_dir, write_cache=write_cache)
 
         if args.summary_only:
             print("\n" + "=" * 70)
@@ -440,7 +1259,10 @@ Examples:
                 print(f"  {key:.<44} {value}")
             print()
         else:
-            analyzer.generate_full_report(output_dir=args.output)
+            analyzer.generate_full_report(
+                output_dir=args.output,
+                renderer=ReportRenderer(workers=args.workers, preview=args.preview,
+                                        use_cache=not args.no_render_cache))
 
         return 0
 
@@ -0,0 +1,671 @@
+#!/usr/bin/env python3
+"""
+Large-scale SFT corpus generation for the Proven Fact-Based Algorithm
+
+LICENSE:
+BY-NC (Personal use allowed. Commercial use prohibited. Attribution required.)
+Copyright (c) 2026 [Cheongwon Choi]
+
+PERF-09 : 여러 주제 × 반복 시뮬레이션을 로컬 작업 큐로 돌려 SFT 코퍼스를 만든다.
+
+  • 작업 큐      : SQLite 파일 1개 (WAL). 프로세스가 죽어도 큐 상태는 유지된다.
+  • 워커         : multiprocessing 프로세스 N개, 각자 ProvenFactSystem 시뮬레이션 실행
+                   (--sims-per-worker: 프로세스당 동시 시뮬레이션 수, 동일 요청 병합 공유).
+                   작업은 lease(임대)로 가져가고 heartbeat로 연장한다.
+                   lease가 만료된 작업(워커 사망)은 다른 워커가 다시 가져간다 – 할 일이
+                   없는 워커도 다른 워커가 lease 중인 작업이 끝날 때까지 대기한다.
+  • 재시도       : 실패한 작업은 max_attempts까지 pending으로 되돌린다.
+                   마지막 시도 중 lease가 만료된 작업은 failed로 기록된다.
+  • 결과         : 작업마다 <out>/jobs/<job_key>.json (+ .jsonl SFT)
+  • 병합         : 완료된 작업의 SFT를 <out>/sft/sft-00000.jsonl … 샤드로 병합
+                   (PERF-10 SFTShardWriter: 중복 제거 / 필터 / manifest).
+
+Usage:
+  # 1) 작업 등록 (모든 템플릿 × 50회, 이미 등록된 job_key는 무시)
+  python generate_corpus.py enqueue --out corpus/ --template all --replicas 50 --sessions 12
+
+  # 2) 워커 실행 (기본: CPU 코어 수만큼)
+  python generate_corpus.py run --out corpus/ --workers 8 --route student.model=claude-3-5-haiku-latest
+
+  # 3) 진행 상황 / 실패 작업 확인
+  python generate_corpus.py status --out corpus/
+
+  # 4) SFT 샤드 병합
+  python generate_corpus.py merge --out corpus/ --shard-size 10000
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+QUEUE_FILE = "queue.sqlite"
+
+JOB_STATUSES = ("pending", "running", "done", "failed")
+
+IDLE_POLL_SEC = 5.0      # 다른 워커가 lease 중인 작업만 남았을 때 재확인 간격
+
+
+# ---------------------------------------------------------------------------
+# SQLite durable work queue
+# ---------------------------------------------------------------------------
+class CorpusQueue:
+    """
+    SQLite-backed job queue shared by all worker processes.
+
+    작업 상태: pending → running(lease) → done
+                                  ↘ (실패, attempts < max_attempts) → pending
+                                  ↘ (실패, attempts ≥ max_attempts) → failed
+    running 상태라도 lease_expires가 지나면 다시 lease 가능 (워커 사망 복구).
+    lease가 만료됐는데 이미 max_attempts를 쓴 running 작업은 failed로 전환 (expire_stale).
+    """
+
+    STALE_ERROR = "lease expired after the last attempt (worker died or lost its lease)"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS jobs (
+        id            INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_key       TEXT UNIQUE NOT NULL,
+        name          TEXT NOT NULL,
+        config        TEXT NOT NULL,
+        sessions      INTEGER NOT NULL,
+        num_referees  INTEGER NOT NULL,
+        status        TEXT NOT NULL DEFAULT 'pending',
+        attempts      INTEGER NOT NULL DEFAULT 0,
+        max_attempts  INTEGER NOT NULL DEFAULT 3,
+        lease_owner   TEXT,
+        lease_expires REAL,
+        result_file   TEXT,
+        stats         TEXT,
+        error         TEXT,
+        created_at    TEXT NOT NULL,
+        updated_at    TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        # isolation_level=None → 트랜잭션은 BEGIN IMMEDIATE로 직접 관리
+        self.conn = sqlite3.connect(db_path, timeout=60, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    def enqueue(self, jobs: List[Dict], max_attempts: int = 3) -> int:
+        """jobs: [{"job_key", "name", "config", "sessions", "num_referees"}]. 새로 추가된 수 반환"""
+        now = datetime.now().isoformat()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            added = 0
+            for job in jobs:
+                cur = self.conn.execute(
+                    "INSERT OR IGNORE INTO jobs (job_key, name, config, sessions, num_referees, "
+                    "max_attempts, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job["job_key"], job["name"], json.dumps(job["config"], ensure_ascii=False),
+                     job["sessions"], job["num_referees"], max_attempts, now, now)
+                )
+                added += cur.rowcount
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return added
+
+    def lease(self, owner: str, lease_sec: float) -> Optional[Dict]:
+        """실행 가능한 작업 1개를 원자적으로 임대한다. 없으면 None."""
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._expire_stale(now)
+            row = self.conn.execute(
+                "SELECT * FROM jobs WHERE attempts < max_attempts AND "
+                "(status = 'pending' OR (status = 'running' AND lease_expires < ?)) "
+                "ORDER BY id LIMIT 1", (now,)
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                (owner, now + lease_sec, datetime.now().isoformat(), row["id"])
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        job = dict(row)
+        job["config"] = json.loads(job["config"])
+        job["attempts"] += 1
+        return job
+
+    def heartbeat(self, job_id: int, owner: str, lease_sec: float) -> bool:
+        """lease 연장. 다른 워커에게 넘어간 작업이면 False."""
+        cur = self.conn.execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND lease_owner = ? AND status = 'running'",
+            (time.time() + lease_sec, job_id, owner)
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: int, owner: str, result_file: str, stats: Dict):
+        self.conn.execute(
+            "UPDATE jobs SET status = 'done', result_file = ?, stats = ?, error = NULL, "
+            "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE id = ? AND lease_owner = ?",
+            (result_file, json.dumps(stats), datetime.now().isoformat(), job_id, owner)
+        )
+
+    def fail(self, job_id: int, owner: str, error: str):
+        self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' "
+            "ELSE 'pending' END, error = ?, lease_owner = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE id = ? AND lease_owner = ?",
+            (error[-4000:], datetime.now().isoformat(), job_id, owner)
+        )
+
+    def expire_stale(self) -> int:
+        """lease가 만료된 running 작업 중 재시도 한도를 넘긴 것을 failed로. 전환한 수 반환"""
+        return self._expire_stale(time.time())
+
+    def _expire_stale(self, now: float) -> int:
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = 'failed', "
+            "error = COALESCE(error || char(10), '') || ?, "
+            "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE status = 'running' AND attempts >= max_attempts AND lease_expires < ?",
+            (self.STALE_ERROR, datetime.now().isoformat(), now)
+        )
+        return cur.rowcount
+
+    # ------------------------------------------------------------------
+    def counts(self) -> Dict[str, int]:
+        counts = {status: 0 for status in JOB_STATUSES}
+        for row in self.conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+            counts[row["status"]] = row["n"]
+        return counts
+
+    def jobs(self, status: Optional[str] = None) -> List[Dict]:
+        if status:
+            rows = self.conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id", (status,))
+        else:
+            rows = self.conn.execute("SELECT * FROM jobs ORDER BY id")
+        return [dict(row) for row in rows]
+
+    def retry_failed(self) -> int:
+        """failed 작업을 재시도 횟수를 초기화해 pending으로 되돌린다."""
+        cur = self.conn.execute(
+            "UPDATE jobs SET status = 'pending', attempts = 0, updated_at = ? WHERE status = 'failed'",
+            (datetime.now().isoformat(),)
+        )
+        return cur.rowcount
+
+
+# ---------------------------------------------------------------------------
+# Job construction
+# ---------------------------------------------------------------------------
+def load_job_configs(templates: List[str], config_paths: List[str]) -> Dict[str, Dict]:
+    """템플릿 이름('all' 가능)과 config JSON 경로(glob 가능)를 {name: config}로 모은다."""
+    configs: Dict[str, Dict] = {}
+    if templates:
+        from run_proven_fact import SIMULATION_TEMPLATES
+        names = list(SIMULATION_TEMPLATES) if "all" in templates else templates
+        for name in names:
+            if name not in SIMULATION_TEMPLATES:
+                raise ValueError(f"Unknown template '{name}' "
+                                 f"(available: {', '.join(SIMULATION_TEMPLATES)})")
+            configs[name] = SIMULATION_TEMPLATES[name]
+
+    for pattern in config_paths:
+        from proven_fact_system import resolve_evidence_paths
+        paths = sorted(glob.glob(pattern)) or [pattern]
+        for path in paths:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            # 파일 하나에 config 여러 개 ({name: config}) 도 허용
+            found = {os.path.splitext(os.path.basename(path))[0]: data} \
+                if "proven_fact" in data else data
+            # PERF-21 : 증거 파일 참조는 절대 경로로만 바꿔 저장 (내용은 워커가 로드)
+            for config in found.values():
+                if "evidence_stages" in config:
+                    config["evidence_stages"] = resolve_evidence_paths(
+                        config["evidence_stages"], os.path.dirname(os.path.abspath(path)))
+            configs.update(found)
+
+    for name, config in configs.items():
+        missing = [k for k in ("proven_fact", "topic", "evidence_stages") if k not in config]
+        if missing:
+            raise ValueError(f"Config '{name}' is missing {', '.join(missing)}")
+    return configs
+
+
+def build_jobs(configs: Dict[str, Dict], replicas: int, sessions: int,
+               referee_counts: List[int]) -> List[Dict]:
+    jobs = []
+    for name, config in configs.items():
+        for num_referees in referee_counts:
+            for replica in range(replicas):
+                jobs.append({
+                    "job_key": f"{name}-s{sessions}-r{num_referees}-{replica:05d}",
+                    "name": name,
+                    "config": config,
+                    "sessions": sessions,
+                    "num_referees": num_referees,
+                })
+    return jobs
+
+
+# ---------------------------------------------------------------------------
+# Worker process
+# ---------------------------------------------------------------------------
+def _system_kwargs(options: Dict, config: Dict, num_referees: int,
+                   batch_dispatchers: Optional[Dict] = None) -> Dict:
+    from run_proven_fact import merge_model_routing, parse_referee_panel
+    return dict(
+        api_provider=options["api"],
+        num_referees=num_referees,
+        model_routing=merge_model_routing(config, options.get("route")),
+        referee_panel=parse_referee_panel(config, options.get("referee_provider")),
+        model=options.get("model") or config.get("model"),
+        base_url=options.get("base_url") or config.get("base_url"),
+        execution_mode=options.get("execution_mode", "sync"),
+        batch_options=options.get("batch_options"),
+        batch_dispatchers=batch_dispatchers,
+        coalesce=options.get("coalesce", "deterministic"),
+        enable_rule_engine=options.get("rule_engine", False),
+        stage_schedule=options.get("stage_schedule"),
+        turn_control=options.get("turn_control"),
+        evidence_top_k=options.get("evidence_top_k", 10),
+        claim_match_threshold=options.get("claim_match_threshold", 0.8),
+        claim_cache=options.get("claim_cache", False),
+    )
+
+
+def worker_main(worker_index: int, out_dir: str, options: Dict):
+    """
+    워커 프로세스 본체: 시뮬레이션 slot(스레드) sims_per_worker개가 각자
+    pending / running 작업이 남지 않을 때까지 lease → 시뮬레이션 → complete/fail
+    (다른 워커가 lease 중인 작업만 남으면 IDLE_POLL_SEC 간격으로 재확인).
+    같은 프로세스의 slot들은 RequestCoalescer(PERF-08)를 공유하므로
+    동시에 도는 시뮬레이션의 동일 요청은 API 호출 1개로 합쳐진다.
+    batch 모드에서는 BatchDispatcher(PERF-07)도 공유 – 여러 시뮬레이션의 같은 phase
+    호출이 한 배치로 제출된다.
+    """
+    owner = f"{socket.gethostname()}:{os.getpid()}:w{worker_index}"
+    log_dir = os.path.join(out_dir, "logs")
+    os.makedirs(log_dir, exist_ok=True)
+    # 시뮬레이션 출력이 섞이지 않도록 워커별 로그 파일로 보낸다
+    log = open(os.path.join(log_dir, f"worker-{worker_index:03d}.log"), 'a',
+               encoding='utf-8', buffering=1)
+    sys.stdout = sys.stderr = log
+
+    from proven_fact_system import require_api_client_library
+    require_api_client_library()                      # SDK 확인은 slot 시작 전에
+
+    num_slots = max(1, options.get("sims_per_worker", 1))
+    batch_dispatchers: Dict = {}
+    slots = [threading.Thread(target=_worker_slot,
+                              args=(owner if num_slots == 1 else f"{owner}.{i}", out_dir, options,
+                                    batch_dispatchers))
+             for i in range(num_slots)]
+    for slot in slots:
+        slot.start()
+    for slot in slots:
+        slot.join()
+    log.close()
+
+
+def _worker_slot(owner: str, out_dir: str, options: Dict, batch_dispatchers: Dict):
+    """시뮬레이션 slot 1개 (SQLite connection은 slot마다 따로)."""
+    from proven_fact_system import ProvenFactSystem
+
+    queue = CorpusQueue(os.path.join(out_dir, QUEUE_FILE))
+    lease_sec = options["lease_sec"]
+    jobs_dir = os.path.join(out_dir, "jobs")
+    os.makedirs(jobs_dir, exist_ok=True)
+
+    while True:
+        job = queue.lease(owner, lease_sec)
+        if job is None:
+            # 다른 slot / 워커가 lease 중인 작업이 남아 있으면 대기 – 그 워커가 죽으면
+            # lease 만료 후 여기서 다시 가져간다. pending도 running도 없으면 종료
+            counts = queue.counts()
+            if counts["pending"] + counts["running"] == 0:
+                break
+            time.sleep(min(IDLE_POLL_SEC, lease_sec))
+            continue
+        print(f"\n▶ [{owner}] job {job['job_key']} (attempt {job['attempts']})")
+
+        # heartbeat : 긴 시뮬레이션 동안 lease 연장 (별도 connection)
+        stop = threading.Event()
+
+        def beat(job_id=job["id"]):
+            hb_queue = CorpusQueue(queue.db_path)
+            while not stop.wait(lease_sec / 3):
+                if not hb_queue.heartbeat(job_id, owner, lease_sec):
+                    print(f"  ⚠️  lease for job {job_id} lost")
+                    break
+            hb_queue.close()
+
+        hb = threading.Thread(target=beat, daemon=True)
+        hb.start()
+
+        output_file = os.path.join(jobs_dir, f"{job['job_key']}.json")
+        try:
+            config = job["config"]
+            system = ProvenFactSystem(**_system_kwargs(options, config, job["num_referees"],
+                                                       batch_dispatchers))
+            results = system.run_learning_simulation(
+                proven_fact=config["proven_fact"],
+                topic=config["topic"],
+                evidence_stages=config["evidence_stages"],
+                fixed_constants=config.get("fixed_constants", {}),
+                total_sessions=job["sessions"],
+                output_file=output_file,
+                verbose=False,
+            )
+            stats = {
+                "sft_examples": len(results["sft_data"]),
+                "hallucinations": results["hallucination_summary"]["total"],
+                "failed_turns": len(results.get("failed_turns", [])),
+            }
+            stop.set()
+            queue.complete(job["id"], owner, output_file, stats)
+            print(f"✅ [{owner}] job {job['job_key']} done: {stats}")
+        except Exception as e:
+            stop.set()
+            queue.fail(job["id"], owner, f"{type(e).__name__}: {e}\n{traceback.format_exc()}")
+            print(f"❌ [{owner}] job {job['job_key']} failed: {e}")
+        hb.join()
+
+    queue.close()
+
+
+# ---------------------------------------------------------------------------
+# Commands
+# ---------------------------------------------------------------------------
+def _open_queue(out_dir: str) -> CorpusQueue:
+    os.makedirs(out_dir, exist_ok=True)
+    return CorpusQueue(os.path.join(out_dir, QUEUE_FILE))
+
+
+def _format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    return f"{seconds // 3600}h{(seconds % 3600) // 60:02d}m{seconds % 60:02d}s"
+
+
+def _positive_int(value: str) -> int:
+    """argparse type: 1 이상의 정수 (run_proven_fact는 SDK를 import하므로 여기서 따로 정의)"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def cmd_enqueue(args):
+    try:
+        configs = load_job_configs(args.template, args.config)
+    except (ValueError, OSError, json.JSONDecodeError) as e:
+        print(f"  ❌ {e}")
+        sys.exit(1)
+    if not configs:
+        print("  ❌ Specify at least one --template or --config")
+        sys.exit(1)
+    if any(n < 2 for n in args.referees or []):
+        print("  ❌ --referees must be at least 2")
+        sys.exit(1)
+    jobs = build_jobs(configs, args.replicas, args.sessions, args.referees)
+    queue = _open_queue(args.out)
+    added = queue.enqueue(jobs, max_attempts=args.max_attempts)
+    print(f"✅ Enqueued {added} new job(s) ({len(jobs) - added} already present) "
+          f"from {len(configs)} config(s)")
+    queue.close()
+
+
+def cmd_run(args):
+    from proven_fact_system import require_api_client_library
+    from run_proven_fact import stage_schedule_options, turn_control_options
+    require_api_client_library()
+    queue = _open_queue(args.out)
+    counts = queue.counts()
+    if counts["pending"] + counts["running"] == 0:
+        print("  Nothing to do – queue has no pending jobs. Use 'enqueue' first.")
+        return
+
+    options = {
+        "api": args.api, "model": args.model, "base_url": args.base_url,
+        "route": args.route, "referee_provider": args.referee_provider,
+        "execution_mode": args.execution_mode, "coalesce": args.coalesce,
+        "batch_options": {
+            "linger_sec": args.batch_linger,
+            "poll_interval_sec": args.batch_poll,
+            "max_batch_size": args.batch_size,
+        },
+        "rule_engine": args.rule_engine,
+        "stage_schedule": stage_schedule_options(args),
+        "turn_control": turn_control_options(args),
+        "evidence_top_k": args.evidence_top_k,
+        "claim_match_threshold": args.claim_match_threshold,
+        "claim_cache": args.claim_cache,
+        "lease_sec": args.lease,
+        "sims_per_worker": args.sims_per_worker,
+    }
+    num_workers = args.workers or os.cpu_count() or 1
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=worker_main, args=(i, args.out, options), daemon=False)
+               for i in range(num_workers)]
+    for w in workers:
+        w.start()
+    print(f"🚀 Started {num_workers} worker(s). Logs: {os.path.join(args.out, 'logs')}")
+
+    start = time.time()
+    done_at_start = counts["done"]
+    try:
+        while any(w.is_alive() for w in workers):
+            for w in workers:
+                w.join(timeout=args.progress_interval / max(1, len(workers)))
+            counts = queue.counts()
+            total = sum(counts[s] for s in JOB_STATUSES)
+            finished = counts["done"] - done_at_start
+            elapsed = time.time() - start
+            rate = finished / elapsed * 60 if elapsed > 0 else 0.0
+            remaining = counts["pending"] + counts["running"]
+            eta = _format_duration(remaining / rate * 60) if rate > 0 else "?"
+            print(f"  📊 done {counts['done']}/{total} | running {counts['running']} | "
+                  f"pending {counts['pending']} | failed {counts['failed']} | "
+                  f"{rate:.2f} jobs/min | elapsed {_format_duration(elapsed)} | ETA {eta}")
+    except KeyboardInterrupt:
+        print("\n  ⏹  Interrupted – running jobs will be re-leased after their lease expires.")
+        for w in workers:
+            w.terminate()
+    queue.close()
+
+
+def cmd_status(args):
+    queue = _open_queue(args.out)
+    expired = queue.expire_stale()
+    counts = queue.counts()
+    total = sum(counts[s] for s in JOB_STATUSES)
+    print(f"Queue: {os.path.join(args.out, QUEUE_FILE)}")
+    print(f"  total {total} | " + " | ".join(f"{s} {counts[s]}" for s in JOB_STATUSES))
+    if expired:
+        print(f"  ⚠️  Marked {expired} running job(s) failed: lease expired after max attempts")
+
+    done = queue.jobs("done")
+    if done:
+        sft = sum(json.loads(j["stats"] or "{}").get("sft_examples", 0) for j in done)
+        print(f"  SFT examples in finished jobs: {sft}")
+    for job in queue.jobs("failed")[:args.show_failed]:
+        last = (job["error"] or "").strip().splitlines()
+        print(f"  ❌ {job['job_key']} (attempts {job['attempts']}): {last[0] if last else ''}")
+
+    if args.retry_failed:
+        print(f"  🔁 Reset {queue.retry_failed()} failed job(s) to pending")
+    queue.close()
+
+
+def _job_sft_files(result_file: str) -> List[str]:
+    """작업 결과의 SFT 파일 목록 (PERF-10 manifest가 있으면 샤드 순서대로)."""
+    stem = result_file[:-len('.json')] if result_file.endswith('.json') else result_file
+    manifest_path = f"{stem}.manifest.json"
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        base = os.path.dirname(result_file)
+        return [os.path.join(base, shard["file"]) for shard in manifest["shards"]]
+    return [result_file.replace('.json', '.jsonl')]
+
+
+def cmd_merge(args):
+    from proven_fact_system import SFTShardWriter
+
+    queue = _open_queue(args.out)
+    done = queue.jobs("done")
+    queue.close()
+
+    try:
+        writer = SFTShardWriter(
+            os.path.join(args.out, "sft", "sft.jsonl"),
+            max_records=args.shard_size, max_bytes=args.shard_bytes,
+            dedup=not args.no_dedup, hallucinations=args.hallucinations,
+            max_severity=args.max_severity,
+        )
+    except ValueError as e:
+        print(f"  ❌ {e}")
+        sys.exit(1)
+
+    for job in done:
+        for sft_file in _job_sft_files(job["result_file"]):
+            if not os.path.exists(sft_file):
+                print(f"  ⚠️  Missing SFT file for {job['job_key']}: {sft_file}")
+                continue
+            with open(sft_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    item.setdefault("metadata", {})["job_key"] = job["job_key"]
+                    writer.write(item)
+
+    manifest = writer.close()
+    counts = manifest["counts"]
+    print(f"✅ Merged {counts['written']} SFT example(s) from {len(done)} job(s) "
+          f"into {len(manifest['shards'])} shard(s) in {os.path.join(args.out, 'sft')}")
+    print(f"   duplicates {counts['duplicates']} | filtered (hallucination) "
+          f"{counts['filtered_hallucination']} | filtered (severity) {counts['filtered_severity']}")
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+def main():
+    parser = argparse.ArgumentParser(
+        description='Proven Fact-Based Algorithm – large-scale SFT corpus generation',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__.split("Usage:", 1)[1],
+    )
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    p = sub.add_parser('enqueue', help='Add simulation jobs to the queue')
+    p.add_argument('--out', required=True, help='Corpus directory (queue, job results, shards)')
+    p.add_argument('--template', action='append', default=[],
+                   help="Template name from run_proven_fact.py, repeatable ('all' for every template)")
+    p.add_argument('--config', action='append', default=[],
+                   help='Config JSON path or glob, repeatable')
+    p.add_argument('--replicas', type=int, default=1, help='Simulations per config (default: 1)')
+    p.add_argument('--sessions', type=int, default=12, help='Sessions per simulation (default: 12)')
+    p.add_argument('--referees', type=int, action='append',
+                   help='Referee count (>= 2), repeatable to sweep (default: 2)')
+    p.add_argument('--max-attempts', type=int, default=3, help='Attempts per job (default: 3)')
+    p.set_defaults(func=cmd_enqueue)
+
+    p = sub.add_parser('run', help='Process queued jobs with worker processes')
+    p.add_argument('--out', required=True)
+    p.add_argument('--workers', type=int, default=0, help='Worker processes (default: CPU count)')
+    p.add_argument('--api', choices=['anthropic', 'openai', 'openai_compatible'], default='anthropic')
+    p.add_argument('--model', type=str)
+    p.add_argument('--base-url', type=str)
+    p.add_argument('--route', action='append', default=[], metavar='ROLE.FIELD=VALUE')
+    p.add_argument('--referee-provider', action='append', default=[], metavar='PROVIDER[:MODEL]')
+    p.add_argument('--execution-mode', choices=['sync', 'batch'], default='sync')
+    p.add_argument('--batch-linger', type=float, default=2.0,
+                   help='Batch: seconds to wait for more requests before submitting (default: 2)')
+    p.add_argument('--batch-poll', type=float, default=30.0,
+                   help='Batch: status polling interval in seconds (default: 30)')
+    p.add_argument('--batch-size', type=int, default=1000,
+                   help='Batch: maximum requests per batch (default: 1000)')
+    p.add_argument('--coalesce', choices=['off', 'deterministic', 'all'], default='deterministic',
+                   help='Share in-flight identical API calls. deterministic: temperature 0 only '
+                        '(default); all: also sampled calls – concurrent replicas of one config '
+                        'may then produce identical runs')
+    p.add_argument('--rule-engine', action='store_true',
+                   help='Also run the local constant / era-vocabulary rule engine')
+    p.add_argument('--stage-schedule', choices=['fixed', 'adaptive'], default='fixed',
+                   help='Evidence stage scheduling (adaptive: advance on convergence)')
+    p.add_argument('--stage-min', type=int, default=2, help='Adaptive: min sessions per stage')
+    p.add_argument('--stage-max', type=int, default=None, help='Adaptive: max sessions per stage')
+    p.add_argument('--stage-clean', type=int, default=2,
+                   help='Adaptive: consecutive clean sessions needed to advance')
+    p.add_argument('--stage-require-acceptance', action='store_true',
+                   help='Adaptive: also require an explicit student acceptance')
+    p.add_argument('--turn-control', choices=['fixed', 'adaptive'], default='fixed',
+                   help='Per-session turn budget (adaptive: early exit / productive extension)')
+    p.add_argument('--turn-novelty', type=float, default=0.2, help='Adaptive: novelty threshold')
+    p.add_argument('--turn-extra', type=int, default=2, help='Adaptive: max extra turns')
+    p.add_argument('--turn-patience', type=int, default=2,
+                   help='Adaptive: unproductive conflict turns before ending')
+    p.add_argument('--evidence-top-k', type=_positive_int, default=10,
+                   help='Evidence items per question (BM25 over larger stages)')
+    p.add_argument('--claim-match-threshold', type=float, default=0.8,
+                   help='Word overlap for merging referee findings into one claim')
+    p.add_argument('--claim-cache', action='store_true',
+                   help='Referees verify only statements not already adjudicated in the run')
+    p.add_argument('--sims-per-worker', type=int, default=1,
+                   help='Concurrent simulations per worker process; they share identical '
+                        'in-flight API calls (--coalesce) (default: 1)')
+    p.add_argument('--lease', type=float, default=600.0,
+                   help='Job lease in seconds, renewed by heartbeat (default: 600)')
+    p.add_argument('--progress-interval', type=float, default=30.0,
+                   help='Seconds between progress lines (default: 30)')
+    p.set_defaults(func=cmd_run)
+
+    p = sub.add_parser('status', help='Show queue progress and failed jobs')
+    p.add_argument('--out', required=True)
+    p.add_argument('--show-failed', type=int, default=20)
+    p.add_argument('--retry-failed', action='store_true', help='Reset failed jobs to pending')
+    p.set_defaults(func=cmd_status)
+
+    p = sub.add_parser('merge', help='Merge SFT data of finished jobs into JSONL shards')
+    p.add_argument('--out', required=True)
+    p.add_argument('--shard-size', type=int, default=10000, help='Examples per shard (default: 10000)')
+    p.add_argument('--shard-bytes', type=int, default=0, help='Max bytes per shard (default: no limit)')
+    p.add_argument('--no-dedup', action='store_true', help='Keep near-identical examples')
+    p.add_argument('--hallucinations', choices=['keep', 'exclude', 'only'], default='keep',
+                   help='Filter on metadata.has_hallucinations (default: keep)')
+    p.add_argument('--max-severity', choices=['low', 'medium', 'high', 'critical'],
+                   help='Drop examples with a more severe hallucination than this')
+    p.set_defaults(func=cmd_merge)
+
+    args = parser.parse_args()
+    if getattr(args, 'referees', None) is None and args.command == 'enqueue':
+        args.referees = [2]
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,6 +27,75 @@ DAMAGES OR OTHER LIABILITY.
 
 === CHANGELOG ===
 
+v1.5.0 (unreleased):
+  [성능 / 비용 개선]
+  - PERF-01: RuleEngine – 고정 상수 / 금지 어휘 / 시대 개념 위반을 로컬 정규식으로
+        결정론적으로 검사하고 심판 결과와 병합 (FORBIDDEN_VOCABULARY 클래스 속성화).
+        opt-in (enable_rule_engine / --rule-engine), 상수 키워드는 단어 경계 + 숫자 근접 + 단위 일치
+  - PERF-02: extract_json – 단일 패스 JSON 추출 + 결함 수리 + 스키마 검증,
+        verify_statements / defend_against_referee에서 JSON 출력 모드 사용.
+        잘린 응답을 닫아서 살린 경우 schema_repairs에 JSON_TRUNCATED_REPAIR 기록
+        (심판: 경고 + claim 캐시에 기록하지 않음)
+  - PERF-03: _call_api 에러 분류(retryable / 즉시 실패), retry-after 준수,
+        클래스별 jitter backoff, provider별 CircuitBreaker (half-open 시험 슬롯은
+        어떤 결과든 반납, 코드 버그는 재시도 / circuit 집계 제외).
+        실패는 "[API ERROR …]" 문자열 대신 APICallError로 전달되어
+        교수 응답으로 기록되거나 심판에게 전달되지 않음 (results["failed_turns"])
+  - PERF-04: 역할별 모델 라우팅 (professor / student / referee / defense / validator)
+        – model, max_tokens, timeout, temperature를 config "model_routing" 및
+        CLI --route ROLE.FIELD=VALUE로 지정 (기본값은 기존 모델 + 역할별 max_tokens)
+  - PERF-05: 혼합 provider 심판 패널 (referee_panel) – 심판마다 provider / model /
+        client를 따로 두어 장애 상관관계를 낮추고, 심판 검증을 동시에 실행
+  - PERF-06: "openai_compatible" provider – 자체 호스팅 vLLM / llama.cpp 서버
+        (base_url, 모델 이름, 연결 풀 크기, keep-alive 설정, API 키 불필요)
+  - PERF-07: execution_mode="batch" – 같은 phase의 독립 호출(교수 teach,
+        심판 verify)을 BatchDispatcher로 모아 provider Batch API로 제출 후 polling.
+        순차 호출(학생 / 방어 / 기록 / 검증)은 sync. dispatcher는 provider 엔드포인트 단위로
+        시뮬레이션 간 공유 가능 (batch_dispatchers). 테스트: tests/batch_stub.py
+  - PERF-08: RequestCoalescer – 요청 전체 해시 기준 single-flight 병합.
+        동시에 진행 중인 동일 요청은 API 호출 1개를 공유 (coalesce off /
+        deterministic(temperature 0만, 기본) / all(샘플링 호출까지 – 다양성 감소))
+  - PERF-09: generate_corpus.py – SQLite 작업 큐 + 워커 프로세스 코퍼스 생성
+  - PERF-10: SFTShardWriter – SFT 예제를 기록 시점에 스트리밍, 개수/크기 샤딩,
+        정규화 해시 중복 제거, has_hallucinations / severity 필터, sha256 manifest
+        (results["sft_data"]는 호환을 위해 유지)
+  - PERF-16: referee_schedule.py – 심판 N명(≥2) 일반화 reset 스케줄 (주기 2N+1),
+        세션 수 제한 없는 lazy 스케줄, reset 여부 O(1) 판정, 분석기와 공유
+  - PERF-17: StageScheduler – stage_schedule={"mode": "adaptive"}이면 스테이지 내
+        연속 clean 세션 / confirmed_logic 증가 / (선택) 학생 수용 표현이 성립하면 다음 증거
+        스테이지로 진행 (스테이지별 min/max 세션, 마지막 스테이지 수렴 시 조기 종료).
+        실제 경계는 stage_boundaries, 스테이지별 종료 이유는 stage_schedule
+  - PERF-18: TurnController – turn_control={"mode": "adaptive"}이면 충돌 턴 이후
+        학생 수용 표현 / 질문 novelty 저하 / 새 할루시네이션 없는 충돌 반복 시 세션 조기
+        종료, 충돌이 계속 새 할루시네이션을 확정하면 턴 예산 연장 (max_extra_turns).
+        세션별 사용 턴 / 절약 턴 / 절약 호출 추정치는 results["turn_control"]
+  - PERF-19: PromptBuilder – 교수 teach / defense, 학생 질문, 심판 검증 프롬프트를
+        우선순위 섹션으로 조립하고 역할별 prompt_budget(라우팅 필드, count_tokens 기준)을
+        넘으면 낮은 우선순위 섹션부터 항목 생략 / 잘라내기 / 제외 (예산은 opt-in, 기본 제한 없음).
+        학생 프롬프트의 교수 설명은 교수별 블록을 같은 몫으로 잘라 모든 교수가 남는다.
+        호출별 크기는 agent.last_prompt_stats, 누적은 results["prompt_stats"]
+  - PERF-20: KeyEvidenceStore – key evidence를 정규화 해시로 중복 제거하고, 현재 질문과의
+        단어 겹침 / 같은 stage / 최근성으로 순위를 매겨 top-k · 토큰 상한만 프롬프트에 주입.
+        teach()의 자동 추출은 목록 번호를 숫자로 보지 않음
+  - PERF-21: evidence_stages 항목에 파일 참조({"file": …} .txt / .jsonl / .json) 허용,
+        시작 시 stage별 BM25 EvidenceIndex를 만들고 teach()에는 학생 질문 기준 현재 stage
+        top-k 증거만 전달 (stage가 top-k 이하이면 기존처럼 전부, 이후 stage 증거는 검색 제외)
+  - PERF-22: 학생 질문을 JSON({"acknowledgement", "questions"})으로 받아 로컬에서 검증 / 수리
+        (dict 항목, 문자열 "questions" / 붙어 있는 번호 질문 분리, 중복 제거, 깨진 JSON은
+        번호 줄 또는 '?' 문장으로 대체, 아무것도 복구되지 않으면 원문 그대로 전달).
+        질문이 부족할 때만 추가 호출, 횟수는 results["student_question_stats"]
+  - PERF-23: 충돌 해결 시 교수 방어를 (2 - deadlock_count)개 wave로 동시에 실행하고
+        원래 충돌 순서로 fold – 방어 호출 집합, deadlock_count, Force-Proceed 결과는
+        순차 실행과 동일 (같은 교수의 방어는 순서대로). results["defense_stats"]
+  - PERF-24: 심판 충돌 판정을 statement 앞 50자 대신 claim 정렬로 – 정규화 텍스트 +
+        단어 overlap(≥ claim_match_threshold, 기본 0.8) + complete-linkage 그룹, 그룹별 서로 다른
+        심판 수로 판정. 정렬 전/후 충돌 수는 results["conflict_stats"]
+  - PERF-25: claim_cache=True(--claim-cache)이면 심판마다 run 범위 ClaimVerificationCache –
+        교수 응답을 문장 claim으로 나눠 (stage, 정규화 sha1)로 판정을 저장하고 새 claim만
+        verify_statements에 보낸다. 캐시 판정은 결과에 병합 (cached=True), 새 claim이
+        없으면 호출 생략. 교수 방어 성공 / Force-Proceed 시 해당 finding 제거, 심판 reset
+        시 캐시 초기화. 절감량은 results["claim_cache"]
+
 v1.4.0 (2026-02-03):
   [Gemini 제안 검증 및 수용]
   - C2: confirmed_logic 오염 방지 – pending_logic 스테이징 버퍼 도입
@@ -84,17 +153,26 @@ v1.0.0:
 """
 
 import json
+import math
+import re
+import hashlib
 import time
 import random
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 import logging
 import sys
 import os
+import threading
+
+from referee_schedule import RefereeResetSchedule, RefereeResetScheduler
 
 # ---------------------------------------------------------------------------
 # API 클라이언트 라이브러리 — 미설치 시 명확한 안내 출력
+#   import 자체는 SDK 없이도 가능 (BatchDispatcher / extract_json 등 테스트용).
+#   실행 진입점은 require_api_client_library()로 확인한다.
 # ---------------------------------------------------------------------------
 try:
     import anthropic
@@ -110,7 +188,11 @@ except ImportError:
     _OPENAI_AVAILABLE = False
     openai = None  # type: ignore[assignment]
 
-if not _ANTHROPIC_AVAILABLE and not _OPENAI_AVAILABLE:
+
+def require_api_client_library():
+    """anthropic / openai SDK가 하나도 없으면 안내를 출력하고 종료한다 (CLI 진입점용)."""
+    if _ANTHROPIC_AVAILABLE or _OPENAI_AVAILABLE:
+        return
     print("=" * 70)
     print("  ❌ FATAL: No API client library installed")
     print("=" * 70)
@@ -123,6 +205,7 @@ if not _ANTHROPIC_AVAILABLE and not _OPENAI_AVAILABLE:
     print("=" * 70)
     sys.exit(1)
 
+
 # ---------------------------------------------------------------------------
 # SUGGEST-04: tiktoken 토큰 수 계산 (fallback 포함)
 # ---------------------------------------------------------------------------
@@ -183,35 +266,1391 @@ def count_tokens(text: str) -> int:
     return max(1, len(text) // 4)
 
 
+# ---------------------------------------------------------------------------
+# PERF-02 : 관대한 단일 패스 JSON 추출기 (심판 / 방어 응답용)
+# ---------------------------------------------------------------------------
+# 스키마 형식: {key: (기대 타입, 리스트 항목의 필수 키 tuple 또는 None)}
+REFEREE_RESULT_SCHEMA: Dict[str, Tuple[type, Optional[Tuple[str, ...]]]] = {
+    "professor_hallucinations": (list, ("statement",)),
+    "student_errors_missed_by_professors": (list, ("statement",)),
+}
+
+# PERF-22 : 학생 질문 (구조화 출력)
+STUDENT_RESULT_SCHEMA: Dict[str, Tuple[type, Optional[Tuple[str, ...]]]] = {
+    "questions": (list, None),
+}
+
+DEFENSE_RESULT_SCHEMA: Dict[str, Tuple[type, Optional[Tuple[str, ...]]]] = {
+    "acknowledges_error": (bool, None),
+    "defense": (str, None),
+    "sources": (list, None),
+    "corrected_statement": (str, None),
+}
+
+_JSON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+# response_format={"type": "json_object"}를 지원하지 않는 OpenAI 모델
+_OPENAI_NO_JSON_MODE = {"gpt-4", "gpt-4-0314", "gpt-4-0613", "gpt-4-32k"}
+
+
+# 잘린 응답을 닫아서 파싱했을 때 schema_repairs에 남는 항목 (뒤쪽 내용은 유실됐을 수 있음)
+JSON_TRUNCATED_REPAIR = "truncated response (auto-closed)"
+
+
+def _scan_json_object(text: str) -> Tuple[Optional[str], bool]:
+    """
+    첫 번째 '{'부터 균형 잡힌 객체 끝까지 한 번 훑으면서 흔한 LLM 결함을 수리한다.
+    Returns: (candidate, truncated) – truncated는 객체가 닫히기 전에 응답이 끝난 경우
+
+      • 작은따옴표 문자열 → 큰따옴표
+      • 닫는 괄호 앞의 trailing comma 제거
+      • Python 리터럴 True/False/None → JSON 리터럴
+      • 문자열 안의 raw 개행 → \\n
+      • 잘린 응답 → 열린 문자열/배열/객체를 닫아 줌
+    """
+    start = text.find("{")
+    if start == -1:
+        return None, False
+
+    out: List[str] = []
+    stack: List[str] = []
+    quote: Optional[str] = None
+    i, n = start, len(text)
+
+    def drop_trailing_comma():
+        while out and out[-1].isspace():
+            out.pop()
+        if out and out[-1] == ",":
+            out.pop()
+
+    while i < n:
+        ch = text[i]
+        if quote:
+            if ch == "\\" and i + 1 < n:
+                nxt = text[i + 1]
+                # \' 는 JSON에서 유효하지 않으므로 그대로 ' 로
+                out.append("'" if nxt == "'" else ch + nxt)
+                i += 2
+                continue
+            if ch == quote:
+                out.append('"')
+                quote = None
+            elif ch == '"':              # 작은따옴표 문자열 안의 큰따옴표
+                out.append('\\"')
+            elif ch == "\n":
+                out.append("\\n")
+            else:
+                out.append(ch)
+        elif ch in "\"'":
+            quote = ch
+            out.append('"')
+        elif ch in "{[":
+            stack.append(ch)
+            out.append(ch)
+        elif ch in "}]":
+            drop_trailing_comma()
+            if stack:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                return "".join(out), False
+        elif ch.isalpha():
+            j = i
+            while j < n and (text[j].isalnum() or text[j] == "_"):
+                j += 1
+            word = text[i:j]
+            out.append(_JSON_LITERALS.get(word, word))
+            i = j
+            continue
+        else:
+            out.append(ch)
+        i += 1
+
+    # ---- 잘린 응답 복구 ----
+    if quote:
+        out.append('"')
+    drop_trailing_comma()
+    if out and out[-1] == ":":
+        out.append("null")
+    elif stack and stack[-1] == "{" and out and out[-1] == '"':
+        # 값 없이 끝난 key:  {"a": 1, "b"  → "b": null
+        # (값으로 끝난 문자열인지 key인지 구분: 직전 비공백이 ',' 또는 '{' 이면 key)
+        k = len(out) - 2
+        while k >= 0 and out[k] != '"':
+            k -= 1
+        k -= 1
+        while k >= 0 and out[k].isspace():
+            k -= 1
+        if k >= 0 and out[k] in ",{":
+            out.append(": null")
+    for opener in reversed(stack):
+        out.append("}" if opener == "{" else "]")
+    return "".join(out), True
+
+
+def _apply_json_schema(obj: Dict, schema: Dict) -> List[str]:
+    """스키마에 맞게 누락/잘못된 타입을 기본값으로 채우고 문제 목록을 반환한다."""
+    problems: List[str] = []
+    for key, (expected, required_item_keys) in schema.items():
+        value = obj.get(key)
+        if value is None:
+            obj[key] = expected()
+            problems.append(f"missing '{key}'")
+            continue
+        if expected is bool and isinstance(value, str):
+            obj[key] = value.strip().lower() in ("true", "yes", "1")
+            continue
+        if not isinstance(value, expected):
+            if expected is str:
+                obj[key] = str(value)
+            else:
+                obj[key] = expected()
+                problems.append(f"'{key}' is not {expected.__name__}")
+            continue
+        if expected is list and required_item_keys:
+            kept = [item for item in value
+                    if isinstance(item, dict) and all(k in item for k in required_item_keys)]
+            if len(kept) != len(value):
+                problems.append(f"dropped {len(value) - len(kept)} malformed item(s) in '{key}'")
+            obj[key] = kept
+    return problems
+
+
+def extract_json(text: str, schema: Optional[Dict] = None) -> Tuple[Dict, Optional[str]]:
+    """
+    LLM 응답에서 첫 번째 JSON 객체를 추출한다.
+
+    Returns: (parsed_object, error)
+      • 성공 시 error는 None (스키마 보정 내역은 obj['schema_repairs']에 기록).
+        잘린 응답을 닫아서 파싱했으면 schema 유무와 관계없이 JSON_TRUNCATED_REPAIR 기록
+      • 실패 시 schema 기본값으로 채운 dict와 에러 메시지
+    """
+    candidate, truncated = _scan_json_object(text or "")
+    obj: Optional[Dict] = None
+    error: Optional[str] = None
+
+    if candidate is None:
+        error = "no JSON object found"
+    else:
+        try:
+            parsed = json.loads(candidate)
+            if isinstance(parsed, dict):
+                obj = parsed
+            else:
+                error = f"top-level JSON is {type(parsed).__name__}, expected object"
+        except json.JSONDecodeError as e:
+            error = str(e)
+
+    if obj is None:
+        obj = {}
+    problems = [JSON_TRUNCATED_REPAIR] if truncated else []
+    if schema:
+        problems += _apply_json_schema(obj, schema)
+    if error is not None and truncated:
+        error = f"{error} ({JSON_TRUNCATED_REPAIR})"
+    elif problems and error is None:
+        obj["schema_repairs"] = problems
+    return obj, error
+
+
+# ---------------------------------------------------------------------------
+# PERF-03 : API 에러 분류 / 재시도 정책 / 서킷 브레이커
+# ---------------------------------------------------------------------------
+class APICallError(Exception):
+    """
+    Typed failure raised by PersonaAgent._call_api when a call cannot be completed.
+
+    이전에는 "[API ERROR …]" 문자열을 반환해서 교수 응답으로 기록되고
+    심판 검증까지 전달되었다. 이제 호출자가 턴 단위로 실패를 처리한다.
+    """
+
+    def __init__(self, agent_name: str, error_class: str, message: str,
+                 attempts: int, provider: str = ""):
+        super().__init__(f"[{agent_name}] {error_class} after {attempts} attempt(s): {message}")
+        self.agent_name = agent_name
+        self.error_class = error_class
+        self.message = message
+        self.attempts = attempts
+        self.provider = provider
+
+    def to_dict(self) -> Dict:
+        return {
+            "agent": self.agent_name,
+            "error_class": self.error_class,
+            "message": self.message,
+            "attempts": self.attempts,
+            "provider": self.provider,
+        }
+
+
+# 에러 클래스별 재시도 정책 (base/max: 초 단위 backoff)
+RETRY_POLICY: Dict[str, Dict] = {
+    "rate_limit":      {"retryable": True,  "base": 5.0, "max": 60.0},
+    "overloaded":      {"retryable": True,  "base": 5.0, "max": 60.0},
+    "server":          {"retryable": True,  "base": 2.0, "max": 30.0},
+    "timeout":         {"retryable": True,  "base": 1.0, "max": 30.0},
+    "connection":      {"retryable": True,  "base": 1.0, "max": 30.0},
+    "unknown":         {"retryable": True,  "base": 1.0, "max": 30.0},
+    "programming":     {"retryable": False, "base": 0.0, "max": 0.0},
+    "auth":            {"retryable": False, "base": 0.0, "max": 0.0},
+    "invalid_request": {"retryable": False, "base": 0.0, "max": 0.0},
+    "context_length":  {"retryable": False, "base": 0.0, "max": 0.0},
+    "circuit_open":    {"retryable": False, "base": 0.0, "max": 0.0},
+}
+
+RETRY_AFTER_CAP_SEC = 120.0
+
+# SDK 밖의 코드 버그 (재시도해도 같은 결과 → 재시도 / circuit 집계 대상 아님)
+_PROGRAMMING_ERRORS = (LookupError, TypeError, AttributeError, NameError,
+                       AssertionError, NotImplementedError)
+
+_CONTEXT_LENGTH_HINTS = ("context_length", "context length", "prompt is too long",
+                         "maximum context", "too many tokens")
+
+
+def classify_api_error(exc: Exception) -> str:
+    """SDK 종류와 무관하게 status code / 클래스 이름으로 에러를 분류한다."""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    name = type(exc).__name__
+    text = str(exc).lower()
+
+    if isinstance(exc, TimeoutError) or "Timeout" in name:
+        return "timeout"
+    if isinstance(exc, ConnectionError) or "Connection" in name:
+        return "connection"
+    if status == 429 or "RateLimit" in name:
+        return "rate_limit"
+    if status == 529 or "Overloaded" in name or "overloaded" in text:
+        return "overloaded"
+    if status in (401, 403) or "Authentication" in name or "PermissionDenied" in name:
+        return "auth"
+    if status in (400, 404, 413, 422) or "BadRequest" in name or "NotFound" in name:
+        if status == 413 or any(h in text for h in _CONTEXT_LENGTH_HINTS):
+            return "context_length"
+        return "invalid_request"
+    if isinstance(status, int) and status >= 500 or "InternalServer" in name:
+        return "server"
+    if isinstance(exc, _PROGRAMMING_ERRORS):
+        return "programming"
+    return "unknown"
+
+
+def _retry_after_seconds(exc: Exception) -> Optional[float]:
+    """응답 헤더의 retry-after(-ms)를 초 단위로 반환 (없으면 None)"""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms") is not None:
+            return min(float(headers["retry-after-ms"]) / 1000.0, RETRY_AFTER_CAP_SEC)
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return min(float(value), RETRY_AFTER_CAP_SEC)
+        except ValueError:
+            from email.utils import parsedate_to_datetime
+            delta = parsedate_to_datetime(value).timestamp() - time.time()
+            return min(max(0.0, delta), RETRY_AFTER_CAP_SEC)
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class CircuitBreaker:
+    """
+    Per-provider circuit breaker.
+
+    연속 실패가 failure_threshold회에 도달하면 open → cooldown_sec 동안 즉시 실패.
+    cooldown 후 half-open 상태에서 1건만 시도 허용, 성공하면 closed로 복귀.
+    시험 호출이 일시적 실패도 성공도 아닌 결과(auth / invalid_request / 코드 버그)로
+    끝나면 release()로 시험 슬롯만 반납한다 – 다음 호출이 다시 시험할 수 있다.
+    """
+
+    def __init__(self, failure_threshold: int = 5, cooldown_sec: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown_sec = cooldown_sec
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._half_open_trial = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown_sec:
+                return False
+            if self._half_open_trial:
+                return False           # half-open: 시험 호출 진행 중
+            self._half_open_trial = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self.opened_at = None
+            self._half_open_trial = False
+
+    def release(self):
+        with self._lock:
+            self._half_open_trial = False
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self._half_open_trial or self.consecutive_failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._half_open_trial = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown_sec:
+            return "half-open"
+        return "open"
+
+
+_CIRCUIT_BREAKERS: Dict[str, CircuitBreaker] = {}
+_CIRCUIT_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(provider_key: str) -> CircuitBreaker:
+    with _CIRCUIT_BREAKERS_LOCK:
+        if provider_key not in _CIRCUIT_BREAKERS:
+            _CIRCUIT_BREAKERS[provider_key] = CircuitBreaker()
+        return _CIRCUIT_BREAKERS[provider_key]
+
+
+# ---------------------------------------------------------------------------
+# PERF-04 : 역할별 모델 라우팅 (비용 / 지연 tier)
+# ---------------------------------------------------------------------------
+DEFAULT_MODELS: Dict[str, Optional[str]] = {
+    "anthropic": "claude-sonnet-4-20250514",
+    "openai": "gpt-4",
+    "openai_compatible": None,    # PERF-06: 서버마다 다르므로 반드시 지정
+}
+
+# model=None → provider 기본 모델, temperature=None → 호출부 기본값 사용
+# PERF-19 : prompt_budget = 사용자 프롬프트 토큰 상한 (None → 제한 없음, system prompt 제외).
+#           기본은 제한 없음 – 잘라낸 교수 발언은 학생 / 심판이 보지 못하므로 opt-in
+DEFAULT_ROLE_ROUTING: Dict[str, Dict] = {
+    "professor": {"model": None, "max_tokens": 4096, "timeout": 120, "temperature": None,
+                  "prompt_budget": None},
+    "student":   {"model": None, "max_tokens": 1024, "timeout": 60,  "temperature": None,
+                  "prompt_budget": None},
+    "referee":   {"model": None, "max_tokens": 2048, "timeout": 90,  "temperature": None,
+                  "prompt_budget": None},
+    "defense":   {"model": None, "max_tokens": 1536, "timeout": 90,  "temperature": None,
+                  "prompt_budget": None},
+    "validator": {"model": None, "max_tokens": 4096, "timeout": 120, "temperature": None,
+                  "prompt_budget": None},
+}
+
+_ROUTE_FIELD_TYPES = {"model": str, "max_tokens": int, "timeout": float, "temperature": float,
+                      "prompt_budget": int}
+
+
+def build_model_routing(api_provider: str, overrides: Optional[Dict[str, Dict]] = None,
+                        default_model: Optional[str] = None) -> Dict[str, Dict]:
+    """
+    기본 라우팅 테이블에 config / CLI override를 병합한 완전한 테이블을 반환한다.
+
+    overrides 예:  {"referee": {"model": "claude-3-5-haiku-latest", "max_tokens": 1024}}
+    default_model: override가 없는 역할에 쓸 모델 (없으면 DEFAULT_MODELS[api_provider])
+    """
+    routing = {role: dict(cfg) for role, cfg in DEFAULT_ROLE_ROUTING.items()}
+    for role, cfg in (overrides or {}).items():
+        if role not in routing:
+            raise ValueError(f"Unknown routing role '{role}' "
+                             f"(expected one of: {', '.join(routing)})")
+        for key, value in cfg.items():
+            if key not in _ROUTE_FIELD_TYPES:
+                raise ValueError(f"Unknown routing field '{role}.{key}' "
+                                 f"(expected one of: {', '.join(_ROUTE_FIELD_TYPES)})")
+            routing[role][key] = None if value is None else _ROUTE_FIELD_TYPES[key](value)
+
+    default_model = default_model or DEFAULT_MODELS.get(api_provider)
+    for role, cfg in routing.items():
+        if cfg["model"] is None:
+            if default_model is None:
+                raise ValueError(f"No model configured for role '{role}' on provider "
+                                 f"'{api_provider}' (use --model or model_routing)")
+            cfg["model"] = default_model
+    return routing
+
+
+def parse_route_overrides(items: List[str]) -> Dict[str, Dict]:
+    """CLI의 ROLE.FIELD=VALUE 목록을 override dict로 변환한다."""
+    overrides: Dict[str, Dict] = {}
+    for item in items or []:
+        try:
+            target, value = item.split("=", 1)
+            role, field = target.split(".", 1)
+        except ValueError:
+            raise ValueError(f"Invalid route '{item}' (expected ROLE.FIELD=VALUE, "
+                             f"e.g. referee.max_tokens=1024)")
+        overrides.setdefault(role.strip(), {})[field.strip()] = value.strip()
+    return overrides
+
+
+# ---------------------------------------------------------------------------
+# PERF-19 : 토큰 예산 기반 프롬프트 조립
+# ---------------------------------------------------------------------------
+class PromptBuilder:
+    """
+    우선순위가 있는 섹션들을 토큰 예산(count_tokens) 안에서 조립한다.
+
+      priority 0  : 필수 – 줄이거나 빼지 않는다 (질문, 지시문, 검증 대상 등)
+      priority ≥1 : 숫자가 클수록 먼저 줄인다 (같으면 나중에 추가된 섹션부터)
+
+    예산을 넘으면 낮은 우선순위 섹션부터
+      • items 섹션 : 뒤쪽 항목을 빼고 "(… N more omitted)" 요약 줄로 대체
+      • text 섹션  : 앞부분만 남기고 "[… truncated]" 표시
+      • blocks 섹션: 블록마다 같은 토큰 상한(water-filling)으로 앞부분만 남김 –
+                     긴 블록부터 줄고, 상한이 바닥(floor: 첫 줄 제목 + 첫 문장)보다
+                     작으면 그 블록은 floor로 남는다. blocks 섹션은 빼지 않는다
+    를 적용하고, 그래도 넘치면 (blocks 외) 섹션을 통째로 뺀다.
+    필수 섹션 / block floor만으로 예산을 넘으면 그대로 보내고 stats["over_budget"]에 표시한다.
+    floor로 줄어든 블록 수는 stats["floored_blocks"][섹션 이름].
+    섹션은 추가한 순서대로 빈 줄로 이어 붙인다.
+    """
+
+    FLOOR_CHARS = 200            # block floor의 첫 문장 최대 길이
+
+    _SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+    def __init__(self, budget: Optional[int] = None):
+        self.budget = budget
+        self.sections: List[Dict] = []
+        self.stats: Dict = {}
+
+    def text(self, name: str, text: str, priority: int = 0) -> "PromptBuilder":
+        if text:
+            self.sections.append({"name": name, "kind": "text", "priority": priority,
+                                  "text": text})
+        return self
+
+    def items(self, name: str, items: List[str], header: str = "", footer: str = "",
+              bullet: str = "- ", priority: int = 1) -> "PromptBuilder":
+        if items:
+            self.sections.append({"name": name, "kind": "items", "priority": priority,
+                                  "header": header, "footer": footer,
+                                  "lines": [f"{bullet}{it}" for it in items]})
+        return self
+
+    def blocks(self, name: str, blocks: List[str], header: str = "",
+               separator: str = "\n\n", priority: int = 1) -> "PromptBuilder":
+        if blocks:
+            self.sections.append({"name": name, "kind": "blocks", "priority": priority,
+                                  "header": header, "separator": separator,
+                                  "blocks": list(blocks)})
+        return self
+
+    @staticmethod
+    def _render(section: Dict) -> str:
+        if section["kind"] == "text":
+            return section["text"]
+        if section["kind"] == "blocks":
+            body = section["separator"].join(section["blocks"])
+            return f"{section['header']}\n{body}" if section["header"] else body
+        parts = [section["header"]] if section["header"] else []
+        parts.extend(section["lines"])
+        if section["footer"]:
+            parts.append(section["footer"])
+        return "\n".join(parts)
+
+    def _shrink(self, section: Dict, target: int) -> bool:
+        """section을 target 토큰 이하로 줄인다. 의미 있는 내용이 남지 않으면 False."""
+        if section["kind"] == "items":
+            lines = list(section["lines"])
+            omitted = 0
+            while len(lines) > 1:
+                lines.pop()
+                omitted += 1
+                trial = dict(section, lines=lines + [f"  (… {omitted} more omitted)"])
+                if count_tokens(self._render(trial)) <= target:
+                    section["lines"] = trial["lines"]
+                    return True
+            return False
+        if section["kind"] == "blocks":
+            return self._shrink_blocks(section, target)
+        trimmed = self._truncate(section["text"], target)
+        if trimmed is None:
+            return False
+        section["text"] = trimmed
+        return True
+
+    @staticmethod
+    def _truncate(text: str, target: int) -> Optional[str]:
+        """text 앞부분을 target 토큰 이하로 (40자 미만만 남으면 None)."""
+        if count_tokens(text) <= target:
+            return text
+        keep = len(text) * target // max(1, count_tokens(text))
+        while keep > 40:
+            trial = text[:keep].rstrip() + " [… truncated]"
+            if count_tokens(trial) <= target:
+                return trial
+            keep = keep * 9 // 10
+        return None
+
+    @classmethod
+    def _block_floor(cls, block: str) -> str:
+        """블록의 최소 형태: 첫 줄(제목, 예: "Professor 1:") + 본문 첫 문장."""
+        heading, _, body = block.strip().partition("\n")
+        if not body.strip():
+            heading, body = "", heading
+        first = cls._SENTENCE_END_RE.split(body.strip(), 1)[0]
+        if len(first) > cls.FLOOR_CHARS:
+            first = first[:cls.FLOOR_CHARS].rstrip()
+        floor = f"{heading}\n{first}" if heading else first
+        return floor if floor == block.strip() else floor + " [… truncated]"
+
+    def _shrink_blocks(self, section: Dict, target: int) -> bool:
+        """
+        블록마다 같은 상한으로 줄인다. 상한 아래로 못 줄이는 블록은 floor로 남긴다.
+        floor까지 줄여도 target을 넘으면 floor 상태로 두고 False (섹션은 빼지 않음).
+        """
+        blocks = section["blocks"]
+        floors = [self._block_floor(b) for b in blocks]
+        sizes = [count_tokens(b) for b in blocks]
+        overhead = count_tokens(self._render(dict(section, blocks=[""] * len(blocks))))
+        available = target - overhead
+        # water-filling: sum(min(size, cap)) ≤ available 이 되는 가장 큰 cap
+        cap = available // max(1, len(blocks))
+        for i, size in enumerate(sorted(sizes)):
+            rest = len(sizes) - i
+            if size * rest > available:
+                cap = available // rest
+                break
+            available -= size
+        else:
+            return True
+
+        def trim(cap: int) -> List[str]:
+            out = []
+            for block, floor in zip(blocks, floors):
+                cut = self._truncate(block, cap)
+                out.append(floor if cut is None or count_tokens(cut) < count_tokens(floor)
+                           else cut)
+            return out
+
+        while cap > 0:
+            trimmed = trim(cap)
+            if count_tokens(self._render(dict(section, blocks=trimmed))) <= target:
+                section["blocks"] = trimmed
+                section["floored"] = sum(t is f for t, f in zip(trimmed, floors))
+                return True
+            cap = cap * 9 // 10
+        section["blocks"] = [min(b, f, key=count_tokens) for b, f in zip(blocks, floors)]
+        section["floored"] = sum(b is f for b, f in zip(section["blocks"], floors))
+        return False
+
+    def build(self) -> str:
+        sizes = {id(sec): count_tokens(self._render(sec)) for sec in self.sections}
+        total = sum(sizes.values())
+        actions = {sec["name"]: "kept" for sec in self.sections}
+        original = total
+
+        if self.budget is not None and total > self.budget:
+            order = sorted((sec for sec in self.sections if sec["priority"] > 0),
+                           key=lambda sec: (-sec["priority"], -self.sections.index(sec)))
+            for sec in order:
+                if total <= self.budget:
+                    break
+                target = sizes[id(sec)] - (total - self.budget)
+                if sec["kind"] == "blocks":          # 블록은 빼지 않고 floor까지만 줄인다
+                    fitted = self._shrink_blocks(sec, target)
+                    actions[sec["name"]] = "trimmed" if fitted else "floor"
+                    new_size = count_tokens(self._render(sec))
+                elif target > 0 and self._shrink(sec, target):
+                    actions[sec["name"]] = "trimmed"
+                    new_size = count_tokens(self._render(sec))
+                else:
+                    actions[sec["name"]] = "dropped"
+                    sec["dropped"] = True
+                    new_size = 0
+                total += new_size - sizes[id(sec)]
+                sizes[id(sec)] = new_size
+
+        prompt = "\n\n".join(self._render(sec) for sec in self.sections
+                              if not sec.get("dropped"))
+        self.stats = {
+            "budget": self.budget,
+            "tokens": count_tokens(prompt),
+            "original_tokens": original,
+            "over_budget": self.budget is not None and total > self.budget,
+            "sections": actions,
+            "floored_blocks": {sec["name"]: sec["floored"] for sec in self.sections
+                               if sec.get("floored")},
+        }
+        return prompt
+
+
+# ---------------------------------------------------------------------------
+# PERF-20 : 해시 중복 제거 + 관련도 순위 key evidence 저장소
+# ---------------------------------------------------------------------------
+_EVIDENCE_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+# 줄 앞의 목록 표시: "1.", "2)", "-", "*", "**", "#", "(3)" …
+_LIST_MARKER_RE = re.compile(r"^(?:\*\*|(?:[#>*•-]+|\(?\d{1,2}[.)])(?=[\s*])[\s*]*)+")
+
+_EVIDENCE_STOPWORDS = frozenset(
+    "the and for that this with from are was were which what how why does did has have "
+    "its into than then there their these those been being also can could would should "
+    "not but about over under between your you our they them".split()
+)
+
+
+class KeyEvidenceStore:
+    """
+    Key evidence (BUG-020) 저장소.
+
+    • add()    : 소문자 + 구두점·공백 정규화 후 sha1로 중복 제거 (dict 조회 O(1)).
+                 capacity를 넘으면 가장 오래된 항목부터 제거 (기존 "최근 20개" 규칙).
+    • select() : 현재 질문과의 단어 겹침 + 같은 stage 가산점 + 최근성으로 순위를 매겨
+                 top_k개, max_tokens(count_tokens) 이내만 반환한다.
+    """
+
+    def __init__(self, capacity: int = 20, top_k: int = 8, max_tokens: int = 400):
+        self.capacity = capacity
+        self.top_k = top_k
+        self.max_tokens = max_tokens
+        self._entries: Dict[str, Dict] = {}     # hash → entry (삽입 순서 = 오래된 순)
+        self._seq = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(_EVIDENCE_WORD_RE.findall(text.lower()))
+
+    @classmethod
+    def terms(cls, text: str) -> set:
+        return {w for w in cls.normalize(text).split()
+                if len(w) > 2 and w not in _EVIDENCE_STOPWORDS}
+
+    def add(self, text: str, stage: Optional[int] = None) -> bool:
+        """새 항목이면 True. 같은 정규화 텍스트는 최근성 / stage만 갱신한다."""
+        normalized = self.normalize(text)
+        if not normalized:
+            return False
+        key = hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+        self._seq += 1
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            entry["seq"] = self._seq
+            entry["stage"] = stage if stage is not None else entry["stage"]
+            self._entries[key] = entry
+            return False
+        self._entries[key] = {"text": text, "terms": self.terms(text),
+                              "stage": stage, "seq": self._seq}
+        while len(self._entries) > self.capacity:
+            del self._entries[next(iter(self._entries))]
+        return True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self):
+        return (entry["text"] for entry in self._entries.values())
+
+    def __contains__(self, text: str) -> bool:
+        normalized = self.normalize(text)
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest() in self._entries
+
+    def rank(self, query: str = "", stage: Optional[int] = None) -> List[str]:
+        query_terms = self.terms(query) if query else set()
+        newest = self._seq or 1
+
+        def score(entry: Dict) -> float:
+            overlap = len(query_terms & entry["terms"])
+            relevance = overlap / (len(entry["terms"]) ** 0.5) if overlap else 0.0
+            same_stage = 0.5 if stage is not None and entry["stage"] == stage else 0.0
+            return relevance + same_stage + 0.1 * entry["seq"] / newest
+
+        ranked = sorted(self._entries.values(), key=score, reverse=True)
+        return [entry["text"] for entry in ranked]
+
+    def select(self, query: str = "", stage: Optional[int] = None) -> List[str]:
+        selected, used = [], 0
+        for text in self.rank(query, stage)[:self.top_k]:
+            cost = count_tokens(text)
+            if selected and used + cost > self.max_tokens:
+                break
+            selected.append(text)
+            used += cost
+        return selected
+
+
+# ---------------------------------------------------------------------------
+# PERF-21 : 파일 기반 evidence stage + stage별 BM25 검색 인덱스
+# ---------------------------------------------------------------------------
+def _evidence_file_items(path: str) -> List[str]:
+    """
+    .txt   : 한 줄에 증거 1개 (빈 줄 / '#' 주석 무시)
+    .jsonl : 줄마다 문자열 또는 {"text": …}
+    .json  : 문자열 / {"text": …} 리스트
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.json'):
+            rows = json.load(f)
+        elif path.endswith('.jsonl'):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = [line.strip() for line in f
+                    if line.strip() and not line.lstrip().startswith('#')]
+    return [str(row["text"] if isinstance(row, dict) else row).strip() for row in rows]
+
+
+def _evidence_refs(stage) -> List:
+    """stage 정의를 항목 리스트로: 문자열 경로 / {"file": …} / 그 둘과 문자열을 섞은 리스트."""
+    if isinstance(stage, (str, dict)):
+        return [stage if isinstance(stage, dict) else {"file": stage}]
+    return list(stage)
+
+
+def resolve_evidence_paths(evidence_stages: List, base_dir: str) -> List:
+    """config 파일 기준 상대 경로 {"file": …}를 절대 경로로 바꾼다 (내용은 읽지 않음)."""
+    resolved = []
+    for stage in evidence_stages:
+        items = []
+        for item in _evidence_refs(stage):
+            if isinstance(item, dict) and "file" in item:
+                item = dict(item, file=os.path.join(base_dir, os.path.expanduser(item["file"])))
+            items.append(item)
+        resolved.append(items)
+    return resolved
+
+
+def load_evidence_stages(evidence_stages: List) -> List[List[str]]:
+    """
+    evidence_stages의 각 stage는 증거 문자열 리스트(기존 형식)이거나,
+    파일 참조({"file": path} 또는 경로 문자열 하나)를 포함할 수 있다.
+      "evidence_stages": [["inline 1", "inline 2"], {"file": "ev/stage2.txt"},
+                          ["inline", {"file": "ev/stage3.jsonl"}]]
+    """
+    stages = []
+    for stage in evidence_stages:
+        items = []
+        for item in _evidence_refs(stage):
+            if isinstance(item, dict):
+                if "file" not in item:
+                    raise ValueError(f"Evidence reference needs a 'file' key: {item}")
+                items.extend(_evidence_file_items(item["file"]))
+            else:
+                items.append(str(item))
+        stages.append(items)
+    return stages
+
+
+class EvidenceIndex:
+    """
+    Stage별 BM25 인덱스 (pure Python, 시뮬레이션 시작 시 1회 구축).
+
+    search(query, stage)는 해당 stage의 증거만 검색한다 – 다른 stage(특히 이후 stage)
+    증거는 후보에도 오르지 않는다. stage 증거가 top_k개 이하이면 검색하지 않고
+    원래 순서 그대로 전부 반환한다 (기존 템플릿은 프롬프트가 바뀌지 않음).
+    """
+
+    def __init__(self, evidence_stages: List[List[str]], top_k: int = 10,
+                 k1: float = 1.5, b: float = 0.75):
+        if top_k < 1:
+            raise ValueError(f"Evidence top_k must be at least 1, got {top_k}")
+        self.top_k = top_k
+        self.k1 = k1
+        self.b = b
+        self.stages = [list(items) for items in evidence_stages]
+        self._indexes = [self._build(items) for items in self.stages]
+
+    @staticmethod
+    def tokenize(text: str) -> List[str]:
+        return [w for w in _EVIDENCE_WORD_RE.findall(text.lower())
+                if len(w) > 2 and w not in _EVIDENCE_STOPWORDS]
+
+    def _build(self, items: List[str]) -> Dict:
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        lengths = []
+        for doc_id, text in enumerate(items):
+            terms = self.tokenize(text)
+            lengths.append(len(terms))
+            counts: Dict[str, int] = defaultdict(int)
+            for term in terms:
+                counts[term] += 1
+            for term, tf in counts.items():
+                postings[term].append((doc_id, tf))
+        n = len(items)
+        idf = {term: math.log(1 + (n - len(p) + 0.5) / (len(p) + 0.5))
+               for term, p in postings.items()}
+        return {"postings": postings, "idf": idf, "lengths": lengths,
+                "avgdl": (sum(lengths) / n) if n else 0.0}
+
+    def stage_size(self, stage: int) -> int:
+        return len(self.stages[stage - 1])
+
+    def search(self, query: str, stage: int, top_k: Optional[int] = None) -> List[str]:
+        items = self.stages[stage - 1]
+        top_k = self.top_k if top_k is None else top_k
+        if top_k < 1:
+            raise ValueError(f"Evidence top_k must be at least 1, got {top_k}")
+        if len(items) <= top_k:
+            return list(items)
+
+        index = self._indexes[stage - 1]
+        scores: Dict[int, float] = defaultdict(float)
+        avgdl = index["avgdl"] or 1.0
+        for term in set(self.tokenize(query)):
+            for doc_id, tf in index["postings"].get(term, ()):
+                norm = self.k1 * (1 - self.b + self.b * index["lengths"][doc_id] / avgdl)
+                scores[doc_id] += index["idf"][term] * tf * (self.k1 + 1) / (tf + norm)
+
+        ranked = sorted(scores, key=lambda d: (-scores[d], d))[:top_k]
+        if len(ranked) < top_k:   # 겹치는 단어가 부족하면 stage 앞쪽 항목으로 채움
+            seen = set(ranked)
+            ranked += [d for d in range(len(items)) if d not in seen][:top_k - len(ranked)]
+        return [items[d] for d in ranked]
+
+
+# ---------------------------------------------------------------------------
+# PERF-24 : 심판 finding claim 정렬 (같은 주장을 다른 범위로 인용해도 한 claim)
+# ---------------------------------------------------------------------------
+_CLAIM_NUMBER_RE = re.compile(r"\d+(?:[.,]\d+)*")
+
+
+class ClaimAligner:
+    """
+    심판 finding을 같은 교수의 같은 claim끼리 묶는다 (complete-linkage).
+
+    두 statement는 정규화 텍스트가 같거나, 단어 overlap |A∩B| / min(|A|,|B|)이
+    threshold 이상이면 같은 claim이다 – 한 심판이 문장 일부만 인용해도 병합된다.
+    그룹에 들어가려면 기존 멤버 전부와 threshold 이상이어야 한다 – 짧은 인용 하나가
+    서로 다른 긴 claim 두 개를 한 그룹으로 잇지 못한다 (이어지면 실제 이견이 가려진다).
+    숫자는 짧은 쪽의 숫자가 모두 긴 쪽에 있어야 한다 (9.8 vs 9.81 은 다른 claim).
+    단어가 min_tokens개 미만인 statement는 정확히 같을 때만 병합한다.
+    """
+
+    def __init__(self, threshold: float = 0.8, min_tokens: int = 3):
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Claim match threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.min_tokens = min_tokens
+
+    @staticmethod
+    def features(text: str) -> Dict:
+        text = text.lower()
+        words = [w for w in _EVIDENCE_WORD_RE.findall(text)
+                 if not w.isdigit() and w not in _EVIDENCE_STOPWORDS]
+        numbers = set(_CLAIM_NUMBER_RE.findall(text))
+        return {"norm": " ".join(words + sorted(numbers)),
+                "words": set(words), "numbers": numbers}
+
+    def similarity(self, a: Dict, b: Dict) -> float:
+        if a["norm"] == b["norm"]:
+            return 1.0
+        short, long_ = (a, b) if len(a["words"]) <= len(b["words"]) else (b, a)
+        if len(short["words"]) < self.min_tokens or not short["numbers"] <= long_["numbers"]:
+            return 0.0
+        return len(short["words"] & long_["words"]) / len(short["words"])
+
+    def group(self, claims: List[Tuple[object, str]]) -> List[List[int]]:
+        """
+        claims: [(key, statement)] → 같은 key 안에서 병합된 index 그룹 (첫 등장 순).
+        등장 순서대로, 모든 멤버와 threshold 이상인 그룹 중 최소 유사도가 가장 높은
+        그룹에 넣고 (동률이면 먼저 생긴 그룹), 없으면 새 그룹을 만든다.
+        """
+        feats = [self.features(text) for _, text in claims]
+        groups: List[List[int]] = []
+        by_key: Dict[object, List[List[int]]] = defaultdict(list)
+        for i, (key, _) in enumerate(claims):
+            best, best_score = None, 0.0
+            for members in by_key[key]:
+                score = min(self.similarity(feats[i], feats[j]) for j in members)
+                if score >= self.threshold and score > best_score:
+                    best, best_score = members, score
+            if best is None:
+                best = []
+                groups.append(best)
+                by_key[key].append(best)
+            best.append(i)
+        return groups
+
+
+# ---------------------------------------------------------------------------
+# PERF-25 : 심판별 claim 판정 캐시 (이미 검증한 문장은 다시 보내지 않음)
+# ---------------------------------------------------------------------------
+_CLAIM_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+_CACHED_CLAIMS_PLACEHOLDER = "(no new statements – all previously verified)"
+
+
+class ClaimVerificationCache:
+    """
+    Run-scoped verdicts of one referee, keyed by (stage, sha1(normalised claim)).
+
+    plan()은 교수 응답을 문장 단위 claim으로 나눠 캐시에 없는 claim만 모은 검증용
+    응답 목록을 만든다. record()는 새 판정을 claim에 귀속시켜 저장한다 – finding이
+    없으면 clean, 있으면 해당 finding들. 어느 claim인지 특정할 수 없는 finding이 있으면
+    그 교수의 이번 claim들은 저장하지 않는다. cached_findings()는 캐시 hit claim의
+    finding을 현재 교수 index로 복원한다 (반복된 오류는 매 턴 다시 보고된다).
+    교수 방어가 받아들여진 finding은 overturn()으로 지우고 (claim은 clean 판정으로 남음),
+    심판 reset 시에는 clear()로 전부 비운다 – 캐시가 reset을 무력화하지 않도록.
+    """
+
+    def __init__(self):
+        self.entries: Dict[Tuple[int, str], List[Dict]] = {}
+        self.stats = {"verifications": 0, "claims": 0, "cache_hits": 0,
+                      "claims_verified": 0, "calls_skipped": 0,
+                      "chars_sent": 0, "chars_saved": 0,
+                      "overturned": 0, "resets": 0}
+        self._aligner = ClaimAligner()
+
+    @staticmethod
+    def split(response: str) -> List[str]:
+        claims = []
+        for line in (response or "").splitlines():
+            line = _LIST_MARKER_RE.sub("", line.strip())
+            claims.extend(part for part in _CLAIM_SPLIT_RE.split(line.strip())
+                          if KeyEvidenceStore.normalize(part))
+        return claims
+
+    @staticmethod
+    def key(stage: int, claim: str) -> Tuple[int, str]:
+        norm = KeyEvidenceStore.normalize(claim)
+        return stage, hashlib.sha1(norm.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def clear(self):
+        self.entries.clear()
+        self.stats["resets"] += 1
+
+    def overturn(self, statements: List[str]) -> int:
+        """방어가 받아들여진 statement의 cached finding 제거 → 해당 claim은 clean."""
+        targets = {KeyEvidenceStore.normalize(st) for st in statements} - {""}
+        removed = 0
+        for key, findings in self.entries.items():
+            kept = [f for f in findings
+                    if KeyEvidenceStore.normalize(f.get('statement', '')) not in targets]
+            removed += len(findings) - len(kept)
+            self.entries[key] = kept
+        self.stats["overturned"] += removed
+        return removed
+
+    def plan(self, professors_responses: List[str], stage: int) -> Dict:
+        """{"responses": 검증에 보낼 응답 목록, "claims": 교수별 [(key, claim, hit)], "unseen": 새 claim 수}"""
+        responses, claims, unseen = [], [], 0
+        for response in professors_responses:
+            entries = [(k, c, k in self.entries)
+                       for c in self.split(response) for k in [self.key(stage, c)]]
+            new = [c for _, c, hit in entries if not hit]
+            unseen += len(new)
+            claims.append(entries)
+            responses.append(" ".join(new) if new else _CACHED_CLAIMS_PLACEHOLDER)
+            self.stats["chars_saved"] += sum(len(c) for _, c, hit in entries if hit)
+
+        self.stats["verifications"] += 1
+        self.stats["claims"] += sum(len(e) for e in claims)
+        self.stats["cache_hits"] += sum(len(e) for e in claims) - unseen
+        self.stats["claims_verified"] += unseen
+        if unseen:
+            self.stats["chars_sent"] += sum(len(r) for r in responses)
+        else:
+            self.stats["calls_skipped"] += 1
+        return {"responses": responses, "claims": claims, "unseen": unseen}
+
+    def _claims_for(self, statement: str, entries: List[Tuple]) -> List[int]:
+        norm = KeyEvidenceStore.normalize(statement)
+        if not norm:
+            return []
+        norms = [KeyEvidenceStore.normalize(c) for _, c, _ in entries]
+        matched = [i for i, n in enumerate(norms) if n in norm or norm in n]
+        if matched:
+            return matched
+        feats = self._aligner.features(statement)
+        scored = [(self._aligner.similarity(feats, self._aligner.features(c)), i)
+                  for i, (_, c, _) in enumerate(entries)]
+        best = max(scored, default=(0.0, -1))
+        return [best[1]] if best[0] >= self._aligner.threshold else []
+
+    def record(self, plan: Dict, hallucinations: List[Dict]):
+        for prof_idx, entries in enumerate(plan["claims"]):
+            pending = [(k, c, hit) for k, c, hit in entries if not hit]
+            if not pending:
+                continue
+            verdicts: Dict[Tuple[int, str], List[Dict]] = {k: [] for k, _, _ in pending}
+            attributed = True
+            for hall in hallucinations:
+                if hall.get('professor_index') != prof_idx:
+                    continue
+                matched = self._claims_for(hall.get('statement', ''), pending)
+                if not matched:
+                    attributed = False
+                    break
+                finding = {k: v for k, v in hall.items() if k != 'professor_index'}
+                for i in matched:
+                    verdicts[pending[i][0]].append(finding)
+            if attributed:
+                self.entries.update(verdicts)
+
+    def cached_findings(self, plan: Dict, fresh: List[Dict]) -> List[Dict]:
+        seen = {(h.get('professor_index'), KeyEvidenceStore.normalize(h.get('statement', '')))
+                for h in fresh}
+        findings = []
+        for prof_idx, entries in enumerate(plan["claims"]):
+            for k, _, hit in entries:
+                if not hit:
+                    continue
+                for finding in self.entries[k]:
+                    sig = (prof_idx, KeyEvidenceStore.normalize(finding.get('statement', '')))
+                    if sig not in seen:
+                        seen.add(sig)
+                        findings.append(dict(finding, professor_index=prof_idx, cached=True))
+        return findings
+
+
+# ---------------------------------------------------------------------------
+# PERF-07 : Batch API 실행 모드 (오프라인 데이터셋 생성용)
+# ---------------------------------------------------------------------------
+class BatchItemError(Exception):
+    """배치 안의 개별 요청 실패. status_code로 classify_api_error()가 분류한다."""
+
+    _STATUS_BY_TYPE = {
+        "invalid_request_error": 400, "authentication_error": 401,
+        "permission_error": 403, "not_found_error": 404,
+        "rate_limit_error": 429, "api_error": 500, "overloaded_error": 529,
+        "expired": 504, "canceled": 504, "cancelled": 504,
+    }
+
+    def __init__(self, error_type: str, message: str = ""):
+        super().__init__(f"batch item {error_type}: {message}")
+        self.error_type = error_type
+        self.status_code = self._STATUS_BY_TYPE.get(error_type, 500)
+
+
+class BatchDispatcher:
+    """
+    Collects independent API requests and submits them through the provider's batch interface.
+
+    • submit()은 요청을 대기열에 넣고 결과가 나올 때까지 호출 스레드를 블록한다.
+    • 대기열은 max_batch_size에 도달하거나 첫 요청 후 linger_sec가 지나면 flush.
+      → 같은 phase의 독립 호출(교수 teach, 심판 verify)을 스레드로 동시에 던지면
+        한 배치로 묶인다. 여러 시뮬레이션이 같은 dispatcher를 공유해도 된다.
+    • flush된 배치는 별도 스레드에서 제출 → poll_interval_sec 간격으로 상태 확인 → 결과 분배.
+
+    provider:
+      anthropic                 : client.messages.batches (Message Batches API)
+      openai / openai_compatible: client.files + client.batches (/v1/chat/completions)
+    """
+
+    def __init__(self, client, provider: str,
+                 max_batch_size: int = 1000,
+                 linger_sec: float = 2.0,
+                 poll_interval_sec: float = 30.0):
+        self.client = client
+        self.provider = provider
+        self.max_batch_size = max_batch_size
+        self.linger_sec = linger_sec
+        self.poll_interval_sec = poll_interval_sec
+
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[str, Dict, Future]] = []
+        self._timer: Optional[threading.Timer] = None
+        self._seq = 0
+        self.stats = {"batches": 0, "requests": 0, "errored": 0}
+
+    # ------------------------------------------------------------------
+    def submit(self, params: Dict) -> Dict:
+        """요청 하나를 배치에 넣고, provider 응답 본문(dict)을 반환한다."""
+        future: Future = Future()
+        with self._lock:
+            self._seq += 1
+            self._pending.append((f"req-{self._seq}", params, future))
+            if len(self._pending) >= self.max_batch_size:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.linger_sec, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        return future.result()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        items, self._pending = self._pending, []
+        threading.Thread(target=self._run_batch, args=(items,), daemon=True).start()
+
+    # ------------------------------------------------------------------
+    def _run_batch(self, items: List[Tuple[str, Dict, Future]]):
+        futures = {cid: fut for cid, _, fut in items}
+        try:
+            print(f"  📦 Batch submit: {len(items)} request(s) via {self.provider}")
+            if self.provider == "anthropic":
+                results = self._run_anthropic_batch(items)
+            else:
+                results = self._run_openai_batch(items)
+        except Exception as e:          # 배치 자체 실패 → 모든 요청에 전파
+            for fut in futures.values():
+                fut.set_exception(e)
+            return
+
+        with self._lock:
+            self.stats["batches"] += 1
+            self.stats["requests"] += len(items)
+        for cid, fut in futures.items():
+            outcome = results.get(cid)
+            if outcome is None:
+                outcome = BatchItemError("expired", "no result returned for request")
+            if isinstance(outcome, Exception):
+                with self._lock:
+                    self.stats["errored"] += 1
+                fut.set_exception(outcome)
+            else:
+                fut.set_result(outcome)
+
+    def _run_anthropic_batch(self, items) -> Dict[str, object]:
+        batches = self.client.messages.batches
+        batch = batches.create(requests=[
+            {"custom_id": cid, "params": params} for cid, params, _ in items
+        ])
+        while batch.processing_status != "ended":
+            time.sleep(self.poll_interval_sec)
+            batch = batches.retrieve(batch.id)
+
+        results: Dict[str, object] = {}
+        for entry in batches.results(batch.id):
+            result = entry.result
+            if result.type == "succeeded":
+                results[entry.custom_id] = {"text": result.message.content[0].text}
+            elif result.type == "errored":
+                err = getattr(result.error, "error", result.error)
+                results[entry.custom_id] = BatchItemError(
+                    getattr(err, "type", "api_error"), getattr(err, "message", str(err)))
+            else:                                   # canceled / expired
+                results[entry.custom_id] = BatchItemError(result.type)
+        return results
+
+    def _run_openai_batch(self, items) -> Dict[str, object]:
+        lines = "\n".join(
+            json.dumps({"custom_id": cid, "method": "POST",
+                        "url": "/v1/chat/completions", "body": params},
+                       ensure_ascii=False)
+            for cid, params, _ in items
+        ).encode("utf-8")
+        input_file = self.client.files.create(file=("batch.jsonl", lines), purpose="batch")
+        batch = self.client.batches.create(input_file_id=input_file.id,
+                                           endpoint="/v1/chat/completions",
+                                           completion_window="24h")
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(self.poll_interval_sec)
+            batch = self.client.batches.retrieve(batch.id)
+
+        results: Dict[str, object] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get("response") or {}
+                if entry.get("error") or response.get("status_code", 200) >= 400:
+                    err = entry.get("error") or response.get("body", {}).get("error", {}) or {}
+                    status = response.get("status_code", 500)
+                    item_error = BatchItemError(err.get("type") or err.get("code") or "api_error",
+                                                err.get("message", ""))
+                    item_error.status_code = status
+                    results[entry["custom_id"]] = item_error
+                else:
+                    body = response["body"]
+                    results[entry["custom_id"]] = {
+                        "text": body["choices"][0]["message"]["content"]
+                    }
+        if batch.status != "completed":
+            for cid, _, _ in items:
+                results.setdefault(cid, BatchItemError(batch.status))
+        return results
+
+
+# ---------------------------------------------------------------------------
+# PERF-08 : 동일 요청 single-flight 병합 (시뮬레이션 간 공유)
+# ---------------------------------------------------------------------------
+COALESCE_MODES = ("off", "deterministic", "all")
+
+
+class RequestCoalescer:
+    """
+    In-flight deduplication of byte-identical API requests.
+
+    같은 템플릿으로 여러 시뮬레이션을 동시에 돌리면 turn-1 학생 질문, stage-1 교수
+    설명처럼 완전히 같은 요청이 겹친다. 요청 전체(provider, model, system prompt,
+    messages, temperature, max_tokens, json_mode)의 해시를 키로, 먼저 온 호출(leader)만
+    재시도 루프를 포함한 실제 호출을 수행하고 나머지는 그 결과(또는 예외)를 공유한다.
+    완료된 결과는 저장하지 않는다 – 캐시가 아니라 동시 중복 제거.
+
+    mode:
+      off           : 병합하지 않음
+      deterministic : temperature == 0 인 요청만 병합 (기본값 – 다양성이 필요한 호출은 제외)
+      all           : temperature와 무관하게 병합 (opt-in). 같은 설정의 replica를 동시에 돌리면
+                      샘플링 호출까지 응답을 공유하므로 replica끼리 같은 대화가 나올 수 있다
+    같은 프로세스에서 동시에 도는 시뮬레이션끼리 공유된다 (generate_corpus --sims-per-worker).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self.stats = {"leaders": 0, "coalesced": 0}
+
+    @staticmethod
+    def request_key(**request) -> str:
+        payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def eligible(mode: str, temperature: float) -> bool:
+        if mode == "all":
+            return True
+        if mode == "deterministic":
+            return temperature == 0
+        return False
+
+    def run(self, key: str, call):
+        """key가 진행 중이면 그 결과를 기다리고, 아니면 call()을 직접 실행한다."""
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+                self.stats["leaders"] += 1
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = call()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+
+_REQUEST_COALESCER = RequestCoalescer()
+
+
+def get_request_coalescer() -> RequestCoalescer:
+    """프로세스 전역 coalescer (같은 프로세스의 모든 시뮬레이션이 공유)."""
+    return _REQUEST_COALESCER
+
+
 # ---------------------------------------------------------------------------
 # Referee schedule 생성
 # ---------------------------------------------------------------------------
 def generate_referee_schedules(num_referees: int, max_sessions: int = 200) -> List[List[int]]:
     """
-    Generate non-overlapping reset schedules for referees.
+    Generate non-overlapping reset schedules for referees (list form).
 
-    v1.1.0 SCHEDULE:
-      2 referees: 5n, 5n-3   →  R1: 5,10,15,20…  /  R2: 2,7,12,17…
-      3 referees: 7n, 7n-3, 7n-5  →  R1: 7,14,21… / R2: 4,11,18… / R3: 2,9,16…
+    PERF-16: RefereeResetScheduler(referee_schedule.py)의 얇은 래퍼.
+      주기 p = 2N+1 → 2명: 5n, 5n-3 / 3명: 7n, 7n-3, 7n-5 / N명: pn, pn-3, …, pn-(p-2)
 
     Guarantees:
       • Zero simultaneous resets
       • First reset at session 2 (early bias prevention)
       • Uniform coverage across the full run
     """
-    if num_referees == 2:
-        s1 = [5 * n for n in range(1, max_sessions // 5 + 2) if 5 * n <= max_sessions]
-        s2 = [5 * n - 3 for n in range(1, max_sessions // 5 + 2) if 0 < 5 * n - 3 <= max_sessions]
-        return [s1, s2]
+    return [list(s) for s in RefereeResetScheduler(num_referees, max_sessions=max_sessions)]
 
-    elif num_referees == 3:
-        s1 = [7 * n for n in range(1, max_sessions // 7 + 2) if 7 * n <= max_sessions]
-        s2 = [7 * n - 3 for n in range(1, max_sessions // 7 + 2) if 0 < 7 * n - 3 <= max_sessions]
-        s3 = [7 * n - 5 for n in range(1, max_sessions // 7 + 2) if 0 < 7 * n - 5 <= max_sessions]
-        return [s1, s2, s3]
 
+# ---------------------------------------------------------------------------
+# API 클라이언트 생성 (PERF-05: 심판 패널별 클라이언트를 위해 함수로 분리)
+# ---------------------------------------------------------------------------
+def build_api_client(api_provider: str, api_key: Optional[str] = None,
+                     base_url: Optional[str] = None,
+                     pool_size: int = 32,
+                     keepalive_sec: float = 60.0):
+    """
+    API 키 확인(GROK-C1) 후 provider에 맞는 SDK 클라이언트를 생성한다.
+
+    PERF-06: "openai_compatible" – vLLM / llama.cpp 등 자체 호스팅 서버.
+             base_url 필수, API 키 불필요, HTTP 연결 풀 크기 / keep-alive 설정.
+    """
+    if api_provider == "openai_compatible":
+        if not _OPENAI_AVAILABLE:
+            raise ImportError(
+                "openai package is not installed (required for openai_compatible).\n"
+                "  Install it with:  pip install openai"
+            )
+        base_url = base_url or os.getenv("OPENAI_COMPATIBLE_BASE_URL")
+        if not base_url:
+            raise ValueError(
+                "openai_compatible provider requires a base URL "
+                "(--base-url or OPENAI_COMPATIBLE_BASE_URL, e.g. http://localhost:8000/v1)"
+            )
+        import httpx   # openai SDK 의존성
+        http_client = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=keepalive_sec,
+            ),
+            timeout=None,          # 호출별 timeout은 라우팅 테이블에서 지정
+        )
+        return openai.OpenAI(
+            api_key=api_key or os.getenv("OPENAI_COMPATIBLE_API_KEY") or "EMPTY",
+            base_url=base_url,
+            http_client=http_client,
+            max_retries=0,         # 재시도는 PersonaAgent._call_api(PERF-03)에서 처리
+        )
+
+    # GROK-C1: API 키 명시적 체크
+    if api_key is None:
+        api_key = os.getenv(f"{api_provider.upper()}_API_KEY")
+
+    if not api_key:
+        print("=" * 70)
+        print(f"  ❌ ERROR: {api_provider.upper()}_API_KEY Not Found")
+        print("=" * 70)
+        print()
+        print("  Please set your API key:")
+        print()
+        print(f"    export {api_provider.upper()}_API_KEY='your-key-here'")
+        print()
+        print("  Or pass it directly:")
+        print(f"    system = ProvenFactSystem(api_key='your-key')")
+        print()
+        print("=" * 70)
+        raise ValueError(f"{api_provider.upper()}_API_KEY not found in environment")
+
+    # ── API 클라이언트 초기화 ─────────────────────────────────────
+    if api_provider == "anthropic":
+        if not _ANTHROPIC_AVAILABLE:
+            raise ImportError(
+                "anthropic package is not installed.\n"
+                "  Install it with:  pip install anthropic"
+            )
+        return anthropic.Anthropic(api_key=api_key)
+    elif api_provider == "openai":
+        if not _OPENAI_AVAILABLE:
+            raise ImportError(
+                "openai package is not installed.\n"
+                "  Install it with:  pip install openai"
+            )
+        return openai.OpenAI(api_key=api_key)
     else:
-        raise ValueError(f"Only 2 or 3 referees supported, got {num_referees}")
+        raise ValueError(f"Unknown provider: {api_provider}")
 
 
 # ---------------------------------------------------------------------------
@@ -226,22 +1665,47 @@ class PersonaAgent:
     SUGGEST-05  : Exponential Backoff retry
     BUG-G       : _manage_context_window() 호출 – _call_api 직전에 실행
     BUG-H       : key_evidence를 프롬프트에 inject
+    PERF-02     : json_mode – provider JSON 출력 모드
+    PERF-03     : 에러 분류 재시도 + circuit breaker, 실패 시 APICallError
+    PERF-04     : 역할별 model / max_tokens / timeout / temperature 라우팅
+    PERF-05     : 에이전트별 provider / client
+    PERF-07     : batch_dispatcher – Batch API 제출 모드
+    PERF-08     : coalesce_mode – 동일 요청 single-flight 병합
+    PERF-18     : api_calls – 에이전트별 논리 호출 수 (turn controller 보고용)
+    PERF-19     : PromptBuilder – 역할별 prompt_budget 안에서 프롬프트 조립
+    PERF-20     : key_evidence = KeyEvidenceStore (해시 중복 제거, 질문 관련도 순 top-k)
     """
 
-    # Exponential backoff 설정
+    # 재시도 횟수 (backoff 간격은 에러 클래스별 RETRY_POLICY 참조)
     MAX_RETRIES = 3
-    BASE_DELAY_SEC = 1.0
-    MAX_DELAY_SEC = 30.0
 
-    def __init__(self, name: str, role: str, client, system_prompt: str):
+    # PERF-04 : 기본 라우팅 역할 (DEFAULT_ROLE_ROUTING 키)
+    ROUTE = "professor"
+
+    def __init__(self, name: str, role: str, client, system_prompt: str,
+                 routing: Optional[Dict[str, Dict]] = None,
+                 provider: Optional[str] = None):
         self.name = name
         self.role = role
         self.client = client
+        # PERF-05 : 에이전트별 provider (심판 패널은 서로 다른 provider 사용 가능)
+        self.provider = provider or self._detect_provider(client)
         self.system_prompt = system_prompt
+        self.routing = routing or build_model_routing(self.provider)
+        # PERF-07 : batch 실행 모드에서만 설정 (None이면 동기 호출)
+        self.batch_dispatcher: Optional[BatchDispatcher] = None
+        # PERF-08 : 동일 요청 병합 정책 (COALESCE_MODES)
+        self.coalesce_mode = "off"
+        # PERF-18 : _call_api 호출 수 (재시도 / 병합과 무관하게 요청 1건 = 1)
+        self.api_calls = 0
+        # PERF-19 : 마지막 프롬프트 크기 / 섹션별 처리 + 누적 통계
+        self.last_prompt_stats: Dict = {}
+        self.prompt_stats = {"prompts": 0, "tokens": 0, "max_tokens": 0,
+                             "trimmed": 0, "over_budget": 0}
         self.conversation_history: List[Dict] = []
 
         # BUG-020 / BUG-G / BUG-H
-        self.key_evidence: List[str] = []
+        self.key_evidence = KeyEvidenceStore()   # PERF-20
         self.max_history_size = 10          # 최대 10개 교환 유지
 
     # ------------------------------------------------------------------
@@ -251,12 +1715,9 @@ class PersonaAgent:
 
     # ------------------------------------------------------------------
     # BUG-020 key_evidence
-    def add_key_evidence(self, evidence: str):
+    def add_key_evidence(self, evidence: str, stage: Optional[int] = None) -> bool:
         """핵심 증거를 등록한다. 컨텍스트 압축 후에도 유지된다."""
-        if evidence and evidence not in self.key_evidence:
-            self.key_evidence.append(evidence)
-            if len(self.key_evidence) > 20:
-                self.key_evidence = self.key_evidence[-20:]
+        return bool(evidence) and self.key_evidence.add(evidence, stage)
 
     # ------------------------------------------------------------------
     # BUG-G : _manage_context_window – _call_api 직전에 반드시 호출
@@ -271,85 +1732,179 @@ class PersonaAgent:
 
     # ------------------------------------------------------------------
     # BUG-H : key_evidence inject helper
-    def _build_key_evidence_str(self) -> str:
-        """프롬프트에 삽입할 핵심 증거 문자열을 반환한다."""
-        if not self.key_evidence:
-            return ""
-        lines = "\n".join(f"  • {ev}" for ev in self.key_evidence)
-        return (
-            "\n\n⭐ KEY EVIDENCE (permanently preserved – always consider these):\n"
-            + lines + "\n"
-        )
+    def _add_key_evidence_section(self, builder: PromptBuilder, priority: int,
+                                  query: str = ""):
+        """PERF-19 / PERF-20 : query와 관련도 높은 key_evidence를 items 섹션으로 추가한다."""
+        stage = getattr(self, "current_stage", None)
+        builder.items("key_evidence", self.key_evidence.select(query, stage),
+                      header="⭐ KEY EVIDENCE (permanently preserved – always consider these):",
+                      bullet="  • ", priority=priority)
+
+    # ------------------------------------------------------------------
+    # PERF-19 : 역할 예산으로 PromptBuilder 생성 / 조립 결과 기록
+    def _prompt_builder(self, route: Optional[str] = None) -> PromptBuilder:
+        return PromptBuilder(self.routing[route or self.ROUTE].get("prompt_budget"))
+
+    def _build_prompt(self, builder: PromptBuilder) -> str:
+        prompt = builder.build()
+        stats = builder.stats
+        self.last_prompt_stats = stats
+        self.prompt_stats["prompts"] += 1
+        self.prompt_stats["tokens"] += stats["tokens"]
+        self.prompt_stats["max_tokens"] = max(self.prompt_stats["max_tokens"], stats["tokens"])
+        if stats["tokens"] < stats["original_tokens"]:
+            self.prompt_stats["trimmed"] += 1
+        if stats["over_budget"]:
+            self.prompt_stats["over_budget"] += 1
+        return prompt
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _detect_provider(client) -> str:
+        if _ANTHROPIC_AVAILABLE and isinstance(client, anthropic.Anthropic):
+            return "anthropic"
+        return "openai"
+
+    # PERF-03 : circuit breaker 키 (provider 단위, 자체 호스팅은 엔드포인트 단위)
+    def _provider_key(self) -> str:
+        if self.provider == "openai_compatible":
+            return f"{self.provider}@{getattr(self.client, 'base_url', '')}"
+        return self.provider
 
     # ------------------------------------------------------------------
     # SUGGEST-05 : Exponential Backoff retry
     # TMO-1    : timeout 파라미터 추가
+    # PERF-03  : 에러 분류 + retry-after + 클래스별 jitter backoff + circuit breaker
     def _call_api(self, user_message: str, temperature: float = 0.7,
-                  timeout: int = 120) -> str:
+                  timeout: Optional[float] = None, json_mode: bool = False,
+                  route: Optional[str] = None) -> str:
         """
-        Call LLM API with Exponential Backoff retry.
-        최대 MAX_RETRIES회 재시도. 모두 실패하면 [API ERROR] 반환.
+        Call LLM API with error-classified retry.
+        재시도 가능한 에러(rate limit, 과부하, 5xx, timeout, 연결)만 최대 MAX_RETRIES회 재시도.
+        인증 / 잘못된 요청 / 컨텍스트 초과는 즉시 실패. 실패 시 APICallError를 raise.
         TMO-1: 개별 호출당 timeout(기본 120초) 적용.
+        PERF-02: json_mode=True 이면 provider의 JSON 출력 모드 사용
+                 (Anthropic: assistant '{' prefill / OpenAI: response_format)
+        PERF-04: route(기본 self.ROUTE)의 model / max_tokens / timeout 적용.
+                 라우팅 테이블에 temperature가 지정되어 있으면 호출부 값보다 우선.
+        PERF-08: coalesce_mode가 허용하면 동일 요청은 진행 중인 호출 1개를 공유
+                 (재시도 루프 전체가 leader 1회로 합쳐진다).
         """
         # BUG-G : 호출 직전에 컨텍스트 압축
         self._manage_context_window()
+        self.api_calls += 1
+
+        route_cfg = self.routing[route or self.ROUTE]
+        if route_cfg.get("temperature") is not None:
+            temperature = route_cfg["temperature"]
+        if timeout is None:
+            timeout = route_cfg["timeout"]
 
         messages = [{"role": "user", "content": user_message}]
+        provider_key = self._provider_key()
+
+        # PERF-07 : 배치는 에이전트 본 역할 호출만 (교수 teach / 심판 verify – 동시에 던지는
+        #           phase). defense 등 순차 호출은 1건짜리 배치가 되어 linger + polling만 늘어난다
+        batch = self.batch_dispatcher is not None and (route or self.ROUTE) == self.ROUTE
+
+        def call():
+            return self._call_with_retry(messages, temperature, timeout, json_mode,
+                                         route_cfg, provider_key, batch)
+
+        if not RequestCoalescer.eligible(self.coalesce_mode, temperature):
+            return call()
+        key = RequestCoalescer.request_key(
+            provider=provider_key, model=route_cfg["model"],
+            max_tokens=route_cfg["max_tokens"], temperature=temperature,
+            json_mode=json_mode, system=self.system_prompt, messages=messages,
+        )
+        return get_request_coalescer().run(key, call)
+
+    def _call_with_retry(self, messages: List[Dict], temperature: float,
+                         timeout: float, json_mode: bool,
+                         route_cfg: Dict, provider_key: str, batch: bool = False) -> str:
+        breaker = get_circuit_breaker(provider_key)
 
         for attempt in range(self.MAX_RETRIES + 1):          # 0 … MAX_RETRIES
+            if not breaker.allow():
+                print(f"  ⛔ [{self.name}] Circuit open for '{provider_key}' – call skipped")
+                raise APICallError(self.name, "circuit_open",
+                                   f"circuit breaker open for {provider_key}",
+                                   attempt, provider_key)
             try:
-                if _ANTHROPIC_AVAILABLE and isinstance(self.client, anthropic.Anthropic):
-                    response = self.client.messages.create(
-                        model="claude-sonnet-4-20250514",
-                        max_tokens=4096,
-                        temperature=temperature,
-                        system=self.system_prompt,
-                        messages=messages,
-                        timeout=timeout                         # TMO-1
-                    )
-                    return response.content[0].text
-
-                else:  # OpenAI
-                    oai_messages = [
-                        {"role": "system", "content": self.system_prompt}
-                    ] + messages
-                    response = self.client.chat.completions.create(
-                        model="gpt-4",
-                        messages=oai_messages,
-                        temperature=temperature,
-                        max_tokens=4096,
-                        timeout=timeout                         # TMO-1
-                    )
-                    return response.choices[0].message.content
-
-            except (TimeoutError, ConnectionError) as e:
-                # 타임아웃 / 연결 에러는 항상 재시도 가능
-                if attempt < self.MAX_RETRIES:
-                    delay = min(
-                        self.BASE_DELAY_SEC * (2 ** attempt) + random.uniform(0, 1),
-                        self.MAX_DELAY_SEC
-                    )
-                    print(f"  ⚠️  [{self.name}] Timeout/Connection error (attempt {attempt+1}/{self.MAX_RETRIES+1}): "
-                          f"{e}  → retry in {delay:.1f}s")
-                    time.sleep(delay)
+                text = self._send_request(messages, temperature, timeout, json_mode,
+                                          model=route_cfg["model"],
+                                          max_tokens=route_cfg["max_tokens"], batch=batch)
+            except Exception as e:
+                error_class = classify_api_error(e)
+                policy = RETRY_POLICY.get(error_class, RETRY_POLICY["unknown"])
+                if policy["retryable"]:
+                    breaker.record_failure()
                 else:
-                    print(f"  ❌ [{self.name}] Timeout/Connection failed after {self.MAX_RETRIES+1} attempts: {e}")
-                    return f"[API ERROR after {self.MAX_RETRIES+1} retries: {str(e)}]"
+                    breaker.release()   # half-open 시험 슬롯 반납 (상태는 그대로)
 
-            except Exception as e:
-                if attempt < self.MAX_RETRIES:
-                    delay = min(
-                        self.BASE_DELAY_SEC * (2 ** attempt) + random.uniform(0, 1),
-                        self.MAX_DELAY_SEC
-                    )
-                    print(f"  ⚠️  [{self.name}] API error (attempt {attempt+1}/{self.MAX_RETRIES+1}): "
-                          f"{e}  → retry in {delay:.1f}s")
-                    time.sleep(delay)
+                if not policy["retryable"] or attempt >= self.MAX_RETRIES:
+                    print(f"  ❌ [{self.name}] {error_class} – giving up after "
+                          f"{attempt+1} attempt(s): {e}")
+                    raise APICallError(self.name, error_class, str(e),
+                                       attempt + 1, provider_key) from e
+
+                retry_after = _retry_after_seconds(e)
+                if retry_after is not None:
+                    delay = retry_after
                 else:
-                    print(f"  ❌ [{self.name}] API failed after {self.MAX_RETRIES+1} attempts: {e}")
-                    return f"[API ERROR after {self.MAX_RETRIES+1} retries: {str(e)}]"
+                    ceiling = min(policy["base"] * (2 ** attempt), policy["max"])
+                    delay = random.uniform(ceiling / 2, ceiling)   # equal jitter
+                print(f"  ⚠️  [{self.name}] {error_class} (attempt {attempt+1}/{self.MAX_RETRIES+1}): "
+                      f"{e}  → retry in {delay:.1f}s")
+                time.sleep(delay)
+            except BaseException:
+                breaker.release()
+                raise
+            else:
+                breaker.record_success()
+                return text
 
-        return "[API ERROR: unexpected]"   # unreachable but safe
+        raise APICallError(self.name, "unknown", "retry loop exhausted",
+                           self.MAX_RETRIES + 1, provider_key)   # unreachable but safe
+
+    # ------------------------------------------------------------------
+    def _send_request(self, messages: List[Dict], temperature: float,
+                      timeout: float, json_mode: bool,
+                      model: str, max_tokens: int, batch: bool = False) -> str:
+        """단일 API 요청 (재시도 없음). PERF-07: batch=True면 batch_dispatcher로 제출"""
+        if self.provider == "anthropic":
+            prefill = "{" if json_mode else ""
+            params = dict(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                system=self.system_prompt,
+                messages=messages + (
+                    [{"role": "assistant", "content": prefill}] if prefill else []
+                ),
+            )
+            if batch:
+                return prefill + self.batch_dispatcher.submit(params)["text"]
+            response = self.client.messages.create(**params, timeout=timeout)   # TMO-1
+            return prefill + response.content[0].text
+
+        else:  # OpenAI / openai_compatible (PERF-06)
+            oai_messages = [
+                {"role": "system", "content": self.system_prompt}
+            ] + messages
+            params = dict(
+                model=model,
+                messages=oai_messages,
+                temperature=temperature,
+                max_tokens=max_tokens,
+            )
+            if json_mode and model not in _OPENAI_NO_JSON_MODE:
+                params["response_format"] = {"type": "json_object"}
+            if batch:
+                return self.batch_dispatcher.submit(params)["text"]
+            response = self.client.chat.completions.create(**params, timeout=timeout)  # TMO-1
+            return response.choices[0].message.content
 
 
 # ===========================================================================
@@ -390,7 +1945,18 @@ class ProfessorAgent(PersonaAgent):
         4: []   # 제한 없음
     }
 
-    def __init__(self, name: str, specialty: str, client, current_stage: int = 1):
+    # 시대별 금지 "단어" 목록 (PERF-01: RuleEngine과 공유하기 위해 클래스 속성으로 이동)
+    FORBIDDEN_VOCABULARY: Dict[int, List[str]] = {
+        1: ["gravity", "atom", "molecule", "electron", "quantum",
+            "relativity", "telescope", "microscope", "spectrum"],
+        2: ["atom", "molecule", "electron", "quantum",
+            "relativity", "spectrum", "electromagnetic"],
+        3: ["quantum", "relativity", "subatomic"],
+        4: []
+    }
+
+    def __init__(self, name: str, specialty: str, client, current_stage: int = 1,
+                 routing: Optional[Dict[str, Dict]] = None):
         forbidden_vocab = self._get_forbidden_vocabulary(current_stage)
         concept_check = self._get_concept_restriction_prompt(current_stage)
 
@@ -440,7 +2006,7 @@ If a referee flags your statement:
 4. If you were incorrect, explicitly acknowledge and correct
 5. NEVER defend an error - intellectual honesty is paramount
 """
-        super().__init__(name, "Professor", client, system_prompt)
+        super().__init__(name, "Professor", client, system_prompt, routing=routing)
         self.specialty = specialty
         self.current_stage = current_stage
         # BUG-I : base_system_prompt는 FORBIDDEN/CONCEPT 블록 이전까지만 저장
@@ -460,15 +2026,7 @@ If a referee flags your statement:
 
     # ------------------------------------------------------------------
     def _get_forbidden_vocabulary(self, stage: int) -> str:
-        restrictions = {
-            1: ["gravity", "atom", "molecule", "electron", "quantum",
-                "relativity", "telescope", "microscope", "spectrum"],
-            2: ["atom", "molecule", "electron", "quantum",
-                "relativity", "spectrum", "electromagnetic"],
-            3: ["quantum", "relativity", "subatomic"],
-            4: []
-        }
-        forbidden = restrictions.get(stage, [])
+        forbidden = self.FORBIDDEN_VOCABULARY.get(stage, [])
         if forbidden:
             return (
                 "FORBIDDEN VOCABULARY (not available in this era):\n"
@@ -522,33 +2080,28 @@ If a referee flags your statement:
               available_evidence: List[str] = None,
               consistency_reminder: str = "") -> str:
 
-        evidence_str = ""
-        if available_evidence:
-            evidence_str = "\n\nAVAILABLE EVIDENCE (use these):\n"
-            evidence_str += "\n".join(f"- {ev}" for ev in available_evidence)
-
-        # key_evidence inject
-        key_ev_str = self._build_key_evidence_str()
-
-        prompt = f"""{consistency_reminder}
-
-CONTEXT: {context}
-{key_ev_str}
-STUDENT'S QUESTION/CHALLENGE:
-{student_question}
-
-{evidence_str}
-
-Provide your pedagogical response with at least 4 numbered rebuttals/clarifications.
-Use EXACT values from fixed constants. Cite specific evidence.
-"""
+        # PERF-19 : 예산 초과 시 consistency reminder → key evidence → stage 증거 순으로 축소
+        builder = self._prompt_builder()
+        builder.text("consistency_reminder", consistency_reminder.strip(), priority=3)
+        builder.text("context", f"CONTEXT: {context}")
+        self._add_key_evidence_section(builder, priority=2,   # key_evidence inject
+                                       query=student_question)
+        builder.text("student_question", f"STUDENT'S QUESTION/CHALLENGE:\n{student_question}")
+        builder.items("available_evidence", available_evidence or [],
+                      header="AVAILABLE EVIDENCE (use these):", priority=1)
+        builder.text("instructions",
+                     "Provide your pedagogical response with at least 4 numbered "
+                     "rebuttals/clarifications.\n"
+                     "Use EXACT values from fixed constants. Cite specific evidence.")
+        prompt = self._build_prompt(builder)
         response = self._call_api(prompt, temperature=0.7)
 
         # 핵심 증거 자동 추출 – 숫자가 포함된 문장을 key evidence로 등록
+        # PERF-20 : 목록 번호 / 기호는 숫자로 치지 않는다 (번호 매긴 반박 줄이 전부 들어가던 문제)
         for line in response.split('\n'):
-            line = line.strip()
+            line = _LIST_MARKER_RE.sub('', line.strip())
             if any(ch.isdigit() for ch in line) and len(line) > 30:
-                self.add_key_evidence(line[:200])   # 최대 200자
+                self.add_key_evidence(line[:200], stage=self.current_stage)   # 최대 200자
 
         self.previous_arguments.append(response)
         self.conversation_history.append({
@@ -561,65 +2114,44 @@ Use EXACT values from fixed constants. Cite specific evidence.
     def defend_against_referee(self, challenged_statement: str,
                                referee_reasoning: str,
                                fixed_constants: Dict) -> Dict:
-        constants_str = ""
-        if fixed_constants:
-            constants_str = "\n\nFIXED CONSTANTS:\n"
-            for key, val in fixed_constants.items():
-                constants_str += f"- {key}: {val}\n"
-
-        key_ev_str = self._build_key_evidence_str()
-
-        prompt = f"""A referee has challenged your statement:
+        # PERF-19 : defense 예산 – key evidence, 상수 순으로 축소 (이의 제기 내용은 필수)
+        builder = self._prompt_builder("defense")
+        builder.text("challenge", f"""A referee has challenged your statement:
 
 CHALLENGED STATEMENT:
 {challenged_statement}
 
 REFEREE'S REASONING:
-{referee_reasoning}
-
-{constants_str}
-{key_ev_str}
-
-You must respond with:
+{referee_reasoning}""")
+        builder.items("fixed_constants",
+                      [f"{key}: {val}" for key, val in (fixed_constants or {}).items()],
+                      header="FIXED CONSTANTS:", priority=1)
+        self._add_key_evidence_section(builder, priority=2,
+                                       query=f"{challenged_statement}\n{referee_reasoning}")
+        builder.text("instructions", """You must respond with:
 1. Do you acknowledge an error? (Yes/No and why)
 2. If No: Provide evidence from at least 3-5 independent sources
 3. If Yes: Provide the corrected statement
 4. Show your verification process
 
 Format your response as JSON:
-{{
+{
     "acknowledges_error": true/false,
     "defense": "your detailed defense or acknowledgment",
     "sources": ["source 1", "source 2", ...],
     "corrected_statement": "corrected version if applicable"
-}}
-"""
-        response_text = self._call_api(prompt, temperature=0.3)
+}""")
+        prompt = self._build_prompt(builder)
+        response_text = self._call_api(prompt, temperature=0.3, json_mode=True,
+                                       route="defense")
 
-        try:
-            if "```json" in response_text:
-                json_str = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                json_str = response_text.split("```")[1].split("```")[0].strip()
-            else:
-                json_str = response_text.strip()
-            return json.loads(json_str)
-        except json.JSONDecodeError as e:
-            print(f"  ⚠️  JSON parse error in {self.name}.defend_against_referee: {e}")
-            return {
-                "acknowledges_error": False,
-                "defense": response_text,
-                "sources": [],
-                "corrected_statement": "",
-                "parse_error": str(e)
-            }
-        except Exception:
-            return {
-                "acknowledges_error": False,
-                "defense": response_text,
-                "sources": [],
-                "corrected_statement": ""
-            }
+        # PERF-02 : 관대한 추출기 + 스키마 검증
+        result, error = extract_json(response_text, DEFENSE_RESULT_SCHEMA)
+        if error:
+            print(f"  ⚠️  JSON parse error in {self.name}.defend_against_referee: {error}")
+            result["defense"] = result.get("defense") or response_text
+            result["parse_error"] = error
+        return result
 
 
 # ===========================================================================
@@ -631,9 +2163,30 @@ class StudentAgent(PersonaAgent):
 
     SUGGEST-03 : confirmed_logic를 받아 프롬프트에 주입 → 무한 반박 방지
     BUG-H      : key_evidence inject
+    PERF-22    : JSON 질문 목록 + 로컬 수리 → 대부분 호출 1회 (question_stats)
     """
 
-    def __init__(self, name: str, client, skepticism_level: str = "ultra-high"):
+    ROUTE = "student"
+
+    # PERF-17 : 수용(acceptance) 표현 – 프롬프트의 "AVOID FAKE SURRENDER" 형식을 따른다.
+    #           부정형("I'm not convinced yet")은 매칭되지 않도록 긍정 표현만 나열.
+    #           "I was wrong / incorrect"는 제외 – ask_question이 previous_errors 철회에
+    #           쓰라고 지시하는 문구라서 증명된 사실의 수용이 아니다
+    ACCEPTANCE_PATTERN = re.compile(
+        r"\b(?:no remaining (?:doubts?|objections?|questions?)"
+        r"|i(?:'m| am) (?:now |fully |completely )?(?:convinced|satisfied)"
+        r"|i (?:now )?accept (?:this|that|the|your)"
+        r"|i concede)\b",
+        re.IGNORECASE,
+    )
+
+    @classmethod
+    def shows_acceptance(cls, text: str) -> bool:
+        """학생 응답에 명시적인 수용 표현이 있는지 (API 호출 없음)."""
+        return bool(text) and cls.ACCEPTANCE_PATTERN.search(text) is not None
+
+    def __init__(self, name: str, client, skepticism_level: str = "ultra-high",
+                 routing: Optional[Dict[str, Dict]] = None):
         system_prompt = f"""You are {name}, an extremely intelligent but deeply skeptical student.
 
 YOUR MISSION:
@@ -663,10 +2216,13 @@ INTELLECTUAL HONESTY:
 - Distinguish between "I'm not convinced yet" vs "I was wrong"
 - Track your own previous arguments and avoid circular reasoning
 """
-        super().__init__(name, "Student", client, system_prompt)
+        super().__init__(name, "Student", client, system_prompt, routing=routing)
         self.challenged_claims: List[str] = []
         self.error_history: List[str] = []
         self.confirmed_logic_ids: set = set()   # SUGGEST-03
+        # PERF-22 : 구조화 질문 생성 통계 (followups = 추가 호출이 필요했던 횟수)
+        self.question_stats = {"calls": 0, "followups": 0, "json_errors": 0, "repaired": 0,
+                               "raw_fallbacks": 0}
 
     # ------------------------------------------------------------------
     # SUGGEST-03 : confirmed_logic 업데이트
@@ -677,66 +2233,146 @@ INTELLECTUAL HONESTY:
             if conclusion:
                 self.confirmed_logic_ids.add(conclusion)
 
+    # ------------------------------------------------------------------
+    # PERF-22 : 구조화 질문 파싱 / 수리
+    _NUMBERED_LINE_RE = re.compile(r"^\s*(?:\d{1,2}[.)]|[-*•])\s+(.+)$")
+    _INLINE_NUMBER_RE = re.compile(r"(?:^|\s)\d{1,2}[.)]\s+")
+    _QUESTION_SENTENCE_RE = re.compile(r"[^.?!\n]*\?")
+
+    @staticmethod
+    def _dedup_questions(questions: List[str]) -> List[str]:
+        seen, unique = set(), []
+        for q in questions:
+            key = KeyEvidenceStore.normalize(q)
+            if key and key not in seen:
+                seen.add(key)
+                unique.append(q)
+        return unique
+
+    def _parse_questions(self, response: str) -> Tuple[str, List[str]]:
+        """
+        (acknowledgement, questions). 수리 규칙:
+          • 항목이 dict면 "question" / "text" 값, 없으면 문자열 값(?로 끝나는 것 우선) 사용
+          • "questions"가 문자열이거나 "1. … 2. …"처럼 여러 질문이 붙어 있으면 나눈다
+          • 앞의 번호 제거, 빈 항목 / 중복 제거
+          • JSON이 없거나 깨졌으면 번호 / 글머리 줄, 그것도 없으면 '?'로 끝나는 문장
+        """
+        result, error = extract_json(response)
+        repairs = []
+        if isinstance(result.get("questions"), str):       # 목록 대신 한 문자열
+            result["questions"] = [result["questions"]]
+            repairs.append("'questions' is a string")
+        repairs += _apply_json_schema(result, STUDENT_RESULT_SCHEMA)
+        raw_items = result["questions"]
+        if error:
+            self.question_stats["json_errors"] += 1
+            raw_items = [m.group(1) for m in map(self._NUMBERED_LINE_RE.match,
+                                                  response.split('\n')) if m]
+            if not raw_items:
+                raw_items = [q.strip() for q in self._QUESTION_SENTENCE_RE.findall(response)]
+        elif repairs or result.get("schema_repairs"):
+            self.question_stats["repaired"] += 1
+
+        questions: List[str] = []
+        for item in raw_items:
+            if isinstance(item, dict):
+                values = [v for v in item.values() if isinstance(v, str) and v.strip()]
+                values.sort(key=lambda v: not v.strip().endswith("?"))
+                item = item.get("question") or item.get("text") or (values[0] if values else "")
+            text = str(item).strip()
+            if len(self._INLINE_NUMBER_RE.findall(text)) >= 2:
+                parts = self._INLINE_NUMBER_RE.split(text)
+            else:
+                numbered = self._NUMBERED_LINE_RE.match(text)
+                parts = [numbered.group(1) if numbered else text]
+            questions.extend(p.strip() for p in parts if p.strip())
+        acknowledgement = "" if error else str(result.get("acknowledgement") or "").strip()
+        return acknowledgement, self._dedup_questions(questions)
+
     # ------------------------------------------------------------------
     # SUGGEST-03 + BUG-H
-    def ask_question(self, professors_explanation: str, context: str = "",
+    def ask_question(self, professors_explanation, context: str = "",
                      minimum_questions: int = 4,
                      previous_errors: List[str] = None,
                      confirmed_logic: List[Dict] = None) -> str:
 
+        # PERF-19 : 예산 초과 시 key evidence → confirmed logic → 교수 설명 순으로 축소.
+        #           professors_explanation이 교수별 목록이면 교수마다 같은 몫으로 자른다
+        explanation_blocks = ([professors_explanation] if isinstance(professors_explanation, str)
+                              else list(professors_explanation) or [""])
+        professors_explanation = "\n\n".join(explanation_blocks)
+        builder = self._prompt_builder()
+
         # ---- error context ----
-        error_context = ""
         if previous_errors:
-            error_context = (
-                "\n⚠️ CRITICAL - YOUR PREVIOUS ERRORS TO ADDRESS:\n"
+            builder.text("previous_errors", (
+                "⚠️ CRITICAL - YOUR PREVIOUS ERRORS TO ADDRESS:\n"
                 + "\n".join(f"- {err}" for err in previous_errors)
                 + "\n\nYou MUST explicitly withdraw these false claims before proceeding.\n"
-                "Use phrases like: \"I was incorrect when I claimed…\"\n"
-            )
+                "Use phrases like: \"I was incorrect when I claimed…\""
+            ))
+
+        builder.text("context", f"CONTEXT: {context}")
+
+        # ---- key_evidence ----
+        self._add_key_evidence_section(builder, priority=3, query=professors_explanation)
 
         # ---- SUGGEST-03 : confirmed_logic 주입 ----
-        confirmed_str = ""
         if confirmed_logic:
             self.update_confirmed_logic(confirmed_logic)
 
-        if self.confirmed_logic_ids:
-            items = "\n".join(f"  • {c}" for c in list(self.confirmed_logic_ids)[-15:])
-            confirmed_str = (
-                "\n\n📌 CONFIRMED LOGIC (심판이 확정한 사실 – 반박하지 DO NOT repeat these challenges):\n"
-                + items + "\n\n"
-                "RULE: Do NOT re-challenge the above conclusions.\n"
+        builder.items(
+            "confirmed_logic", list(self.confirmed_logic_ids)[-15:],
+            header="📌 CONFIRMED LOGIC (심판이 확정한 사실 – 반박하지 DO NOT repeat these challenges):",
+            footer=(
+                "\nRULE: Do NOT re-challenge the above conclusions.\n"
                 "INSTEAD: Attack the NEXT logical step / implication / weakness "
                 "that BUILDS ON the confirmed facts.\n"
                 "Bad example: \"But how do we know the Earth is round?\" (already confirmed)\n"
-                "Good example: \"Given Earth is round, how does this affect ancient navigation?\"\n"
-            )
-
-        # ---- key_evidence ----
-        key_ev_str = self._build_key_evidence_str()
-
-        prompt = f"""{error_context}
-
-CONTEXT: {context}
-{key_ev_str}{confirmed_str}
-PROFESSORS' EXPLANATIONS:
-{professors_explanation}
-
-Generate at least {minimum_questions} distinct, numbered questions or challenges.
-Be thoroughly skeptical - don't accept claims at face value.
-If you do accept a point, explain PRECISELY what convinced you and why.
-"""
-        response = self._call_api(prompt, temperature=0.8)
+                "Good example: \"Given Earth is round, how does this affect ancient navigation?\""
+            ),
+            bullet="  • ", priority=2
+        )
 
-        # 최소 질문 수 검증
-        numbered = [l for l in response.split('\n')
-                    if l.strip() and l.strip()[0].isdigit() and '. ' in l]
-        if len(numbered) < minimum_questions:
-            print(f"  ⚠️ Student provided only {len(numbered)}/{minimum_questions} questions. Requesting more…")
+        builder.blocks("professors_explanation", explanation_blocks,
+                       header="PROFESSORS' EXPLANATIONS:", priority=1)
+        builder.text("instructions",
+                     f"Generate at least {minimum_questions} distinct questions or challenges.\n"
+                     "Be thoroughly skeptical - don't accept claims at face value.\n"
+                     "If you do accept a point, explain PRECISELY what convinced you and why.\n\n"
+                     "Respond in JSON format:\n"
+                     "{\n"
+                     '    "acknowledgement": "what convinced you and why (empty string if nothing)",\n'
+                     '    "questions": ["question 1", "question 2", ...]\n'
+                     "}")
+        prompt = self._build_prompt(builder)
+
+        # PERF-22 : JSON 출력 → 로컬 검증 / 수리. 부족할 때만 추가 호출
+        self.question_stats["calls"] += 1
+        raw_response = self._call_api(prompt, temperature=0.8, json_mode=True)
+        acknowledgement, questions = self._parse_questions(raw_response)
+        if len(questions) < minimum_questions:
+            self.question_stats["followups"] += 1
+            print(f"  ⚠️ Student provided only {len(questions)}/{minimum_questions} questions. Requesting more…")
             followup = (
-                f"You provided only {len(numbered)} questions, but {minimum_questions} are required.\n"
-                f"Please provide {minimum_questions - len(numbered)} additional distinct challenges."
+                f"You provided only {len(questions)} questions, but {minimum_questions} are required.\n"
+                f"Please provide {minimum_questions - len(questions)} additional distinct challenges.\n"
+                'Respond in JSON format: {"acknowledgement": "", "questions": ["…"]}'
             )
-            response += "\n\n" + self._call_api(followup, temperature=0.9)
+            raw_followup = self._call_api(followup, temperature=0.9, json_mode=True)
+            _, more = self._parse_questions(raw_followup)
+            questions = self._dedup_questions(questions + more)
+            raw_response = raw_response.strip() or raw_followup
+
+        if questions:
+            response = "\n".join(f"{i}. {q}" for i, q in enumerate(questions, 1))
+            if acknowledgement:
+                response = f"{acknowledgement}\n\n{response}"
+        else:
+            # 질문을 하나도 복구하지 못함 → 빈 질문 대신 학생 원문을 그대로 전달
+            self.question_stats["raw_fallbacks"] += 1
+            print(f"  ⚠️ Student questions could not be parsed – using raw response")
+            response = raw_response.strip()
 
         self.conversation_history.append({
             "professors": professors_explanation,
@@ -754,10 +2390,16 @@ class RefereeAgent(PersonaAgent):
 
     SUGGEST-02 : 개념 침투 감지 체크 포함
     SUGGEST-06 : reset 시 current_stage_evidence 주입
+    PERF-05    : 심판마다 독립된 provider / model / client 사용 가능
+    PERF-25    : claim_cache가 있으면 새 claim만 검증, 캐시 판정은 결과에 병합
     """
 
-    def __init__(self, name: str, client, reset_schedule: List[int],
-                 strictness: str = "high"):
+    ROUTE = "referee"
+
+    def __init__(self, name: str, client, reset_schedule: RefereeResetSchedule,
+                 strictness: str = "high",
+                 routing: Optional[Dict[str, Dict]] = None,
+                 provider: Optional[str] = None):
 
         system_prompt = f"""You are {name}, an absolutely impartial referee and fact-checker.
 
@@ -793,7 +2435,8 @@ SEVERITY LEVELS:
 IMPORTANT: Referees can make errors too. When challenged by professors with 
 strong evidence from multiple sources, be willing to reconsider your assessment.
 """
-        super().__init__(name, "Referee", client, system_prompt)
+        super().__init__(name, "Referee", client, system_prompt, routing=routing,
+                         provider=provider)
 
         self.base_system_prompt = system_prompt
         self.injected_constants = ""
@@ -808,6 +2451,9 @@ strong evidence from multiple sources, be willing to reconsider your assessment.
         self.current_stage_evidence: List[str] = []
         self.current_stage_num: int = 1
 
+        # PERF-25 : run 범위 claim 판정 캐시 (ProvenFactSystem(claim_cache=True)일 때 설정)
+        self.claim_cache: Optional[ClaimVerificationCache] = None
+
     # ------------------------------------------------------------------
     def inject_constants(self, constants_str: str):
         self.injected_constants = constants_str
@@ -831,6 +2477,9 @@ strong evidence from multiple sources, be willing to reconsider your assessment.
         self.conversation_history = []
         self.reset_count += 1
         self.student_error_tracker.clear()
+        # PERF-25 : 캐시된 판정도 reset 대상 (reset 후 모든 claim을 새로 검증)
+        if self.claim_cache is not None:
+            self.claim_cache.clear()
 
         # --- 기본 프롬프트 복원 ---
         self.system_prompt = self.base_system_prompt
@@ -870,43 +2519,47 @@ strong evidence from multiple sources, be willing to reconsider your assessment.
                           current_stage: int = 1,
                           current_stage_evidence: List[str] = None) -> Dict:
 
-        constants_check = ""
-        if fixed_constants:
-            constants_check = "\n\nFIXED CONSTANTS ENFORCEMENT (ZERO TOLERANCE):\n"
-            for key, value in fixed_constants.items():
-                constants_check += f"- {key}: {value} (EXACT, no approximations)\n"
-            constants_check += "\nANY use of '~', 'about', 'approximately' is CRITICAL error.\n"
+        # PERF-25 : 이미 판정된 claim은 빼고 새 claim만 보낸다 (교수 번호는 유지)
+        plan = None
+        if self.claim_cache is not None:
+            plan = self.claim_cache.plan(professors_responses, current_stage)
+            if not plan["unseen"]:
+                return {"professor_hallucinations": self.claim_cache.cached_findings(plan, []),
+                        "student_errors_missed_by_professors": [],
+                        "referee": self.name, "provider": self.provider,
+                        "model": self.routing[self.ROUTE]["model"], "cached": True}
+            professors_responses = plan["responses"]
+
+        # PERF-19 : 검증 대상(교수 응답)과 지시문은 필수. 예산 초과 시 학생 질문 →
+        #           상수 블록(system prompt에도 주입됨) → 시대 개념 블록 순으로 축소
+        builder = self._prompt_builder()
+        builder.items("fixed_constants",
+                      [f"{key}: {value} (EXACT, no approximations)"
+                       for key, value in (fixed_constants or {}).items()],
+                      header="FIXED CONSTANTS ENFORCEMENT (ZERO TOLERANCE):",
+                      footer="\nANY use of '~', 'about', 'approximately' is CRITICAL error.",
+                      priority=2)
 
         # SUGGEST-02 : 개념 침투 체크 블록
-        concept_check_block = ""
         era_concepts = ProfessorAgent.ERA_CONCEPT_RESTRICTIONS.get(current_stage, [])
-        if era_concepts:
-            concept_check_block = (
-                "\n\n⚠️ ERA-CONCEPT ANACHRONISM CHECK:\n"
-                "The following CONCEPTS did not exist in Stage " + str(current_stage) + ".\n"
-                "Flag ANY professor response that uses these concepts — "
-                "even indirectly or without the exact forbidden word:\n"
-                + "\n".join(f"  - {c}" for c in era_concepts) + "\n"
-                "Mark such violations as type: \"anachronistic_concept\" with severity \"high\".\n"
-            )
+        builder.items("era_concepts", era_concepts,
+                      header=("⚠️ ERA-CONCEPT ANACHRONISM CHECK:\n"
+                              f"The following CONCEPTS did not exist in Stage {current_stage}.\n"
+                              "Flag ANY professor response that uses these concepts — "
+                              "even indirectly or without the exact forbidden word:"),
+                      footer=("Mark such violations as type: \"anachronistic_concept\" "
+                              "with severity \"high\"."),
+                      bullet="  - ", priority=1)
 
         all_statements = "\n\n---\n\n".join([
             f"Professor {i+1}:\n{resp}"
             for i, resp in enumerate(professors_responses)
         ])
 
-        prompt = f"""{constants_check}
-{concept_check_block}
-
-SESSION {session_num} VERIFICATION:
-
-STUDENT QUESTION:
-{student_question}
-
-PROFESSORS' RESPONSES:
-{all_statements}
-
-Verify each professor's statements. For EACH hallucination found, provide:
+        builder.text("session", f"SESSION {session_num} VERIFICATION:")
+        builder.text("student_question", f"STUDENT QUESTION:\n{student_question}", priority=3)
+        builder.text("professors_responses", f"PROFESSORS' RESPONSES:\n{all_statements}")
+        builder.text("instructions", """Verify each professor's statements. For EACH hallucination found, provide:
 1. Professor index (0, 1, 2, or 3)
 2. Exact statement with hallucination
 3. Type of hallucination
@@ -914,57 +2567,204 @@ Verify each professor's statements. For EACH hallucination found, provide:
 5. Severity level
 
 Respond in JSON format:
-{{
+{
     "professor_hallucinations": [
-        {{
+        {
             "professor_index": 0,
             "statement": "exact quote",
             "type": "factual_error | anachronistic_vocabulary | anachronistic_concept | approximation | logical_fallacy | contradiction",
             "correct_info": "correct version",
             "severity": "critical | high | medium | low"
-        }}
+        }
     ],
     "student_errors_missed_by_professors": [
-        {{
+        {
             "statement": "student's error",
             "why_missed": "explanation"
-        }}
+        }
     ]
-}}
+}
+
+If no hallucinations found, return empty arrays.""")
+        prompt = self._build_prompt(builder)
+        response = self._call_api(prompt, temperature=0.3, json_mode=True)
+
+        # PERF-02 : 관대한 추출기 + 스키마 검증 (실패 시에도 빈 배열 + parse_error)
+        result, error = extract_json(response, REFEREE_RESULT_SCHEMA)
+        # PERF-05 : 혼합 패널에서 어떤 심판/모델의 판정인지 기록
+        result["referee"] = self.name
+        result["provider"] = self.provider
+        result["model"] = self.routing[self.ROUTE]["model"]
+        if error:
+            print(f"  ⚠️  JSON parse error in {self.name}: {error}")
+            print(f"      Raw response (first 200 chars): {response[:200]}")
+            result["parse_error"] = error
+            if plan is not None:
+                result['professor_hallucinations'] = self.claim_cache.cached_findings(plan, [])
+            return result
 
-If no hallucinations found, return empty arrays.
-"""
-        response = self._call_api(prompt, temperature=0.3)
+        for hall in result['professor_hallucinations']:
+            try:
+                hall['professor_index'] = int(hall.get('professor_index', -1))
+            except (TypeError, ValueError):
+                hall['professor_index'] = -1
+            hall['statement'] = str(hall['statement'])
 
-        try:
-            if "```json" in response:
-                json_str = response.split("```json")[1].split("```")[0]
-            elif "```" in response:
-                json_str = response.split("```")[1].split("```")[0]
-            else:
-                json_str = response
-            result = json.loads(json_str.strip())
+        # PERF-02 : 잘린 응답은 뒤쪽 finding이 빠졌을 수 있다 – 기록하고, claim 캐시에는
+        #           "문제 없음"으로 남기지 않는다 (다음 검증에서 다시 확인)
+        truncated = JSON_TRUNCATED_REPAIR in result.get("schema_repairs", ())
+        if truncated:
+            print(f"  ⚠️  {self.name}: truncated verification response was auto-closed "
+                  f"({len(result['professor_hallucinations'])} finding(s) kept)")
 
-            for err in result.get('student_errors_missed_by_professors', []):
-                sig = err['statement'][:50]
-                self.student_error_tracker[sig] += 1
+        if plan is not None:
+            if not truncated:
+                self.claim_cache.record(plan, result['professor_hallucinations'])
+            result['professor_hallucinations'].extend(
+                self.claim_cache.cached_findings(plan, result['professor_hallucinations']))
 
-            return result
+        for err in result['student_errors_missed_by_professors']:
+            sig = str(err['statement'])[:50]
+            self.student_error_tracker[sig] += 1
 
-        except json.JSONDecodeError as e:
-            print(f"  ⚠️  JSON parse error in {self.name}: {e}")
-            print(f"      Raw response (first 200 chars): {response[:200]}")
-            return {
-                "professor_hallucinations": [],
-                "student_errors_missed_by_professors": [],
-                "parse_error": str(e)
-            }
-        except Exception as e:
-            print(f"  ⚠️  Unexpected error in {self.name}: {e}")
-            return {
-                "professor_hallucinations": [],
-                "student_errors_missed_by_professors": []
-            }
+        return result
+
+
+# ---------------------------------------------------------------------------
+# PERF-10 : SFT 스트리밍 export (샤딩 / 중복 제거 / 필터 / manifest)
+# ---------------------------------------------------------------------------
+SEVERITY_RANK = {"low": 1, "medium": 2, "high": 3, "critical": 4}
+
+SFT_HALLUCINATION_FILTERS = ("keep", "exclude", "only")
+
+_SFT_NORMALIZE_RE = re.compile(r"[^\w]+", re.UNICODE)
+
+
+class SFTShardWriter:
+    """
+    Streaming JSONL writer for SFT examples.
+
+    • write()는 예제를 즉시 현재 샤드에 기록한다 (전체 목록을 메모리에 두지 않음).
+    • 샤드: max_records / max_bytes 중 하나라도 넘으면 다음 파일로 넘어간다.
+      둘 다 0이면 out_path 파일 하나에 그대로 기록 (기존 .jsonl 출력과 동일).
+      샤드 파일 이름: <stem>-00000.jsonl, <stem>-00001.jsonl …
+    • dedup: prompt / completion을 소문자 + 구두점·공백 정규화한 뒤 sha256.
+      같은 해시는 한 번만 기록 (거의 같은 예제 제거).
+    • hallucinations: keep(전부) / exclude(has_hallucinations 제외) / only(그것만)
+      max_severity: 이보다 심각한 할루시네이션이 있는 예제 제외 (예: "high" → critical 제외)
+    • close()는 샤드별 records / bytes / sha256와 필터 카운트를 담은
+      <stem>.manifest.json을 쓰고 manifest dict를 반환한다.
+    """
+
+    def __init__(self, out_path: str, max_records: int = 0, max_bytes: int = 0,
+                 dedup: bool = False, hallucinations: str = "keep",
+                 max_severity: Optional[str] = None):
+        if hallucinations not in SFT_HALLUCINATION_FILTERS:
+            raise ValueError(f"Unknown hallucination filter: {hallucinations} "
+                             f"(expected one of {SFT_HALLUCINATION_FILTERS})")
+        if max_severity is not None and max_severity not in SEVERITY_RANK:
+            raise ValueError(f"Unknown severity: {max_severity} "
+                             f"(expected one of {tuple(SEVERITY_RANK)})")
+        self.out_path = out_path
+        self.stem = out_path[:-len(".jsonl")] if out_path.endswith(".jsonl") else out_path
+        self.max_records = max_records
+        self.max_bytes = max_bytes
+        self.dedup = dedup
+        self.hallucinations = hallucinations
+        self.max_severity = max_severity
+
+        self._seen: set = set()
+        self._file = None
+        self._shard: Optional[Dict] = None
+        self._shard_hash = None
+        self.shards: List[Dict] = []
+        self.counts = {"seen": 0, "written": 0, "duplicates": 0,
+                       "filtered_hallucination": 0, "filtered_severity": 0}
+
+        out_dir = os.path.dirname(out_path)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def content_hash(example: Dict) -> bytes:
+        def norm(text: str) -> str:
+            return _SFT_NORMALIZE_RE.sub(" ", text.lower()).strip()
+        payload = norm(example.get("prompt", "")) + "\x1f" + norm(example.get("completion", ""))
+        return hashlib.sha256(payload.encode("utf-8")).digest()
+
+    def _accept(self, example: Dict) -> bool:
+        meta = example.get("metadata", {})
+        flagged = bool(meta.get("has_hallucinations"))
+        if (self.hallucinations == "exclude" and flagged) or \
+                (self.hallucinations == "only" and not flagged):
+            self.counts["filtered_hallucination"] += 1
+            return False
+        if self.max_severity is not None and \
+                SEVERITY_RANK.get(meta.get("max_severity"), 0) > SEVERITY_RANK[self.max_severity]:
+            self.counts["filtered_severity"] += 1
+            return False
+        if self.dedup:
+            digest = self.content_hash(example)
+            if digest in self._seen:
+                self.counts["duplicates"] += 1
+                return False
+            self._seen.add(digest)
+        return True
+
+    def _open_shard(self):
+        self._close_shard()
+        if self.max_records or self.max_bytes:
+            path = f"{self.stem}-{len(self.shards):05d}.jsonl"
+        else:
+            path = self.out_path
+        self._file = open(path, 'wb')
+        self._shard = {"file": os.path.basename(path), "records": 0, "bytes": 0}
+        self._shard_hash = hashlib.sha256()
+
+    def _close_shard(self):
+        if self._file is None:
+            return
+        self._file.close()
+        self._shard["sha256"] = self._shard_hash.hexdigest()
+        self.shards.append(self._shard)
+        self._file = None
+
+    def write(self, example: Dict) -> bool:
+        """예제 하나를 기록한다. 필터 / 중복으로 버려지면 False."""
+        self.counts["seen"] += 1
+        if not self._accept(example):
+            return False
+        line = (json.dumps(example, ensure_ascii=False) + "\n").encode("utf-8")
+        if self._file is None or \
+                (self.max_records and self._shard["records"] >= self.max_records) or \
+                (self.max_bytes and self._shard["records"] and
+                 self._shard["bytes"] + len(line) > self.max_bytes):
+            self._open_shard()
+        self._file.write(line)
+        self._shard_hash.update(line)
+        self._shard["records"] += 1
+        self._shard["bytes"] += len(line)
+        self.counts["written"] += 1
+        return True
+
+    def close(self) -> Dict:
+        if self._file is None and not self.shards:
+            self._open_shard()          # 예제가 없어도 빈 파일 1개는 만든다 (기존 동작)
+        self._close_shard()
+        manifest = {
+            "created": datetime.now().isoformat(),
+            "shards": self.shards,
+            "counts": self.counts,
+            "options": {
+                "max_records": self.max_records, "max_bytes": self.max_bytes,
+                "dedup": self.dedup, "hallucinations": self.hallucinations,
+                "max_severity": self.max_severity,
+            },
+        }
+        with open(f"{self.stem}.manifest.json", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        return manifest
 
 
 # ===========================================================================
@@ -975,9 +2775,10 @@ class RecorderAgent(PersonaAgent):
     Records the entire debate for dataset creation.
 
     SUGGEST-04 : tiktoken 기반 토큰 수 계산
+    PERF-10    : sft_writer가 있으면 record_exchange 시점에 SFT 예제를 스트리밍 기록
     """
 
-    def __init__(self, name: str, client):
+    def __init__(self, name: str, client, routing: Optional[Dict[str, Dict]] = None):
         system_prompt = """You are the DataRecorder, responsible for creating high-quality training data.
 
 YOUR MISSION - CAUSAL CHAIN PRESERVATION (HIGHEST PRIORITY):
@@ -1003,16 +2804,19 @@ TOKEN MANAGEMENT:
 - Store exchanges in chunks to prevent context overflow
 - Each chunk must be independently coherent
 """
-        super().__init__(name, "Recorder", client, system_prompt)
+        super().__init__(name, "Recorder", client, system_prompt, routing=routing)
         self.records: List[Dict] = []
         self.session_chunks: List[Dict] = []
         self.current_chunk_size = 0
         self.max_chunk_tokens = 15000
+        # PERF-10 : 스트리밍 SFT writer (None이면 generate_sft_data()로만 생성)
+        self.sft_writer: Optional[SFTShardWriter] = None
 
     def record_exchange(self, session_num: int, exchange_num: int,
                         student_question: str, professors_responses: List[str],
                         referee_results: List[Dict], context: str,
-                        redundancy_status: str = "progressive") -> Dict:
+                        redundancy_status: str = "progressive",
+                        rule_findings: List[Dict] = None) -> Dict:
         """Record a single exchange with full causal chain."""
 
         # SUGGEST-04 : tiktoken 기반 토큰 수 계산
@@ -1032,6 +2836,7 @@ TOKEN MANAGEMENT:
             "student_challenge": student_question,
             "professor_responses": professors_responses,
             "referee_verification": referee_results,
+            "rule_findings": rule_findings or [],        # PERF-01
             "estimated_tokens": estimated_tokens,
             "redundancy_assessment": {"status": redundancy_status}
         }
@@ -1039,6 +2844,8 @@ TOKEN MANAGEMENT:
         self.records.append(record)
         self.session_chunks.append(record)
         self.current_chunk_size += estimated_tokens
+        if self.sft_writer is not None:
+            self.sft_writer.write(self.to_sft_example(record))
         return record
 
     # ------------------------------------------------------------------
@@ -1052,27 +2859,31 @@ TOKEN MANAGEMENT:
                 if r.get('redundancy_assessment', {}).get('status') != 'redundant']
 
     # ------------------------------------------------------------------
+    @staticmethod
+    def to_sft_example(record: Dict) -> Dict:
+        prompt = f"Context: {record['context']}\n\nStudent Question/Challenge:\n{record['student_challenge']}\n"
+        response = "\n\n".join([
+            f"Professor {i+1} Response:\n{resp}"
+            for i, resp in enumerate(record['professor_responses'])
+        ])
+        findings = [h for ref in record['referee_verification']
+                    for h in ref.get('professor_hallucinations', [])]
+        findings += record.get('rule_findings') or []
+        max_severity = max((h.get('severity') for h in findings),
+                           key=lambda sev: SEVERITY_RANK.get(sev, 0), default=None)
+        return {
+            "prompt": prompt,
+            "completion": response,
+            "metadata": {
+                "session": record['session'],
+                "exchange": record['exchange'],
+                "has_hallucinations": bool(findings),
+                "max_severity": max_severity,        # PERF-10
+            }
+        }
+
     def generate_sft_data(self) -> List[Dict]:
-        sft_data = []
-        for record in self.records:
-            prompt = f"Context: {record['context']}\n\nStudent Question/Challenge:\n{record['student_challenge']}\n"
-            response = "\n\n".join([
-                f"Professor {i+1} Response:\n{resp}"
-                for i, resp in enumerate(record['professor_responses'])
-            ])
-            sft_data.append({
-                "prompt": prompt,
-                "completion": response,
-                "metadata": {
-                    "session": record['session'],
-                    "exchange": record['exchange'],
-                    "has_hallucinations": any(
-                        len(ref.get('professor_hallucinations', [])) > 0
-                        for ref in record['referee_verification']
-                    )
-                }
-            })
-        return sft_data
+        return [self.to_sft_example(record) for record in self.records]
 
 
 # ===========================================================================
@@ -1101,7 +2912,9 @@ class ValidationSpecialist(PersonaAgent):
     심판 충돌은 교수 증거 제공 또는 Force-Proceed(SUGGEST-01)로만 해결됨.
     """
 
-    def __init__(self, name: str, client):
+    ROUTE = "validator"
+
+    def __init__(self, name: str, client, routing: Optional[Dict[str, Dict]] = None):
         system_prompt = """You are the Quality Validator, conducting final audit of generated data.
 
 YOUR MISSION:
@@ -1126,7 +2939,7 @@ Provide structured assessment with:
 - Areas needing improvement
 - Recommendations for future simulations
 """
-        super().__init__(name, "Validator", client, system_prompt)
+        super().__init__(name, "Validator", client, system_prompt, routing=routing)
 
     # ------------------------------------------------------------------
     # C-01: resolve_deadlock 완전 삭제.
@@ -1165,6 +2978,504 @@ Provide structured assessment with:
         }
 
 
+# ===========================================================================
+# RuleEngine – 결정론적 로컬 검사 (PERF-01)
+# ===========================================================================
+class RuleEngine:
+    """
+    Deterministic local checker for fixed-constant and era-vocabulary violations.
+
+    PERF-01 : LLM 심판(temperature 0.3)에만 맡기던 검사 중 기계적으로 판정 가능한
+              부분을 로컬에서 한 번의 스캔으로 처리한다.
+      • 스테이지별 금지 단어 + ERA_CONCEPT_RESTRICTIONS 개념 구문을
+        하나의 정규식 alternation으로 미리 컴파일 (스테이지당 1회)
+      • 문장 단위 숫자 추출 → fixed_constants와 비교
+        (근사 표현 '~', 'about' … / 반올림 값 / 허용오차 내 불일치).
+        상수 키워드는 단어 경계로 매칭하고, 숫자 앞뒤 SUBJECT_WINDOW 단어 안에 키워드가
+        충분히 있어야 하며, 숫자 바로 뒤 단위가 상수 단위와 다르면 비교하지 않는다
+        ("In 22 hours the Earth rotates 330 degrees" 는 자전 주기 진술이 아님)
+    출력은 verify_statements()의 professor_hallucinations 스키마와 동일하며
+    "source": "rule_engine" 필드로 구분된다.
+    """
+
+    # 근사 표현 (심판 프롬프트: ANY use is CRITICAL)
+    APPROX_MARKERS = r"(?:~|≈|about|approximately|approx\.?|roughly|around|nearly|약)"
+
+    # 상수 키에서 주제 키워드를 뽑을 때 제외할 단위/불용어
+    _KEY_STOPWORDS = {
+        "km", "m", "meters", "hours", "hour", "per", "percentage", "percent",
+        "years", "year", "billions", "millions", "thousands", "ago", "to",
+        "at", "of", "the", "in", "cases", "number",
+    }
+
+    _MULTIPLIERS = {"thousand": 1e3, "million": 1e6, "billion": 1e9}
+
+    # 숫자 바로 뒤에 오면 "단위"로 보는 단어 (같은 계열끼리 묶음)
+    _UNIT_FAMILIES = {
+        "km": "length", "kilometers": "length", "kilometres": "length", "m": "length",
+        "meters": "length", "metres": "length", "miles": "length", "mi": "length",
+        "hours": "time", "hour": "time", "minutes": "time", "seconds": "time",
+        "days": "time", "years": "time", "year": "time",
+        "percent": "ratio", "percentage": "ratio", "%": "ratio",
+        "degrees": "angle", "degree": "angle", "°": "angle",
+        "kg": "mass", "tons": "mass", "tonnes": "mass",
+    }
+
+    # 숫자와 상수 주제 키워드 사이 최대 거리 (단어 수)
+    SUBJECT_WINDOW = 5
+
+    _WORD_RE = re.compile(r"[^\W\d_]+|%|°", re.UNICODE)
+
+    _NUMBER_RE = re.compile(
+        r"(?<![\w.,])(\d{1,3}(?:,\d{3})+|\d+)(\.\d+)?"
+        r"(?:\s*(thousand|million|billion))?",
+        re.IGNORECASE,
+    )
+    _SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+(?=\D)|\n+")
+
+    def __init__(self, fixed_constants: Dict,
+                 forbidden_vocabulary: Dict[int, List[str]],
+                 concept_restrictions: Dict[int, List[str]],
+                 near_miss_tolerance: float = 0.1):
+        self.fixed_constants = fixed_constants or {}
+        self.near_miss_tolerance = near_miss_tolerance
+        self._approx_re = re.compile(self.APPROX_MARKERS + r"\s*$", re.IGNORECASE)
+
+        # ---- 스테이지별 금지어 automaton ----
+        self._stage_patterns: Dict[int, Tuple[Optional[re.Pattern], Dict[str, Tuple[str, str]]]] = {}
+        for stage in set(forbidden_vocabulary) | set(concept_restrictions):
+            self._stage_patterns[stage] = self._compile_stage(
+                forbidden_vocabulary.get(stage, []),
+                concept_restrictions.get(stage, []),
+            )
+
+        # ---- 상수별 (키워드 정규식, 값, 단위 계열) ----
+        self._constant_rules: List[Tuple[str, float, List[re.Pattern], set]] = []
+        for key, value in self.fixed_constants.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            parts = [w for w in key.lower().split("_") if w]
+            keywords = [re.compile(rf"^{re.escape(w)}(?:s|es|'s)?$")
+                        for w in parts if w not in self._KEY_STOPWORDS]
+            units = {self._UNIT_FAMILIES[w] for w in parts if w in self._UNIT_FAMILIES}
+            if keywords:
+                self._constant_rules.append((key, float(value), keywords, units))
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _concept_terms(concept: str) -> List[str]:
+        """'gravity / gravitational force (만유인력)' → ['gravity', 'gravitational force', '만유인력']"""
+        terms = []
+        paren = re.findall(r"\(([^)]*)\)", concept)
+        head = re.sub(r"\([^)]*\)", "", concept)
+        for part in head.split("/") + paren:
+            part = part.strip()
+            if part:
+                terms.append(part)
+        return terms
+
+    def _compile_stage(self, vocabulary: List[str], concepts: List[str]):
+        alternatives, group_map = [], {}
+        seen = set()
+
+        def add(term: str, kind: str, label: str, prefix: bool):
+            key = term.lower()
+            if key in seen:
+                return
+            seen.add(key)
+            group = f"g{len(group_map)}"
+            body = re.escape(term).replace(r"\ ", r"\s+")
+            if term.isascii():
+                tail = r"\w*" if prefix else r"(?:s|es)?\b"
+                alternatives.append(rf"(?P<{group}>\b{body}{tail})")
+            else:
+                alternatives.append(rf"(?P<{group}>{body})")
+            group_map[group] = (kind, label)
+
+        # 단어 목록이 우선 (같은 단어가 개념 목록에도 있으면 vocabulary로 보고)
+        for word in vocabulary:
+            add(word, "anachronistic_vocabulary", word, prefix=True)
+        for concept in concepts:
+            for term in self._concept_terms(concept):
+                add(term, "anachronistic_concept", concept, prefix=False)
+
+        if not alternatives:
+            return None, {}
+        return re.compile("|".join(alternatives), re.IGNORECASE), group_map
+
+    # ------------------------------------------------------------------
+    def _sentence_at(self, text: str, pos: int) -> str:
+        start = max(text.rfind("\n", 0, pos), text.rfind(". ", 0, pos)) + 1
+        end_candidates = [i for i in (text.find("\n", pos), text.find(". ", pos)) if i != -1]
+        end = min(end_candidates) + 1 if end_candidates else len(text)
+        return text[start:end].strip()[:300]
+
+    def _scan_terms(self, text: str, stage: int, prof_idx: int) -> List[Dict]:
+        pattern, group_map = self._stage_patterns.get(stage, (None, {}))
+        if pattern is None:
+            return []
+        findings, reported = [], set()
+        for m in pattern.finditer(text):
+            kind, label = group_map[m.lastgroup]
+            if label in reported:          # 교수당 용어 1회만 보고
+                continue
+            reported.add(label)
+            findings.append({
+                "professor_index": prof_idx,
+                "statement": self._sentence_at(text, m.start()),
+                "type": kind,
+                "correct_info": (f"'{m.group(0)}' is not available in Stage {stage} "
+                                 f"(restricted: {label})"),
+                "severity": "high",
+                "source": "rule_engine",
+                "rule": f"stage{stage}:{label}",
+            })
+        return findings
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _is_rounding(stated: float, exact: float) -> bool:
+        """stated가 exact를 유효숫자 1~4자리 또는 10^k 단위로 반올림한 값인지"""
+        if exact == 0:
+            return False
+        for digits in range(-6, 4):
+            if round(exact, digits) == stated and stated != exact:
+                return True
+        return False
+
+    def _scan_constants(self, text: str, prof_idx: int) -> List[Dict]:
+        if not self._constant_rules:
+            return []
+        findings, reported = [], set()
+        for sentence in self._SENTENCE_SPLIT_RE.split(text):
+            numbers = list(self._NUMBER_RE.finditer(sentence))
+            if not numbers:
+                continue
+            words = [(w.start(), w.group(0).lower()) for w in self._WORD_RE.finditer(sentence)]
+            for key, exact, keywords, units in self._constant_rules:
+                if key in reported:
+                    continue
+                for m in numbers:
+                    before = [w for pos, w in words if pos < m.start()][-self.SUBJECT_WINDOW:]
+                    after = [w for pos, w in words if pos >= m.end()]
+                    # 숫자 바로 뒤 단위가 상수 단위 계열과 다르면 다른 양
+                    unit = self._UNIT_FAMILIES.get(after[0]) if after else None
+                    if unit and units and unit not in units:
+                        continue
+                    window = before + after[:self.SUBJECT_WINDOW]
+                    hits = sum(1 for kw in keywords if any(kw.match(w) for w in window))
+                    if hits < min(2, len(keywords)):
+                        continue
+                    raw = float(m.group(1).replace(",", "") + (m.group(2) or ""))
+                    mult = self._MULTIPLIERS.get((m.group(3) or "").lower(), 1.0)
+                    # "4.54 billion" 과 키 단위 billions 모두 허용 → 더 가까운 쪽 사용
+                    stated = min((raw, raw * mult), key=lambda v: abs(v - exact))
+                    diff = abs(stated - exact) / abs(exact) if exact else abs(stated)
+                    hedged = bool(self._approx_re.search(sentence[:m.start()]))
+
+                    if diff == 0 and not hedged:
+                        continue
+                    if diff > self.near_miss_tolerance:
+                        continue
+
+                    if hedged:
+                        ftype, severity = "approximation", "critical"
+                    elif self._is_rounding(stated, exact):
+                        ftype, severity = "approximation", "high"
+                    else:
+                        ftype, severity = "factual_error", "high"
+                    findings.append({
+                        "professor_index": prof_idx,
+                        "statement": sentence.strip()[:300],
+                        "type": ftype,
+                        "correct_info": f"{key} = {self.fixed_constants[key]} (EXACT)",
+                        "severity": severity,
+                        "source": "rule_engine",
+                        "rule": f"constant:{key}",
+                    })
+                    reported.add(key)
+                    break
+        return findings
+
+    # ------------------------------------------------------------------
+    def scan(self, professors_responses: List[str], stage: int) -> Dict:
+        """
+        교수 응답 전체를 한 번씩 스캔한다.
+
+        Returns: {"professor_hallucinations": [...], "student_errors_missed_by_professors": []}
+        """
+        findings: List[Dict] = []
+        for prof_idx, text in enumerate(professors_responses):
+            findings.extend(self._scan_terms(text, stage, prof_idx))
+            findings.extend(self._scan_constants(text, prof_idx))
+        return {
+            "professor_hallucinations": findings,
+            "student_errors_missed_by_professors": [],
+            "source": "rule_engine",
+        }
+
+
+# ===========================================================================
+# PERF-17 : 수렴 기반 evidence stage 스케줄러
+# ===========================================================================
+STAGE_SCHEDULE_MODES = ("fixed", "adaptive")
+
+
+class StageScheduler:
+    """
+    세션 → evidence stage 배정.
+
+      fixed    : 기존 균등 분할 (_determine_stage_boundaries와 동일한 경계)
+      adaptive : 스테이지 안에서 수렴 신호가 모두 성립하면 다음 스테이지로 진행
+                 • 스테이지 내 연속 clean 세션 ≥ clean_sessions
+                 • 스테이지 시작 이후 confirmed_logic 증가 (require_logic_growth)
+                 • 연속 clean 구간에서 학생의 수용 표현 (require_acceptance)
+                 min_sessions ≤ 스테이지 길이 ≤ max_sessions, 남은 스테이지마다
+                 min_sessions를 남겨두도록 예산이 부족하면 강제로 진행한다.
+                 마지막 스테이지가 수렴하면 시뮬레이션을 조기 종료한다.
+
+    boundaries는 기존 stage_boundaries 형식 (스테이지별 마지막 세션 번호, 누적).
+    """
+
+    def __init__(self, num_stages: int, total_sessions: int, mode: str = "fixed",
+                 min_sessions: int = 2, max_sessions: Optional[int] = None,
+                 clean_sessions: int = 2, require_logic_growth: bool = True,
+                 require_acceptance: bool = False):
+        if mode not in STAGE_SCHEDULE_MODES:
+            raise ValueError(f"Unknown stage schedule mode: {mode} "
+                             f"(expected one of {STAGE_SCHEDULE_MODES})")
+        self.mode = mode
+        self.num_stages = num_stages
+        self.total_sessions = total_sessions
+        even_share = max(1, -(-total_sessions // num_stages))
+        self.min_sessions = max(1, min(min_sessions, total_sessions // num_stages or 1))
+        self.max_sessions = max(self.min_sessions, max_sessions or 2 * even_share)
+        self.clean_sessions = clean_sessions
+        self.require_logic_growth = require_logic_growth
+        self.require_acceptance = require_acceptance
+
+        self._fixed = self.even_boundaries(total_sessions, num_stages)
+        self.stage = 1
+        self.finished = False
+        self._ends: List[int] = []           # 완료된 스테이지의 마지막 세션
+        self._stages: List[Dict] = []        # 스테이지별 보고
+        self._start_stage(first_session=1, confirmed_count=0)
+
+    @staticmethod
+    def even_boundaries(total_sessions: int, num_stages: int) -> List[int]:
+        sessions_per_stage = total_sessions // num_stages
+        remainder = total_sessions % num_stages
+        boundaries, current = [], 0
+        for i in range(num_stages):
+            current += sessions_per_stage + (1 if i < remainder else 0)
+            boundaries.append(current)
+        return boundaries
+
+    def _start_stage(self, first_session: int, confirmed_count: int):
+        self._stage_sessions = 0
+        self._clean_streak = 0
+        self._streak_accepted = False
+        self._logic_at_start = confirmed_count
+        self._first_session = first_session
+
+    def _end_stage(self, session_num: int, confirmed_count: int, reason: str):
+        self._ends.append(session_num)
+        self._stages.append({
+            "stage": self.stage,
+            "first_session": self._first_session,
+            "last_session": session_num,
+            "sessions": self._stage_sessions,
+            "logic_growth": confirmed_count - self._logic_at_start,
+            "reason": reason,
+        })
+
+    def converged(self, confirmed_count: int) -> bool:
+        return (self._clean_streak >= self.clean_sessions
+                and (not self.require_logic_growth or confirmed_count > self._logic_at_start)
+                and (not self.require_acceptance or self._streak_accepted))
+
+    def observe(self, session_num: int, clean: bool, confirmed_count: int,
+                student_accepted: bool = False) -> Optional[str]:
+        """
+        세션 종료 후 호출. 스테이지를 끝냈으면 이유를 반환
+        ("converged" / "max_sessions" / "budget" / "fixed" / "end"), 아니면 None.
+        """
+        self._stage_sessions += 1
+        if clean:
+            self._clean_streak += 1
+            self._streak_accepted = self._streak_accepted or student_accepted
+        else:
+            self._clean_streak = 0
+            self._streak_accepted = False
+
+        last_stage = self.stage == self.num_stages
+        reason = None
+        if self.mode == "fixed":
+            if session_num >= self._fixed[self.stage - 1]:
+                reason = "fixed"
+        else:
+            stages_left = self.num_stages - self.stage
+            if self._stage_sessions >= self.min_sessions and self.converged(confirmed_count):
+                reason = "converged"
+            elif self._stage_sessions >= self.max_sessions and not last_stage:
+                reason = "max_sessions"
+            elif stages_left and self.total_sessions - session_num <= stages_left * self.min_sessions:
+                reason = "budget"
+        if session_num >= self.total_sessions:
+            reason = reason or "end"
+
+        if reason is None:
+            return None
+        self._end_stage(session_num, confirmed_count, reason)
+        if last_stage or session_num >= self.total_sessions:
+            self.finished = True
+        else:
+            self.stage += 1
+            self._start_stage(session_num + 1, confirmed_count)
+        return reason
+
+    @property
+    def boundaries(self) -> List[int]:
+        if self.mode == "fixed":
+            return list(self._fixed)
+        last = self._ends[-1] if self._ends else 0
+        return self._ends + [last] * (self.num_stages - len(self._ends))
+
+    def report(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "min_sessions": self.min_sessions,
+            "max_sessions": self.max_sessions,
+            "signals": {"clean_sessions": self.clean_sessions,
+                        "require_logic_growth": self.require_logic_growth,
+                        "require_acceptance": self.require_acceptance},
+            "session_budget": self.total_sessions,
+            "sessions_run": self._ends[-1] if self.finished and self._ends else None,
+            "stages": list(self._stages),
+        }
+
+
+# ===========================================================================
+# PERF-18 : 세션별 적응형 턴 예산
+# ===========================================================================
+TURN_CONTROL_MODES = ("fixed", "adaptive")
+
+
+class TurnController:
+    """
+    충돌이 남은 턴 이후 세션을 계속할지 결정한다 (API 호출 없음).
+
+      fixed    : 기존 동작 (max_turns_per_session까지, 충돌 없음 / Force-Proceed 시 종료)
+      adaptive : 아래 경우 세션을 조기 종료
+                 • 학생 응답에 명시적 수용 표현 (StudentAgent.shows_acceptance)
+                 • 학생 질문의 새 어휘 비율 < novelty_threshold (같은 세션 이전 질문 대비)
+                 • 새 할루시네이션을 확정하지 못한 충돌 턴이 patience회 연속
+                 반대로 충돌이 계속 새 할루시네이션을 확정하면 예산을
+                 max_extra_turns까지 1턴씩 연장한다.
+
+    Force-Proceed / "충돌 없음" 종료는 그대로이며 컨트롤러보다 먼저 적용된다.
+    세션별 보고: 사용 턴, 연장 턴, 절약 턴(남은 기본 예산), 절약 호출 추정치
+    (절약 턴 × 이번 세션 턴당 평균 호출 수).
+    """
+
+    WORD_PATTERN = re.compile(r"[a-z][a-z0-9'-]{2,}")
+
+    def __init__(self, max_turns: int, mode: str = "fixed",
+                 novelty_threshold: float = 0.2, max_extra_turns: int = 2,
+                 patience: int = 2):
+        if mode not in TURN_CONTROL_MODES:
+            raise ValueError(f"Unknown turn control mode: {mode} "
+                             f"(expected one of {TURN_CONTROL_MODES})")
+        self.mode = mode
+        self.max_turns = max_turns
+        self.novelty_threshold = novelty_threshold
+        self.max_extra_turns = max_extra_turns
+        self.patience = patience
+        self.sessions: List[Dict] = []
+        self.start_session(0)
+
+    def start_session(self, session_num: int):
+        self.session_num = session_num
+        self.budget = self.max_turns
+        self._seen_words: set = set()
+        self._seen_findings: set = set()
+        self._unproductive = 0
+        self._turn_calls: List[int] = []
+
+    @classmethod
+    def novelty(cls, text: str, seen_words: set) -> float:
+        words = set(cls.WORD_PATTERN.findall(text.lower()))
+        if not words:
+            return 0.0
+        return len(words - seen_words) / len(words)
+
+    def observe_turn(self, student_question: str, api_calls: int):
+        """턴마다 호출 (학생 질문 어휘 누적 전의 novelty를 반환)."""
+        novelty = self.novelty(student_question, self._seen_words) if self._seen_words else 1.0
+        self._seen_words |= set(self.WORD_PATTERN.findall(student_question.lower()))
+        self._turn_calls.append(api_calls)
+        return novelty
+
+    def after_conflict(self, turn_count: int, student_question: str, novelty: float,
+                       resolved: List[Dict]) -> Optional[str]:
+        """
+        충돌 해결 후 호출. 세션을 끝내야 하면 이유를 반환
+        ("accepted" / "low_novelty" / "unproductive"), 계속이면 None.
+        """
+        new_findings = {' '.join(h.get('statement', '').lower().split())
+                        for h in resolved} - self._seen_findings
+        self._seen_findings |= new_findings
+        if self.mode == "fixed":
+            return None
+
+        if StudentAgent.shows_acceptance(student_question):
+            return "accepted"
+        if novelty < self.novelty_threshold:
+            return "low_novelty"
+        if not new_findings:
+            self._unproductive += 1
+            if self._unproductive >= self.patience:
+                return "unproductive"
+            return None
+        self._unproductive = 0
+        if turn_count >= self.budget and self.budget < self.max_turns + self.max_extra_turns:
+            self.budget += 1
+            print(f"  ➕ Productive conflict – turn budget extended to {self.budget}")
+        return None
+
+    def end_session(self, turns: int, end_reason: str) -> Dict:
+        calls = sum(self._turn_calls)
+        turns_saved = max(0, self.max_turns - turns)
+        report = {
+            "session": self.session_num,
+            "turns": turns,
+            "budget": self.budget,
+            "extra_turns": max(0, turns - self.max_turns),
+            "end_reason": end_reason,
+            "api_calls": calls,
+            "turns_saved": turns_saved if end_reason in ("accepted", "low_novelty",
+                                                        "unproductive") else 0,
+        }
+        report["calls_avoided_est"] = (
+            round(report["turns_saved"] * calls / turns) if turns else 0
+        )
+        self.sessions.append(report)
+        return report
+
+    def report(self) -> Dict:
+        return {
+            "mode": self.mode,
+            "max_turns": self.max_turns,
+            "novelty_threshold": self.novelty_threshold,
+            "max_extra_turns": self.max_extra_turns,
+            "patience": self.patience,
+            "turns_saved": sum(r["turns_saved"] for r in self.sessions),
+            "extra_turns": sum(r["extra_turns"] for r in self.sessions),
+            "calls_avoided_est": sum(r["calls_avoided_est"] for r in self.sessions),
+            "sessions": list(self.sessions),
+        }
+
+
 # ===========================================================================
 # ProvenFactSystem – 메인 오케스트라테이터
 # ===========================================================================
@@ -1175,58 +3486,113 @@ class ProvenFactSystem:
     SUGGEST-01 : Force-Proceed 플래그 (deadlock_count 추적)
     BUG-D      : conflict 중간 턴에서도 record_exchange 실행
     BUG-E      : hallucination에 session 필드 추가
+    PERF-01    : RuleEngine 결과를 심판 결과와 병합
+    PERF-23    : 교수 방어 wave 병렬 실행 + 결정론적 fold
+    PERF-24    : ClaimAligner 기반 심판 충돌 판정
     """
 
     def __init__(self, api_provider: str = "anthropic",
                  api_key: Optional[str] = None,
                  num_professors: int = 4,
-                 num_referees: int = 2):
+                 num_referees: int = 2,
+                 enable_rule_engine: bool = False,
+                 model_routing: Optional[Dict[str, Dict]] = None,
+                 referee_panel: Optional[List[Dict]] = None,
+                 parallel_referees: bool = True,
+                 model: Optional[str] = None,
+                 base_url: Optional[str] = None,
+                 pool_size: int = 32,
+                 keepalive_sec: float = 60.0,
+                 execution_mode: str = "sync",
+                 batch_options: Optional[Dict] = None,
+                 batch_dispatchers: Optional[Dict[str, "BatchDispatcher"]] = None,
+                 coalesce: str = "deterministic",
+                 sft_export: Optional[Dict] = None,
+                 stage_schedule: Optional[Dict] = None,
+                 turn_control: Optional[Dict] = None,
+                 evidence_top_k: int = 10,
+                 parallel_defenses: bool = True,
+                 claim_match_threshold: float = 0.8,
+                 claim_cache: bool = False):
+
+        # PERF-05 : 심판 패널이 주어지면 심판 수는 패널 크기를 따른다
+        if referee_panel:
+            num_referees = len(referee_panel)
 
         # ── 유효성 체크 ──────────────────────────────────────────────
-        if not 2 <= num_referees <= 3:
-            raise ValueError("Number of referees must be 2 or 3")
-
-        # GROK-C1: API 키 명시적 체크
-        if api_key is None:
-            api_key = os.getenv(f"{api_provider.upper()}_API_KEY")
-
-        if not api_key:
-            print("=" * 70)
-            print(f"  ❌ ERROR: {api_provider.upper()}_API_KEY Not Found")
-            print("=" * 70)
-            print()
-            print("  Please set your API key:")
-            print()
-            print(f"    export {api_provider.upper()}_API_KEY='your-key-here'")
-            print()
-            print("  Or pass it directly:")
-            print(f"    system = ProvenFactSystem(api_key='your-key')")
-            print()
-            print("=" * 70)
-            raise ValueError(f"{api_provider.upper()}_API_KEY not found in environment")
-
-        # ── API 클라이언트 초기화 ─────────────────────────────────────
-        if api_provider == "anthropic":
-            if not _ANTHROPIC_AVAILABLE:
-                raise ImportError(
-                    "anthropic package is not installed.\n"
-                    "  Install it with:  pip install anthropic"
-                )
-            self.client = anthropic.Anthropic(api_key=api_key)
-        elif api_provider == "openai":
-            if not _OPENAI_AVAILABLE:
-                raise ImportError(
-                    "openai package is not installed.\n"
-                    "  Install it with:  pip install openai"
-                )
-            self.client = openai.OpenAI(api_key=api_key)
-        else:
-            raise ValueError(f"Unknown provider: {api_provider}")
+        if num_referees < 2:
+            raise ValueError("Number of referees must be at least 2")
+        if execution_mode not in ("sync", "batch"):
+            raise ValueError(f"Unknown execution_mode: {execution_mode} (expected 'sync' or 'batch')")
+        if coalesce not in COALESCE_MODES:
+            raise ValueError(f"Unknown coalesce mode: {coalesce} (expected one of {COALESCE_MODES})")
+        stage_schedule = dict(stage_schedule or {})
+        if stage_schedule.get("mode", "fixed") not in STAGE_SCHEDULE_MODES:
+            raise ValueError(f"Unknown stage schedule mode: {stage_schedule['mode']} "
+                             f"(expected one of {STAGE_SCHEDULE_MODES})")
+        turn_control = dict(turn_control or {})
+        if turn_control.get("mode", "fixed") not in TURN_CONTROL_MODES:
+            raise ValueError(f"Unknown turn control mode: {turn_control['mode']} "
+                             f"(expected one of {TURN_CONTROL_MODES})")
+        if evidence_top_k < 1:
+            raise ValueError(f"evidence_top_k must be at least 1, got {evidence_top_k}")
+        claim_aligner = ClaimAligner(claim_match_threshold)
+
+        self.client = build_api_client(api_provider, api_key, base_url=base_url,
+                                       pool_size=pool_size, keepalive_sec=keepalive_sec)
+        self.base_url = base_url
 
         self.api_provider = api_provider
+        # PERF-04 : 역할별 라우팅 테이블 (config JSON의 "model_routing" / CLI --route)
+        self.model_routing = build_model_routing(api_provider, model_routing,
+                                                 default_model=model)
         self.num_professors = num_professors
         self.num_referees = num_referees
 
+        # PERF-05 : 심판별 (provider, client, routing). 패널 미지정 시 메인 client 공유
+        self.parallel_referees = parallel_referees
+        self.referee_backends = self._build_referee_backends(
+            referee_panel, api_key, model_routing,
+            client_options={"pool_size": pool_size, "keepalive_sec": keepalive_sec}
+        )
+
+        # PERF-07 : batch 모드 – provider 엔드포인트마다 dispatcher 1개 (_provider_key() → dispatcher).
+        #           batch_dispatchers를 넘기면 여러 시뮬레이션이 같은 배치를 공유한다.
+        self.execution_mode = execution_mode
+        self.batch_options = batch_options or {}
+        self.batch_dispatchers: Dict[str, BatchDispatcher] = batch_dispatchers \
+            if batch_dispatchers is not None else {}
+
+        # PERF-08 : 동일 요청 병합 정책 (coalescer 자체는 프로세스 전역)
+        self.coalesce = coalesce
+
+        # PERF-10 : SFTShardWriter 옵션 (max_records / max_bytes / dedup /
+        #           hallucinations / max_severity). 기본값은 기존 단일 .jsonl 출력
+        self.sft_export = dict(sft_export or {})
+
+        # PERF-17 : StageScheduler 옵션 (mode / min_sessions / max_sessions /
+        #           clean_sessions / require_logic_growth / require_acceptance)
+        self.stage_schedule = stage_schedule
+
+        # PERF-18 : TurnController 옵션 (mode / novelty_threshold / max_extra_turns / patience)
+        self.turn_control = turn_control
+
+        # PERF-21 : 교수에게 주는 stage 증거 최대 개수 (stage가 더 크면 BM25 검색)
+        self.evidence_top_k = evidence_top_k
+        self.evidence_index: Optional[EvidenceIndex] = None
+
+        # PERF-23 : 충돌 해결 시 서로 다른 교수의 방어를 동시에 실행
+        self.parallel_defenses = parallel_defenses
+        self.defense_stats = {"defenses": 0, "waves": 0, "parallel_waves": 0}
+
+        # PERF-24 : 심판 finding claim 정렬 (정렬 전/후 충돌 수 집계)
+        self.claim_aligner = claim_aligner
+        self.conflict_stats = {"checks": 0, "findings": 0,
+                               "raw_conflicts": 0, "aligned_conflicts": 0}
+
+        # PERF-25 : 심판별 claim 판정 캐시 사용 여부
+        self.claim_cache = claim_cache
+
         self.professors: List[ProfessorAgent] = []
         self.student: Optional[StudentAgent] = None
         self.referees: List[RefereeAgent] = []
@@ -1236,6 +3602,114 @@ class ProvenFactSystem:
         self.fixed_constants: Dict = {}
         self.confirmed_logic: List[Dict] = []   # 시스템 전체 확정 논리 저장소
 
+        # PERF-01 : 결정론적 규칙 엔진 (run_learning_simulation에서 상수와 함께 컴파일).
+        #           finding이 clean 세션 / 논리 확정을 막으므로 opt-in (--rule-engine)
+        self.enable_rule_engine = enable_rule_engine
+        self.rule_engine: Optional[RuleEngine] = None
+
+    # ------------------------------------------------------------------
+    # PERF-05 : 혼합 provider 심판 패널
+    def _build_referee_backends(self, referee_panel: Optional[List[Dict]],
+                                api_key: Optional[str],
+                                model_routing: Optional[Dict[str, Dict]],
+                                client_options: Optional[Dict] = None) -> List[Dict]:
+        """
+        referee_panel 항목 예:
+          {"provider": "openai", "model": "gpt-4o-mini", "max_tokens": 1024,
+           "api_key_env": "OPENAI_API_KEY"}
+          {"provider": "openai_compatible", "base_url": "http://localhost:8000/v1",
+           "model": "Qwen/Qwen2.5-72B-Instruct"}
+        같은 provider + 같은 키 + 같은 base_url을 쓰는 심판은 client를 공유한다.
+        """
+        if not referee_panel:
+            return [{"provider": self.api_provider, "client": self.client,
+                     "routing": self.model_routing}] * self.num_referees
+
+        client_options = client_options or {}
+        clients: Dict[Tuple[str, Optional[str], Optional[str]], object] = {
+            (self.api_provider, api_key, self.base_url): self.client
+        }
+        backends = []
+        for entry in referee_panel:
+            provider = entry.get("provider", self.api_provider)
+            key = entry.get("api_key")
+            if key is None and entry.get("api_key_env"):
+                key = os.getenv(entry["api_key_env"])
+            if provider == self.api_provider and key is None:
+                key = api_key
+            base_url = entry.get("base_url")
+            if provider == self.api_provider and base_url is None:
+                base_url = self.base_url
+            client_key = (provider, key, base_url)
+            if client_key not in clients:
+                clients[client_key] = build_api_client(
+                    provider, key, base_url=base_url,
+                    pool_size=entry.get("pool_size", client_options.get("pool_size", 32)),
+                    keepalive_sec=entry.get("keepalive_sec",
+                                            client_options.get("keepalive_sec", 60.0)),
+                )
+
+            # 같은 provider면 전체 라우팅 override를 이어받고, 다르면 provider 기본값에서 시작
+            overrides = {role: dict(cfg) for role, cfg in (model_routing or {}).items()} \
+                if provider == self.api_provider else {}
+            referee_route = overrides.setdefault("referee", {})
+            for field in _ROUTE_FIELD_TYPES:
+                if field in entry:
+                    referee_route[field] = entry[field]
+            backends.append({
+                "provider": provider,
+                "client": clients[client_key],
+                "routing": build_model_routing(
+                    provider, overrides,
+                    default_model=self.model_routing["referee"]["model"]
+                    if provider == self.api_provider else None
+                ),
+            })
+        return backends
+
+    # ------------------------------------------------------------------
+    # PERF-07 : batch 모드에서 에이전트에 dispatcher 연결
+    #           dispatcher는 provider 엔드포인트 단위 – 시뮬레이션마다 client가 달라도
+    #           batch_dispatchers를 공유하면 같은 배치에 모인다.
+    #           배치는 동시에 던지는 phase(교수 teach / 심판 verify)에만 – 학생 / 기록 /
+    #           검증 호출은 순차라서 1건짜리 배치가 되므로 sync로 보낸다.
+    def _attach_batch_dispatchers(self, agents: List[PersonaAgent]):
+        for agent in agents:
+            agent.coalesce_mode = self.coalesce      # PERF-08
+        if self.execution_mode != "batch":
+            return
+        for agent in agents:
+            if not isinstance(agent, (ProfessorAgent, RefereeAgent)):
+                continue
+            key = agent._provider_key()
+            if key not in self.batch_dispatchers:
+                # setdefault : 다른 시뮬레이션 스레드가 먼저 만들었으면 그것을 사용
+                self.batch_dispatchers.setdefault(key, BatchDispatcher(
+                    agent.client, agent.provider, **self.batch_options
+                ))
+            agent.batch_dispatcher = self.batch_dispatchers[key]
+
+    # ------------------------------------------------------------------
+    # PERF-07 : 교수 teach 호출 – batch 모드에서는 동시에 던져 한 배치로 묶는다
+    def _teach_all(self, order: List[int], **kwargs) -> List[str]:
+        if self.execution_mode != "batch" or len(order) < 2:
+            return [self.professors[idx].teach(**kwargs) for idx in order]
+        with ThreadPoolExecutor(max_workers=len(order)) as pool:
+            futures = [pool.submit(self.professors[idx].teach, **kwargs) for idx in order]
+            return [f.result() for f in futures]
+
+    # ------------------------------------------------------------------
+    # PERF-05 : 심판 검증을 동시에 실행 (결과 순서는 심판 순서 유지)
+    def _verify_with_referees(self, **kwargs) -> List[Dict]:
+        parallel = self.parallel_referees or self.execution_mode == "batch"
+        if not parallel or len(self.referees) < 2:
+            return [referee.verify_statements(**kwargs) for referee in self.referees]
+        with ThreadPoolExecutor(max_workers=len(self.referees)) as pool:
+            futures = [pool.submit(referee.verify_statements, **kwargs)
+                       for referee in self.referees]
+            # 하나라도 APICallError면 result()에서 그대로 전파된다
+            return [f.result() for f in futures]
+
     # ------------------------------------------------------------------
     def _create_personas(self, topic: str, proven_fact: str):
         specialties = [
@@ -1245,43 +3719,48 @@ class ProvenFactSystem:
             "Experimental Methods and Observation"
         ]
         self.professors = [
-            ProfessorAgent(f"Prof. {chr(65+i)}", specialties[i], self.client, current_stage=1)
+            ProfessorAgent(f"Prof. {chr(65+i)}", specialties[i], self.client, current_stage=1,
+                           routing=self.model_routing)
             for i in range(min(self.num_professors, len(specialties)))
         ]
-        self.student = StudentAgent("Alex", self.client, skepticism_level="ultra-high")
+        self.student = StudentAgent("Alex", self.client, skepticism_level="ultra-high",
+                                    routing=self.model_routing)
 
-        referee_schedules = generate_referee_schedules(self.num_referees, max_sessions=100)
+        # PERF-16 : 세션 수 제한 없는 lazy 스케줄 (멤버십 체크 O(1))
+        self.referee_scheduler = RefereeResetScheduler(self.num_referees)
         self.referees = [
-            RefereeAgent(f"Referee_{i+1}", self.client,
-                         reset_schedule=referee_schedules[i],
-                         strictness="high")
+            RefereeAgent(f"Referee_{i+1}", self.referee_backends[i]["client"],
+                         reset_schedule=self.referee_scheduler[i],
+                         strictness="high",
+                         routing=self.referee_backends[i]["routing"],
+                         provider=self.referee_backends[i]["provider"])
             for i in range(self.num_referees)
         ]
+        if self.claim_cache:
+            for referee in self.referees:
+                referee.claim_cache = ClaimVerificationCache()
 
         # BUG-B 수정 : 올바른 주기 표시
-        print("✅ Referee Reset Schedules (v1.1.0):")
-        if self.num_referees == 2:
-            labels = ["5n (5,10,15…)", "5n-3 (2,7,12…)"]
-        else:
-            labels = ["7n (7,14,21…)", "7n-3 (4,11,18…)", "7n-5 (2,9,16…)"]
-        for i, sched in enumerate(referee_schedules):
-            print(f"   Referee {i+1}: {labels[i]}  →  first 6: {sched[:6]}")
-
-        self.recorder = RecorderAgent("DataRecorder", self.client)
-        self.validator = ValidationSpecialist("QualityValidator", self.client)
+        print(f"✅ Referee Reset Schedules (period {self.referee_scheduler.period}):")
+        for i, sched in enumerate(self.referee_scheduler):
+            backend = self.referees[i]
+            print(f"   Referee {i+1}: {sched.label}  →  first 6: {sched[:6]}  "
+                  f"[{backend.provider} / {backend.routing['referee']['model']}]")
+
+        self.recorder = RecorderAgent("DataRecorder", self.client, routing=self.model_routing)
+        self.validator = ValidationSpecialist("QualityValidator", self.client,
+                                              routing=self.model_routing)
+
+        self._attach_batch_dispatchers(
+            self.professors + [self.student] + self.referees + [self.recorder, self.validator]
+        )
 
         print(f"✅ Created {len(self.professors)} professors, 1 student, "
               f"{len(self.referees)} referees, 1 recorder, 1 validator")
 
     # ------------------------------------------------------------------
     def _determine_stage_boundaries(self, total_sessions: int, num_stages: int = 4) -> List[int]:
-        sessions_per_stage = total_sessions // num_stages
-        remainder = total_sessions % num_stages
-        boundaries, current = [], 0
-        for i in range(num_stages):
-            current += sessions_per_stage + (1 if i < remainder else 0)
-            boundaries.append(current)
-        return boundaries
+        return StageScheduler.even_boundaries(total_sessions, num_stages)
 
     def _get_current_stage(self, session_num: int, boundaries: List[int]) -> int:
         for stage_idx, boundary in enumerate(boundaries, 1):
@@ -1307,25 +3786,51 @@ class ProvenFactSystem:
         if len(all_results) < 2:
             return False, []
 
-        hallucination_map: Dict[str, List] = defaultdict(list)
+        findings: List[Dict] = []
         for ref_idx, result in enumerate(all_results):
             for hall in result.get('professor_hallucinations', []):
-                prof_idx = hall.get('professor_index', -1)
-                stmt_sig = f"{prof_idx}:{hall.get('statement', '')[:50]}"
-                hallucination_map[stmt_sig].append({
+                findings.append({
                     'referee_idx': ref_idx,
                     'referee_name': self.referees[ref_idx].name,
                     'hallucination': hall
                 })
 
+        def signature(hall: Dict) -> str:
+            return f"{hall.get('professor_index', -1)}:{hall.get('statement', '')[:50]}"
+
+        # 기존 방식 (statement 앞 50자 일치) 충돌 수 – 정렬 효과 비교용
+        hallucination_map: Dict[str, List] = defaultdict(list)
+        for finding in findings:
+            hallucination_map[signature(finding['hallucination'])].append(finding)
+        raw_conflicts = sum(1 for d in hallucination_map.values()
+                            if 0 < len(d) < len(all_results))
+
+        # PERF-24 : 같은 claim으로 정렬된 그룹마다 서로 다른 심판 수를 센다
+        groups = self.claim_aligner.group([
+            (f['hallucination'].get('professor_index', -1),
+             f['hallucination'].get('statement', '')) for f in findings
+        ])
         conflicts = []
-        for stmt_sig, detections in hallucination_map.items():
-            if 0 < len(detections) < len(all_results):
+        for members in groups:
+            detections, referees = [], set()
+            for i in members:
+                if findings[i]['referee_idx'] not in referees:
+                    referees.add(findings[i]['referee_idx'])
+                    detections.append(findings[i])
+            if len(referees) < len(all_results):
                 conflicts.append({
-                    'statement_signature': stmt_sig,
+                    'statement_signature': signature(detections[0]['hallucination']),
                     'flagged_by': detections,
-                    'total_referees': len(all_results)
+                    'total_referees': len(all_results),
+                    'aligned_findings': len(members)
                 })
+
+        self.conflict_stats["checks"] += 1
+        self.conflict_stats["findings"] += len(findings)
+        self.conflict_stats["raw_conflicts"] += raw_conflicts
+        self.conflict_stats["aligned_conflicts"] += len(conflicts)
+        if raw_conflicts != len(conflicts):
+            print(f"  🔗 Claim alignment: {raw_conflicts} → {len(conflicts)} conflict(s)")
         return len(conflicts) > 0, conflicts
 
     # ------------------------------------------------------------------
@@ -1344,63 +3849,146 @@ class ProvenFactSystem:
         """
         resolved_hallucinations: List[Dict] = []
 
-        for conflict in conflicts:
-            print(f"\n  ⚖️  REFEREE CONFLICT DETECTED:")
-            print(f"      Statement: {conflict['statement_signature'][:60]}…")
-            print(f"      Flagged by {len(conflict['flagged_by'])}/{conflict['total_referees']} referees")
-
-            # ---- SUGGEST-01 : Force-Proceed 체크 ----
-            if deadlock_count >= 2:
-                print(f"      🚩 FORCE-PROCEED activated (deadlock_count={deadlock_count}). "
-                      f"교수 판정승 – 할루시네이션 플래그 해제, 다음 논리로 진행.")
-                # 교수 판정승 → hallucination을 resolved 목록에 넣지 않음
-                continue
-
-            primary_detection = conflict['flagged_by'][0]
-            hall = primary_detection['hallucination']
-            # BUG-E : session 필드 추가
-            hall['session'] = session_num
+        # PERF-23 : 방어 호출을 wave 단위로 동시에 실행한 뒤 원래 충돌 순서로 fold.
+        #   wave 크기 = 2 - deadlock_count. wave 안에서 deadlock_count가 2에 도달하려면
+        #   wave 크기만큼의 약한 방어가 먼저 있어야 하므로, wave의 모든 방어는 순차 실행
+        #   때도 호출되었을 것이다 → 호출 집합 / deadlock / Force-Proceed 결과가 순차와 동일.
+        start = 0
+        while start < len(conflicts):
+            wave_size = max(0, 2 - deadlock_count)
+            end, calls = start, []
+            while end < len(conflicts) and (wave_size == 0 or len(calls) < wave_size):
+                hall = conflicts[end]['flagged_by'][0]['hallucination']
+                prof_idx = hall.get('professor_index', -1)
+                if wave_size and 0 <= prof_idx < len(professors):
+                    calls.append((end, professors[prof_idx], hall))
+                end += 1
+            defenses = self._run_defenses(calls, fixed_constants)
+
+            for k in range(start, end):
+                conflict = conflicts[k]
+                print(f"\n  ⚖️  REFEREE CONFLICT DETECTED:")
+                print(f"      Statement: {conflict['statement_signature'][:60]}…")
+                print(f"      Flagged by {len(conflict['flagged_by'])}/{conflict['total_referees']} referees")
+
+                # ---- SUGGEST-01 : Force-Proceed 체크 ----
+                if deadlock_count >= 2:
+                    print(f"      🚩 FORCE-PROCEED activated (deadlock_count={deadlock_count}). "
+                          f"교수 판정승 – 할루시네이션 플래그 해제, 다음 논리로 진행.")
+                    self._overturn_cached_verdicts(conflict)
+                    # 교수 판정승 → hallucination을 resolved 목록에 넣지 않음
+                    continue
+
+                primary_detection = conflict['flagged_by'][0]
+                hall = primary_detection['hallucination']
+                # BUG-E : session 필드 추가
+                hall['session'] = session_num
 
-            prof_idx = hall.get('professor_index', -1)
-            if prof_idx < 0 or prof_idx >= len(professors):
-                print(f"      ⚠️ Invalid professor index, skipping")
-                continue
+                prof_idx = hall.get('professor_index', -1)
+                if prof_idx < 0 or prof_idx >= len(professors):
+                    print(f"      ⚠️ Invalid professor index, skipping")
+                    continue
+
+                professor = professors[prof_idx]
+                print(f"      → Asking {professor.name} to provide evidence…")
+
+                defense = defenses[k]
+                if isinstance(defense, APICallError):
+                    # PERF-03 : 방어 호출 실패 → 증거 없음으로 보고 플래그 유지 (deadlock 증가 없음)
+                    print(f"      ⛔ Defense call failed ({defense.error_class}) – hallucination kept")
+                    hall['defense_failed'] = defense.error_class
+                    resolved_hallucinations.append(hall)
+                    continue
 
-            professor = professors[prof_idx]
-            print(f"      → Asking {professor.name} to provide evidence…")
+                if defense.get('acknowledges_error', False):
+                    print(f"      ✓ {professor.name} acknowledges error")
+                    resolved_hallucinations.append(hall)
+                else:
+                    num_sources = len(defense.get('sources', []))
+                    print(f"      → {professor.name} defends with {num_sources} sources")
+
+                    if num_sources >= 3:
+                        print(f"      ✓ Strong evidence – hallucination flag removed")
+                        self._overturn_cached_verdicts(conflict)
+                        # hallucination 해제 → 목록에 추가하지 않음
+                    else:
+                        # 소스 부족 + ValidationSpecialist 개입 금지 →
+                        # hallucination을 유지하고 deadlock_count 증가
+                        print(f"      ⚖️  Insufficient sources ({num_sources}/3). "
+                              f"Flagging hallucination, incrementing deadlock count.")
+                        hall['professor_defense_weak'] = True
+                        hall['defense_sources_count'] = num_sources
+                        resolved_hallucinations.append(hall)
+                        deadlock_count += 1
+            start = end
 
-            defense = professor.defend_against_referee(
-                challenged_statement=hall.get('statement', ''),
-                referee_reasoning=hall.get('correct_info', ''),
-                fixed_constants=fixed_constants
-            )
+        return resolved_hallucinations, deadlock_count
 
-            if defense.get('acknowledges_error', False):
-                print(f"      ✓ {professor.name} acknowledges error")
-                resolved_hallucinations.append(hall)
-            else:
-                num_sources = len(defense.get('sources', []))
-                print(f"      → {professor.name} defends with {num_sources} sources")
+    # ------------------------------------------------------------------
+    # PERF-25 : 교수 판정승 → 모든 심판 캐시에서 해당 finding 제거 (다시 보고되지 않음)
+    def _overturn_cached_verdicts(self, conflict: Dict):
+        statements = [d['hallucination'].get('statement', '') for d in conflict['flagged_by']]
+        for referee in self.referees:
+            if referee.claim_cache is not None:
+                referee.claim_cache.overturn(statements)
 
-                if num_sources >= 3:
-                    print(f"      ✓ Strong evidence – hallucination flag removed")
-                    # hallucination 해제 → 목록에 추가하지 않음
-                else:
-                    # 소스 부족 + ValidationSpecialist 개입 금지 →
-                    # hallucination을 유지하고 deadlock_count 증가
-                    print(f"      ⚖️  Insufficient sources ({num_sources}/3). "
-                          f"Flagging hallucination, incrementing deadlock count.")
-                    hall['professor_defense_weak'] = True
-                    hall['defense_sources_count'] = num_sources
-                    resolved_hallucinations.append(hall)
-                    deadlock_count += 1
+    # ------------------------------------------------------------------
+    # PERF-23 : 한 wave의 방어 호출. 교수가 다르면 동시에, 같은 교수는 충돌 순서대로.
+    def _run_defenses(self, calls: List[Tuple[int, "ProfessorAgent", Dict]],
+                      fixed_constants: Dict) -> Dict[int, object]:
+        """{충돌 index: defense dict 또는 APICallError}"""
+        def run(group):
+            outcomes = {}
+            for k, professor, hall in group:
+                try:
+                    outcomes[k] = professor.defend_against_referee(
+                        challenged_statement=hall.get('statement', ''),
+                        referee_reasoning=hall.get('correct_info', ''),
+                        fixed_constants=fixed_constants
+                    )
+                except APICallError as e:
+                    outcomes[k] = e
+            return outcomes
+
+        groups: Dict[int, List] = defaultdict(list)
+        for call in calls:
+            groups[id(call[1])].append(call)
+        self.defense_stats["defenses"] += len(calls)
+        if calls:
+            self.defense_stats["waves"] += 1
+        if not self.parallel_defenses or len(groups) < 2:
+            return run(calls)
+
+        self.defense_stats["parallel_waves"] += 1
+        outcomes: Dict[int, object] = {}
+        with ThreadPoolExecutor(max_workers=len(groups)) as pool:
+            for part in pool.map(run, groups.values()):
+                outcomes.update(part)
+        return outcomes
 
-        return resolved_hallucinations, deadlock_count
+    # ------------------------------------------------------------------
+    # PERF-01 : 규칙 엔진 결과 병합 (심판이 이미 보고한 statement는 중복 제외)
+    def _merge_rule_findings(self, session_hallucinations: List[Dict],
+                             rule_findings: List[Dict],
+                             session_num: int) -> int:
+        seen = {
+            f"{h.get('professor_index', -1)}:{h.get('statement', '')[:50]}"
+            for h in session_hallucinations
+        }
+        added = 0
+        for finding in rule_findings:
+            sig = f"{finding['professor_index']}:{finding['statement'][:50]}"
+            if sig in seen:
+                continue
+            seen.add(sig)
+            finding['session'] = session_num   # BUG-E
+            session_hallucinations.append(finding)
+            added += 1
+        return added
 
     # ------------------------------------------------------------------
     def _severity_score(self, hallucination: Dict) -> int:
-        return {"critical": 4, "high": 3, "medium": 2, "low": 1}.get(
-            hallucination.get('severity', 'low'), 1)
+        return SEVERITY_RANK.get(hallucination.get('severity', 'low'), 1)
 
     def _detect_loop(self, recent_topics: List[str], window: int = 3) -> bool:
         if len(recent_topics) < window:
@@ -1418,7 +4006,7 @@ class ProvenFactSystem:
     def run_learning_simulation(self,
                                 proven_fact: str,
                                 topic: str,
-                                evidence_stages: List[List[str]],
+                                evidence_stages: List,
                                 fixed_constants: Dict = None,
                                 total_sessions: int = 12,
                                 max_turns_per_session: int = 5,
@@ -1436,6 +4024,24 @@ class ProvenFactSystem:
         self.fixed_constants = fixed_constants or {}
         self._create_personas(topic, proven_fact)
 
+        # PERF-21 : 파일 참조 로드 + stage별 검색 인덱스 (1회 구축)
+        evidence_stages = load_evidence_stages(evidence_stages)
+        self.evidence_index = EvidenceIndex(evidence_stages, top_k=self.evidence_top_k)
+        if any(len(items) > self.evidence_top_k for items in evidence_stages):
+            print(f"🔎 Evidence index: {[len(items) for items in evidence_stages]} items per stage, "
+                  f"top {self.evidence_top_k} retrieved per question")
+
+        # PERF-10 : SFT 예제는 기록 시점에 바로 .jsonl (샤드)로 스트리밍
+        sft_file = output_file.replace('.json', '.jsonl')
+        self.recorder.sft_writer = SFTShardWriter(sft_file, **self.sft_export)
+
+        # PERF-01 : 스테이지별 금지어 / 상수 규칙을 한 번만 컴파일
+        self.rule_engine = RuleEngine(
+            self.fixed_constants,
+            ProfessorAgent.FORBIDDEN_VOCABULARY,
+            ProfessorAgent.ERA_CONCEPT_RESTRICTIONS,
+        ) if self.enable_rule_engine else None
+
         constants_str = self._format_constants_string()
         if constants_str:
             for prof in self.professors:
@@ -1443,8 +4049,15 @@ class ProvenFactSystem:
             for ref in self.referees:
                 ref.inject_constants(constants_str)
 
-        stage_boundaries = self._determine_stage_boundaries(total_sessions, len(evidence_stages))
-        print(f"📊 Evidence Stage Boundaries: {stage_boundaries}\n")
+        # PERF-17 : fixed = 기존 균등 분할, adaptive = 수렴 신호로 스테이지 진행
+        stage_scheduler = StageScheduler(len(evidence_stages), total_sessions,
+                                         **self.stage_schedule)
+        if stage_scheduler.mode == "fixed":
+            print(f"📊 Evidence Stage Boundaries: {stage_scheduler.boundaries}\n")
+        else:
+            print(f"📊 Evidence Stages: adaptive ({len(evidence_stages)} stages, "
+                  f"{stage_scheduler.min_sessions}–{stage_scheduler.max_sessions} sessions each, "
+                  f"budget {total_sessions})\n")
 
         all_hallucinations: List[Dict] = []
         session_topics: List[str] = []
@@ -1457,24 +4070,37 @@ class ProvenFactSystem:
         # 시뮬레이션 종료 시 남은 pending은 confirmed로 승격 (마지막 세션 보호)
         pending_logic: Optional[Dict] = None
         self.consecutive_clean_count = 0
+        failed_turns: List[Dict] = []   # PERF-03 : APICallError로 중단된 턴
 
         # ── SESSION 루프 ──────────────────────────────────────────────
+        # PERF-18 : 충돌 턴 이후 계속 여부 (fixed = 기존 동작)
+        turn_controller = TurnController(max_turns_per_session, **self.turn_control)
+        agents = self.professors + [self.student] + self.referees
+
+        prev_stage = 1
+        sessions_run = 0
         for session_num in range(1, total_sessions + 1):
+            if stage_scheduler.finished:
+                print(f"\n🏁 Final stage converged – stopping after {sessions_run} of "
+                      f"{total_sessions} sessions")
+                break
+            sessions_run = session_num
             print(f"\n{'─' * 70}")
             print(f"SESSION {session_num}/{total_sessions}")
             print(f"{'─' * 70}")
 
-            current_stage = self._get_current_stage(session_num, stage_boundaries)
-            available_evidence = evidence_stages[current_stage - 1]
-            print(f"📍 Evidence Stage: {current_stage}/4  |  Evidence items: {len(available_evidence)}")
+            current_stage = stage_scheduler.stage
+            # PERF-21 : 세션 단위 증거 (심판 브리핑 / pending logic)는 증명할 사실 기준 top-k
+            available_evidence = self.evidence_index.search(proven_fact, current_stage)
+            print(f"📍 Evidence Stage: {current_stage}/{len(evidence_stages)}  |  "
+                  f"Evidence items: {self.evidence_index.stage_size(current_stage)}")
 
             # --- stage transition ---
-            if session_num > 1:
-                prev_stage = self._get_current_stage(session_num - 1, stage_boundaries)
-                if current_stage != prev_stage:
-                    print(f"\n🔄 STAGE TRANSITION: {prev_stage} → {current_stage}")
-                    for prof in self.professors:
-                        prof.update_stage(current_stage)
+            if current_stage != prev_stage:
+                print(f"\n🔄 STAGE TRANSITION: {prev_stage} → {current_stage}")
+                for prof in self.professors:
+                    prof.update_stage(current_stage)
+                prev_stage = current_stage
 
             # --- referee reset + SUGGEST-06 stage 증거 업데이트 ---
             for referee in self.referees:
@@ -1493,75 +4119,98 @@ class ProvenFactSystem:
             session_complete = False
             session_hallucinations: List[Dict] = []
             deadlock_count = 0   # SUGGEST-01 : 세션 당 교착 횟수 추적
+            session_failed = False   # PERF-03 : API 실패로 중단된 세션
             professor_responses: List[str] = []   # 이전 턴 교수 응답 (학생에게 전달용)
+            student_accepted = False  # PERF-17 : 이번 세션 학생 수용 표현 여부
+            turn_controller.start_session(session_num)
+            end_reason = "max_turns"
 
-            while not session_complete and turn_count < max_turns_per_session:
+            while not session_complete and turn_count < turn_controller.budget:
                 turn_count += 1
                 print(f"\n  Turn {turn_count}:")
+                calls_before = sum(a.api_calls for a in agents)
 
                 if self._detect_loop(session_topics):
                     print(f"  ⚠️  Loop detected – forcing new angle…")
                     context += "\n[Force new angle – avoid repetition]"
 
-                # --- Student question ---
-                student_errors = [
-                    h['statement'] for h in session_hallucinations
-                    if not h.get('professors_caught', True)
-                ]
-                # Turn 1: 교수 응답 아직 없음 → context만 전달
-                # Turn 2+: 이전 턴 교수 응답을 학생에게 전달하여 토론 연속성 유지
-                prev_prof_text = ""
-                if turn_count > 1 and professor_responses:
-                    prev_prof_text = "\n\n".join(
-                        f"Professor {i+1}:\n{resp}"
-                        for i, resp in enumerate(professor_responses)
+                # PERF-03 : API 실패는 턴 단위로 처리 – 실패한 턴은 기록/검증하지 않는다
+                try:
+                    # --- Student question ---
+                    student_errors = [
+                        h['statement'] for h in session_hallucinations
+                        if not h.get('professors_caught', True)
+                    ]
+                    # Turn 1: 교수 응답 아직 없음 → context만 전달
+                    # Turn 2+: 이전 턴 교수 응답을 학생에게 전달하여 토론 연속성 유지
+                    prev_prof_text: List[str] = []
+                    if turn_count > 1 and professor_responses:
+                        prev_prof_text = [f"Professor {i+1}:\n{resp}"
+                                          for i, resp in enumerate(professor_responses)]
+                    student_question = self.student.ask_question(
+                        professors_explanation=prev_prof_text,
+                        context=context,
+                        previous_errors=student_errors or None,
+                        confirmed_logic=self.confirmed_logic   # SUGGEST-03
                     )
-                student_question = self.student.ask_question(
-                    professors_explanation=prev_prof_text,
-                    context=context,
-                    previous_errors=student_errors or None,
-                    confirmed_logic=self.confirmed_logic   # SUGGEST-03
-                )
-                if verbose:
-                    print(f"\n  🎓 Student: {student_question[:200]}…")
+                    if verbose:
+                        print(f"\n  🎓 Student: {student_question[:200]}…")
+                    student_accepted = (student_accepted
+                                        or StudentAgent.shows_acceptance(student_question))
 
-                session_topics.append(' '.join(student_question.split()[:10]))
+                    session_topics.append(' '.join(student_question.split()[:10]))
 
-                # --- Professor responses (rotated order) ---
-                order = list(range(len(self.professors)))
-                order = order[turn_count % len(order):] + order[:turn_count % len(order)]
+                    # --- Professor responses (rotated order) ---
+                    order = list(range(len(self.professors)))
+                    order = order[turn_count % len(order):] + order[:turn_count % len(order)]
 
-                consistency_reminder = (
-                    "⚠️ CONSISTENCY CHECK:\n"
-                    "Review your previous arguments to ensure you're not contradicting established points.\n"
-                    "Build upon, don't undermine, previous reasoning.\n"
-                ) if self.professors[0].previous_arguments else ""
+                    consistency_reminder = (
+                        "⚠️ CONSISTENCY CHECK:\n"
+                        "Review your previous arguments to ensure you're not contradicting established points.\n"
+                        "Build upon, don't undermine, previous reasoning.\n"
+                    ) if self.professors[0].previous_arguments else ""
 
-                professor_responses = []   # 이번 턴 교수 응답 초기화
-                for idx in order:
-                    prof = self.professors[idx]
-                    resp = prof.teach(
+                    # PERF-21 : 학생 질문과 관련된 현재 stage 증거만 (이후 stage는 검색 대상 아님)
+                    turn_evidence = self.evidence_index.search(student_question, current_stage)
+
+                    # 이번 턴 교수 응답 (PERF-07: batch 모드에서는 동시 제출)
+                    professor_responses = self._teach_all(
+                        order,
                         student_question=student_question,
                         context=context,
-                        available_evidence=available_evidence,
+                        available_evidence=turn_evidence,
                         consistency_reminder=consistency_reminder
                     )
-                    professor_responses.append(resp)
                     if verbose:
-                        print(f"\n  📚 {prof.name}: {resp[:200]}…")
+                        for idx, resp in zip(order, professor_responses):
+                            print(f"\n  📚 {self.professors[idx].name}: {resp[:200]}…")
 
-                # --- Referee verification ---
-                all_referee_results: List[Dict] = []
-                for referee in self.referees:
-                    result = referee.verify_statements(
+                    # --- Referee verification (PERF-05: 심판별 provider 동시 호출) ---
+                    all_referee_results: List[Dict] = self._verify_with_referees(
                         professors_responses=professor_responses,
                         student_question=student_question,
                         session_num=session_num,
                         fixed_constants=self.fixed_constants,
                         current_stage=current_stage,                    # SUGGEST-02
-                        current_stage_evidence=available_evidence       # SUGGEST-02
+                        current_stage_evidence=turn_evidence            # SUGGEST-02
                     )
-                    all_referee_results.append(result)
+
+                except APICallError as e:
+                    print(f"  ⛔ Turn {turn_count} aborted: {e}")
+                    failed_turns.append({"session": session_num, "turn": turn_count,
+                                         **e.to_dict()})
+                    session_failed = True
+                    end_reason = "api_failure"
+                    break
+
+                # --- PERF-01 : 결정론적 규칙 검사 (API 호출 없음) ---
+                rule_findings: List[Dict] = []
+                if self.rule_engine is not None:
+                    rule_findings = self.rule_engine.scan(
+                        professor_responses, current_stage
+                    )['professor_hallucinations']
+                    if rule_findings:
+                        print(f"  🔎 Rule engine: {len(rule_findings)} deterministic finding(s)")
 
                 # --- Conflict detection & resolution ---
                 has_conflict, conflicts = self._detect_referee_conflict(all_referee_results)
@@ -1573,7 +4222,8 @@ class ProvenFactSystem:
                     student_question=student_question,
                     professors_responses=professor_responses,
                     referee_results=all_referee_results,
-                    context=context
+                    context=context,
+                    rule_findings=rule_findings
                 )
 
                 if has_conflict:
@@ -1588,21 +4238,38 @@ class ProvenFactSystem:
                     )
                     session_hallucinations.extend(resolved)
 
+                    # PERF-18 : 턴 호출 수 / 학생 질문 novelty (API 호출 없음)
+                    novelty = turn_controller.observe_turn(
+                        student_question, sum(a.api_calls for a in agents) - calls_before)
+                    stop_reason = turn_controller.after_conflict(
+                        turn_count, student_question, novelty, resolved)
+
                     # SUGGEST-01 : Force-Proceed 후 세션 종료
                     if deadlock_count >= 2:
                         print(f"  🚩 FORCE-PROCEED: 교수 판정승으로 세션 종료. 다음 논리로 진행.")
                         session_complete = True
-                    elif turn_count >= max_turns_per_session:
+                        end_reason = "force_proceed"
+                    elif stop_reason:
+                        print(f"  ⏹️  Session ended early ({stop_reason}, novelty {novelty:.2f})")
+                        session_complete = True
+                        end_reason = stop_reason
+                    elif turn_count >= turn_controller.budget:
                         print(f"  🛑 Max turns reached after conflict resolution")
                         session_complete = True
                     # else: continue to next turn
                 else:
                     # 충돌 없음 → 정상 종료
+                    turn_controller.observe_turn(
+                        student_question, sum(a.api_calls for a in agents) - calls_before)
                     for result in all_referee_results:
                         for h in result.get('professor_hallucinations', []):
                             h['session'] = session_num   # BUG-E
                             session_hallucinations.append(h)
                     session_complete = True
+                    end_reason = "no_conflict"
+
+                # PERF-01 : 규칙 엔진 판정은 심판 충돌/Force-Proceed와 무관하게 항상 반영
+                self._merge_rule_findings(session_hallucinations, rule_findings, session_num)
 
             # ── SESSION 종료 정리 ─────────────────────────────────────
             if session_hallucinations:
@@ -1614,6 +4281,10 @@ class ProvenFactSystem:
                     print(f"  🔒 Pending logic from Session {pending_logic['session']} "
                           f"discarded (hallucination detected → count reset to 0)")
                     pending_logic = None
+            elif session_failed:
+                # PERF-03 : 검증되지 않은 세션은 clean으로 간주하지 않는다
+                print(f"\n  ⛔ Session {session_num}: incomplete (API failure) – "
+                      f"not counted as clean, no logic staged")
             else:
                 print(f"\n  ✅ Session {session_num}: Clean (no hallucinations)")
 
@@ -1641,9 +4312,26 @@ class ProvenFactSystem:
                 print(f"  ⏳ Logic from Session {session_num} staged as pending "
                       f"(awaiting next-session confirmation)")
 
-            if turn_count >= max_turns_per_session and not session_complete:
+            if turn_count >= turn_controller.budget and not session_complete:
                 print(f"  ⏱️  Session force-completed after {turn_count} turns")
 
+            # --- PERF-18 : 세션별 턴 / 호출 보고 ---
+            turn_report = turn_controller.end_session(turn_count, end_reason)
+            if turn_controller.mode == "adaptive":
+                print(f"  🔁 Turns: {turn_report['turns']}/{turn_report['budget']} "
+                      f"({end_reason}) – saved {turn_report['turns_saved']} turn(s), "
+                      f"~{turn_report['calls_avoided_est']} call(s)")
+
+            # --- PERF-17 : 스테이지 수렴 판정 ---
+            stage_end = stage_scheduler.observe(
+                session_num,
+                clean=not session_hallucinations and not session_failed,
+                confirmed_count=len(self.confirmed_logic),
+                student_accepted=student_accepted
+            )
+            if stage_end and stage_scheduler.mode == "adaptive":
+                print(f"  📈 Stage {current_stage} closed after session {session_num} ({stage_end})")
+
         # ── LOOP 종료 후: 마지막 pending이 남아있으면 confirmed로 승격 ──
         if pending_logic is not None:
             self.confirmed_logic.append(pending_logic)
@@ -1657,42 +4345,87 @@ class ProvenFactSystem:
         print(f"  FINAL VALIDATION")
         print(f"{'=' * 70}\n")
 
+        stage_boundaries = stage_scheduler.boundaries   # PERF-17 : 실제 사용된 경계
         hallucination_summary = {
             "total": len(all_hallucinations),
             "by_severity": {
                 sev: len([h for h in all_hallucinations if h.get('severity') == sev])
                 for sev in ('critical', 'high', 'medium', 'low')
             },
-            "rate": len(all_hallucinations) / max(1, total_sessions * max_turns_per_session)
+            "rate": len(all_hallucinations) / max(1, sessions_run * max_turns_per_session)
         }
 
-        final_audit = self.validator.audit_simulation(
-            all_records=self.recorder.records,
-            hallucination_summary=hallucination_summary
-        )
+        try:
+            final_audit = self.validator.audit_simulation(
+                all_records=self.recorder.records,
+                hallucination_summary=hallucination_summary
+            )
+        except APICallError as e:
+            print(f"  ⛔ Final audit failed: {e}")
+            final_audit = {
+                "audit_report": None,
+                "timestamp": datetime.now().isoformat(),
+                "hallucination_summary": hallucination_summary,
+                "error": e.to_dict()
+            }
 
-        sft_data = self.recorder.generate_sft_data()
+        sft_data = self.recorder.generate_sft_data()     # 호환용 (results["sft_data"])
+        sft_manifest = self.recorder.sft_writer.close()  # PERF-10
+        self.recorder.sft_writer = None
 
         results = {
             "metadata": {
                 "topic": topic,
                 "proven_fact": proven_fact,
-                "total_sessions": total_sessions,
+                "total_sessions": sessions_run,          # PERF-17 : 실제 실행된 세션 수
+                "session_budget": total_sessions,
                 "num_professors": self.num_professors,
                 "num_referees": self.num_referees,
                 "timestamp": datetime.now().isoformat(),
                 "api_provider": self.api_provider,
+                "api_base_url": self.base_url,           # PERF-06
+                "execution_mode": self.execution_mode,   # PERF-07
+                "coalesce": self.coalesce,               # PERF-08
+                "model_routing": self.model_routing,     # PERF-04
+                "referee_panel": [                       # PERF-05
+                    {"name": r.name, "provider": r.provider,
+                     "model": r.routing['referee']['model']}
+                    for r in self.referees
+                ],
                 "version": "1.3.0"
             },
             "fixed_constants": self.fixed_constants,
             "stage_boundaries": stage_boundaries,
+            "stage_schedule": stage_scheduler.report(),   # PERF-17
+            "turn_control": turn_controller.report(),     # PERF-18
+            "evidence_index": {                           # PERF-21
+                "top_k": self.evidence_top_k,
+                "stage_sizes": [len(items) for items in evidence_stages],
+            },
+            "student_question_stats": dict(self.student.question_stats),   # PERF-22
+            "defense_stats": dict(self.defense_stats),                     # PERF-23
+            "conflict_stats": dict(self.conflict_stats,                    # PERF-24
+                                   threshold=self.claim_aligner.threshold),
+            "claim_cache": {                              # PERF-25
+                referee.name: dict(referee.claim_cache.stats, entries=len(referee.claim_cache))
+                for referee in self.referees if referee.claim_cache is not None
+            },
+            "prompt_stats": {                             # PERF-19
+                agent.name: {**agent.prompt_stats,
+                             "budget": agent.routing[agent.ROUTE].get("prompt_budget")}
+                for agent in self.professors + [self.student] + self.referees
+            },
             "confirmed_logic": self.confirmed_logic,
             "pending_logic": pending_logic,   # C-02: 현재 스테이진 논리 (None 또는 Dict)
             "all_records": self.recorder.records,
             "hallucinations": all_hallucinations,
             "hallucination_summary": hallucination_summary,
+            "failed_turns": failed_turns,          # PERF-03
+            "batch_stats": [d.stats for d in self.batch_dispatchers.values()],   # PERF-07
+            "coalesce_stats": dict(get_request_coalescer().stats),             # PERF-08
             "final_audit": final_audit,
-            "sft_data": sft_data
+            "sft_data": sft_data,
+            "sft_manifest": sft_manifest           # PERF-10
         }
 
         # --- Save ---
@@ -1704,11 +4437,6 @@ class ProvenFactSystem:
         with open(output_file, 'w', encoding='utf-8') as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
 
-        sft_file = output_file.replace('.json', '.jsonl')
-        with open(sft_file, 'w', encoding='utf-8') as f:
-            for item in sft_data:
-                f.write(json.dumps(item, ensure_ascii=False) + '\n')
-
         print(f"\n{'=' * 70}")
         print(f"  SIMULATION COMPLETE")
         print(f"{'=' * 70}")
@@ -1716,8 +4444,11 @@ class ProvenFactSystem:
               f"(rate {hallucination_summary['rate']:.2%})")
         print(f"  SFT examples     : {len(sft_data)}")
         print(f"  Confirmed Logic  : {len(self.confirmed_logic)} nodes")
+        if failed_turns:
+            print(f"  Failed turns     : {len(failed_turns)} (see results['failed_turns'])")
         print(f"  Results          : {output_file}")
-        print(f"  SFT data         : {sft_file}")
+        print(f"  SFT data         : {sft_file}  ({sft_manifest['counts']['written']} written, "
+              f"{len(sft_manifest['shards'])} shard(s), see .manifest.json)")
         print(f"{'=' * 70}\n")
 
         return results
@@ -1729,14 +4460,25 @@ class ProvenFactSystem:
 def main():
     import argparse
 
+    require_api_client_library()
     parser = argparse.ArgumentParser(description='Run Proven Fact-Based Algorithm v1.4.0')
-    parser.add_argument('--api', choices=['anthropic', 'openai'], default='anthropic')
+    parser.add_argument('--api', choices=['anthropic', 'openai', 'openai_compatible'],
+                        default='anthropic')
+    parser.add_argument('--model', type=str, default=None)
+    parser.add_argument('--base-url', type=str, default=None)
     parser.add_argument('--sessions', type=int, default=12)
-    parser.add_argument('--referees', type=int, choices=[2, 3], default=2)
+    parser.add_argument('--referees', type=int, default=2)
     parser.add_argument('--verbose', action='store_true')
+    parser.add_argument('--route', action='append', default=[], metavar='ROLE.FIELD=VALUE')
+    parser.add_argument('--execution-mode', choices=['sync', 'batch'], default='sync')
+    parser.add_argument('--coalesce', choices=list(COALESCE_MODES), default='deterministic')
     args = parser.parse_args()
 
-    system = ProvenFactSystem(api_provider=args.api, num_referees=args.referees)
+    system = ProvenFactSystem(api_provider=args.api, num_referees=args.referees,
+                              model_routing=parse_route_overrides(args.route),
+                              model=args.model, base_url=args.base_url,
+                              execution_mode=args.execution_mode,
+                              coalesce=args.coalesce)
 
     example_config = {
         "proven_fact": "The Earth is approximately spherical with a circumference of 40,075 km at the equator.",
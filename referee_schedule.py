@@ -0,0 +1,134 @@
+"""
+Referee reset scheduling for the Proven Fact-Based Algorithm
+
+LICENSE:
+BY-NC (Personal use allowed. Commercial use prohibited. Attribution required.)
+Copyright (c) 2026 [Cheongwon Choi]
+
+PERF-16 : N명 심판용 일반화 reset 스케줄 (proven_fact_system / analyze_proven_fact 공용).
+          API 클라이언트 의존성이 없으므로 분석기에서도 그대로 import 할 수 있다.
+
+SCHEDULE (v1.1.0 주기의 일반화):
+  주기 p = 2N + 1
+  Referee 1      : s ≡ 0        (mod p)  →  pn
+  Referee i (≥2) : s ≡ 2(N-i+1) (mod p)  →  pn - (p - 2(N-i+1))
+
+  N=2 (p=5) : 5n, 5n-3              → 5,10,15… / 2,7,12…
+  N=3 (p=7) : 7n, 7n-3, 7n-5        → 7,14,21… / 4,11,18… / 2,9,16…
+  N=4 (p=9) : 9n, 9n-3, 9n-5, 9n-7  → 9,18,27… / 6,15,24… / 4,13,22… / 2,11,20…
+
+Guarantees:
+  • Zero simultaneous resets (심판마다 나머지가 모두 다름: 0, 2, 4, …, 2(N-1) < p)
+  • First reset at session 2 (마지막 심판)
+  • 길이 제한 없음 – 멤버십 / 개수 계산은 O(1), 나열은 lazy
+"""
+
+from itertools import count, islice
+from typing import Iterator, List, Optional, Union
+
+
+class RefereeResetSchedule:
+    """
+    Reset sessions of one referee: {s ≥ 1 | s ≡ residue (mod period)}, optionally ≤ max_sessions.
+
+    `session in schedule` 은 O(1). iter()는 lazy (max_sessions=None이면 무한).
+    schedule[:6] 처럼 slice로 앞부분 목록을 얻을 수 있다. 음수 index는 max_sessions가
+    있을 때만 (끝이 없는 스케줄은 ValueError).
+    """
+
+    def __init__(self, period: int, residue: int, max_sessions: Optional[int] = None):
+        self.period = period
+        self.residue = residue % period
+        self.max_sessions = max_sessions
+
+    @property
+    def first(self) -> int:
+        return self.residue or self.period
+
+    def __contains__(self, session) -> bool:
+        return (isinstance(session, int) and session >= 1
+                and (self.max_sessions is None or session <= self.max_sessions)
+                and session % self.period == self.residue)
+
+    def __iter__(self) -> Iterator[int]:
+        sessions = count(self.first, self.period)
+        if self.max_sessions is None:
+            return sessions
+        return iter(range(self.first, self.max_sessions + 1, self.period))
+
+    def __getitem__(self, index: Union[int, slice]):
+        if self.max_sessions is not None:
+            # 유한 스케줄은 range 산술 – 음수 index / slice도 O(1)
+            sessions = range(self.first, self.max_sessions + 1, self.period)
+            if isinstance(index, slice):
+                return list(sessions[index])
+            try:
+                return sessions[index]
+            except IndexError:
+                raise IndexError("reset schedule index out of range") from None
+        if isinstance(index, slice):
+            if index.stop is None:
+                raise ValueError("Unbounded schedule – slice needs a stop")
+            return list(islice(iter(self), index.start, index.stop, index.step))
+        if index < 0:
+            raise ValueError("Unbounded schedule – negative index has no end to count from")
+        return self.first + index * self.period
+
+    def count_until(self, total_sessions: int) -> int:
+        """1 … total_sessions 사이의 reset 횟수 (O(1))."""
+        if self.max_sessions is not None:
+            total_sessions = min(total_sessions, self.max_sessions)
+        if total_sessions < self.first:
+            return 0
+        return (total_sessions - self.first) // self.period + 1
+
+    @property
+    def label(self) -> str:
+        offset = self.period - self.residue if self.residue else 0
+        formula = f"{self.period}n" + (f"-{offset}" if offset else "")
+        return f"{formula} ({','.join(str(s) for s in self[:3])}…)"
+
+    def __repr__(self) -> str:
+        return f"RefereeResetSchedule({self.label}, max_sessions={self.max_sessions})"
+
+
+class RefereeResetScheduler:
+    """
+    Non-overlapping reset schedules for any number (≥ 2) of referees.
+
+    scheduler[i]          → i번째 심판의 RefereeResetSchedule
+    scheduler.resets_at(s) → 세션 s에 reset 하는 심판 인덱스 (최대 1명, O(1))
+    """
+
+    def __init__(self, num_referees: int, max_sessions: Optional[int] = None):
+        if num_referees < 2:
+            raise ValueError(f"At least 2 referees are required, got {num_referees}")
+        self.num_referees = num_referees
+        self.period = 2 * num_referees + 1
+        self.max_sessions = max_sessions
+        self.residues = [0] + [2 * (num_referees - i) for i in range(1, num_referees)]
+        self.schedules = [RefereeResetSchedule(self.period, r, max_sessions)
+                          for r in self.residues]
+        self._by_residue = {r: i for i, r in enumerate(self.residues)}
+
+    def __len__(self) -> int:
+        return self.num_referees
+
+    def __getitem__(self, index: int) -> RefereeResetSchedule:
+        return self.schedules[index]
+
+    def __iter__(self) -> Iterator[RefereeResetSchedule]:
+        return iter(self.schedules)
+
+    def resets_at(self, session: int) -> List[int]:
+        idx = self._by_residue.get(session % self.period)
+        if idx is None or session not in self.schedules[idx]:
+            return []
+        return [idx]
+
+    def reset_counts(self, total_sessions: int) -> List[int]:
+        return [s.count_until(total_sessions) for s in self.schedules]
+
+    @property
+    def labels(self) -> List[str]:
+        return [s.label for s in self.schedules]
@@ -13,6 +13,19 @@ Date: 2026-02-03
 Changes from v1.1.0:
   BUG-A : 심판 주기 설명 텍스트를 v1.1.0 실제 주기(5n/5n-3, 7n/7n-3/7n-5)로 수정
   SUGGEST-04 : tiktoken 설치 안내 추가
+  PERF-01 : --rule-engine (결정론적 상수 / 어휘 검사, opt-in)
+  PERF-04 : config "model_routing" + --route ROLE.FIELD=VALUE 역할별 모델 라우팅
+  PERF-05 : config "referee_panel" + --referee-provider PROVIDER[:MODEL] 혼합 심판 패널
+  PERF-06 : --api openai_compatible (--base-url / --model / --pool-size / --keepalive)
+  PERF-07 : --execution-mode batch (--batch-linger / --batch-poll / --batch-size)
+  PERF-08 : --coalesce off|deterministic|all
+  PERF-10 : --sft-shard-size / --sft-shard-bytes / --sft-dedup / --sft-hallucinations / --sft-max-severity
+  PERF-16 : --referees N (N ≥ 2, reset 주기 2N+1)
+  PERF-17 : --stage-schedule fixed|adaptive (--stage-min / --stage-max / --stage-clean / --stage-require-acceptance)
+  PERF-18 : --turn-control fixed|adaptive (--turn-novelty / --turn-extra / --turn-patience)
+  PERF-21 : evidence_stages 파일 참조 ({"file": …}, config 기준 상대 경로) + --evidence-top-k
+  PERF-24 : --claim-match-threshold (심판 finding claim 정렬 기준)
+  PERF-25 : --claim-cache (심판별 claim 판정 캐시, 새 문장만 검증)
 """
 
 import argparse
@@ -20,7 +33,8 @@ from datetime import datetime
 import sys
 import os
 import json
-from proven_fact_system import ProvenFactSystem
+from proven_fact_system import (ProvenFactSystem, parse_route_overrides, require_api_client_library,
+                                 resolve_evidence_paths)
 
 
 # ---------------------------------------------------------------------------
@@ -165,6 +179,67 @@ SIMULATION_TEMPLATES = {
 }
 
 
+# ---------------------------------------------------------------------------
+# PERF-04 : 모델 라우팅 병합 (config → CLI 순으로 override)
+# ---------------------------------------------------------------------------
+def merge_model_routing(config: dict, cli_routes=None) -> dict:
+    routing = {role: dict(cfg) for role, cfg in config.get('model_routing', {}).items()}
+    for role, cfg in parse_route_overrides(cli_routes or []).items():
+        routing.setdefault(role, {}).update(cfg)
+    return routing
+
+
+# PERF-17 : --stage-* → ProvenFactSystem(stage_schedule=…)
+def stage_schedule_options(args) -> dict:
+    return {
+        "mode": args.stage_schedule,
+        "min_sessions": args.stage_min,
+        "max_sessions": args.stage_max,
+        "clean_sessions": args.stage_clean,
+        "require_acceptance": args.stage_require_acceptance,
+    }
+
+
+# PERF-21 : evidence_stages의 {"file": …} 참조를 config 파일 위치 기준으로 해석
+def load_config_evidence(config: dict, config_path: str) -> dict:
+    if 'evidence_stages' in config:
+        config['evidence_stages'] = resolve_evidence_paths(
+            config['evidence_stages'], os.path.dirname(os.path.abspath(config_path)))
+    return config
+
+
+# PERF-18 : --turn-* → ProvenFactSystem(turn_control=…)
+def turn_control_options(args) -> dict:
+    return {
+        "mode": args.turn_control,
+        "novelty_threshold": args.turn_novelty,
+        "max_extra_turns": args.turn_extra,
+        "patience": args.turn_patience,
+    }
+
+
+# PERF-05 : --referee-provider PROVIDER[:MODEL] → referee_panel 항목
+def parse_referee_panel(config: dict, cli_specs=None):
+    if cli_specs:
+        panel = []
+        for spec in cli_specs:
+            provider, _, model = spec.partition(':')
+            entry = {"provider": provider.strip()}
+            if model.strip():
+                entry["model"] = model.strip()
+            panel.append(entry)
+        return panel
+    return config.get('referee_panel')
+
+
+def positive_int(value: str) -> int:
+    """argparse type: 1 이상의 정수 (--evidence-top-k 등)"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 # ---------------------------------------------------------------------------
 # Interactive Mode
 # ---------------------------------------------------------------------------
@@ -173,7 +248,7 @@ def interactive_mode():
     Interactive mode with sequential question process:
     Step 1  : Choose proven fact (topic)
     Step 2  : Enter number of discussion sessions
-    Step 2.5: Choose number of referees (2 or 3)
+    Step 2.5: Choose number of referees (2 or more)
     Step 3  : Choose display mode
     """
     print("\n" + "=" * 70)
@@ -217,6 +292,7 @@ def interactive_mode():
                 try:
                     with open(config_path, 'r', encoding='utf-8') as f:
                         config = json.load(f)
+                    load_config_evidence(config, config_path)
                     output_default = config_path.replace('.json', '_results.json')
                     print(f"✓ Loaded custom config from {config_path}")
                     break
@@ -269,25 +345,26 @@ def interactive_mode():
     # STEP 2.5 : 심판 수 (BUG-A 수정 – 올바른 주기 표시)
     # ============================================================
     print("\n" + "=" * 70)
-    print("STEP 2.5: Number of referees (2 or 3)")
+    print("STEP 2.5: Number of referees (2 or more)")
     print("=" * 70)
     print("\n  Referees verify factual accuracy and detect hallucinations.")
     print("  • 2 referees: Reset schedule 5n / 5n-3  (sessions 5,10,15… / 2,7,12…)")
     print("  • 3 referees: Reset schedule 7n / 7n-3 / 7n-5  (7,14… / 4,11… / 2,9…)")
+    print("  • N referees: Reset period 2N+1  (pn, pn-3, pn-5, …)")
     print("  • Zero simultaneous resets guaranteed.")
     print("\n  Recommended: 2 referees for most cases")
 
     while True:
-        ref_input = input("\n  Enter number of referees (2 or 3, default: 2): ").strip()
+        ref_input = input("\n  Enter number of referees (2 or more, default: 2): ").strip()
         if not ref_input:
             num_referees = 2
             break
         try:
             num_referees = int(ref_input)
-            if num_referees in [2, 3]:
+            if num_referees >= 2:
                 break
             else:
-                print("  Please enter 2 or 3.")
+                print("  Please enter 2 or more.")
         except ValueError:
             print("  Please enter a valid number.")
 
@@ -331,9 +408,11 @@ def interactive_mode():
     print("=" * 70)
     print("\n  1. Anthropic (Claude) – Recommended")
     print("  2. OpenAI (GPT-4)")
+    print("  3. OpenAI-compatible endpoint (self-hosted vLLM / llama.cpp)")
 
+    base_url, model = config.get('base_url'), config.get('model')
     while True:
-        api_choice = input("\n  Choose API provider (1 or 2, default: 1): ").strip()
+        api_choice = input("\n  Choose API provider (1-3, default: 1): ").strip()
         if not api_choice:
             api_provider = "anthropic"
             break
@@ -345,8 +424,15 @@ def interactive_mode():
             elif api_num == 2:
                 api_provider = "openai"
                 break
+            elif api_num == 3:
+                api_provider = "openai_compatible"
+                base_url = input(f"  Base URL (default: {base_url or 'http://localhost:8000/v1'}): "
+                                 ).strip() or base_url or "http://localhost:8000/v1"
+                while not model:
+                    model = input("  Model name served by the endpoint: ").strip()
+                break
             else:
-                print("  Please enter 1 or 2.")
+                print("  Please enter 1, 2 or 3.")
         except ValueError:
             print("  Please enter a valid number.")
 
@@ -365,7 +451,8 @@ def interactive_mode():
     print(f"  Sessions   : {total_sessions} (across {num_stages} evidence stages)")
     print(f"  Referees   : {num_referees}")
     print(f"  Display    : {'Full' if verbose else 'Briefing only'}")
-    print(f"  API        : {api_provider.title()}")
+    print(f"  API        : {api_provider.title()}"
+          + (f" ({base_url}, {model})" if api_provider == "openai_compatible" else ""))
     print(f"  Output     : {output_file}")
     print("=" * 70)
 
@@ -393,7 +480,11 @@ def interactive_mode():
     try:
         system = ProvenFactSystem(
             api_provider=api_provider,
-            num_referees=num_referees
+            num_referees=num_referees,
+            model_routing=merge_model_routing(config),
+            referee_panel=parse_referee_panel(config),
+            model=model,
+            base_url=base_url
         )
         results = system.run_learning_simulation(
             proven_fact=config['proven_fact'],
@@ -430,6 +521,7 @@ def command_line_mode(args):
         try:
             with open(args.config, 'r', encoding='utf-8') as f:
                 config = json.load(f)
+            load_config_evidence(config, args.config)
         except FileNotFoundError:
             print(f"  ❌ Config file not found: {args.config}")
             sys.exit(1)
@@ -464,10 +556,41 @@ def command_line_mode(args):
         print(f"  📁 Created directory: {output_dir}")
 
     # ── 3. 시뮬레이션 실행 ─────────────────────────────────────────────
-    system = ProvenFactSystem(
-        api_provider=args.api,
-        num_referees=args.referees
-    )
+    try:
+        model_routing = merge_model_routing(config, args.route)
+        system = ProvenFactSystem(
+            api_provider=args.api,
+            num_referees=args.referees,
+            model_routing=model_routing,
+            referee_panel=parse_referee_panel(config, args.referee_provider),
+            model=args.model or config.get('model'),
+            base_url=args.base_url or config.get('base_url'),
+            pool_size=args.pool_size,
+            keepalive_sec=args.keepalive,
+            execution_mode=args.execution_mode,
+            batch_options={
+                "linger_sec": args.batch_linger,
+                "poll_interval_sec": args.batch_poll,
+                "max_batch_size": args.batch_size,
+            },
+            coalesce=args.coalesce,
+            enable_rule_engine=args.rule_engine,
+            sft_export={
+                "max_records": args.sft_shard_size,
+                "max_bytes": args.sft_shard_bytes,
+                "dedup": args.sft_dedup,
+                "hallucinations": args.sft_hallucinations,
+                "max_severity": args.sft_max_severity,
+            },
+            stage_schedule=stage_schedule_options(args),
+            turn_control=turn_control_options(args),
+            evidence_top_k=args.evidence_top_k,
+            claim_match_threshold=args.claim_match_threshold,
+            claim_cache=args.claim_cache
+        )
+    except ValueError as e:
+        print(f"  ❌ {e}")
+        sys.exit(1)
     results = system.run_learning_simulation(
         proven_fact=config['proven_fact'],
         topic=config['topic'],
@@ -497,6 +620,22 @@ Examples:
 
   # Custom config file
   python run_proven_fact.py --config my_topic.json --sessions 15 --referees 3 --verbose
+
+  # Cheaper / faster models on high-volume roles
+  python run_proven_fact.py --template vaccines \
+      --route referee.model=claude-3-5-haiku-latest --route referee.max_tokens=1024 \
+      --route student.model=claude-3-5-haiku-latest
+
+  # Mixed-provider referee panel (one Anthropic + one OpenAI referee)
+  python run_proven_fact.py --template evolution \
+      --referee-provider anthropic --referee-provider openai:gpt-4o-mini
+
+  # Self-hosted OpenAI-compatible server (vLLM, llama.cpp, …) – no API key needed
+  python run_proven_fact.py --template earth_rotation --api openai_compatible \
+      --base-url http://localhost:8000/v1 --model Qwen/Qwen2.5-72B-Instruct
+
+  # Offline dataset generation through the provider Batch API
+  python run_proven_fact.py --template vaccines --sessions 20 --execution-mode batch
         """
     )
     parser.add_argument('--config', type=str,
@@ -506,17 +645,91 @@ Examples:
                         help='Use predefined template')
     parser.add_argument('--sessions', type=int, default=12,
                         help='Number of discussion sessions (default: 12)')
-    parser.add_argument('--referees', type=int, choices=[2, 3], default=2,
-                        help='Number of referees (2 or 3, default: 2)')
+    parser.add_argument('--referees', type=int, default=2,
+                        help='Number of referees (>= 2, default: 2; reset period 2N+1)')
     parser.add_argument('--api', type=str,
-                        choices=['anthropic', 'openai'], default='anthropic',
+                        choices=['anthropic', 'openai', 'openai_compatible'], default='anthropic',
                         help='API provider (default: anthropic)')
+    parser.add_argument('--model', type=str,
+                        help='Default model for all roles (required for openai_compatible)')
+    parser.add_argument('--base-url', type=str,
+                        help='Base URL of an OpenAI-compatible endpoint, e.g. http://localhost:8000/v1 '
+                             '(default: $OPENAI_COMPATIBLE_BASE_URL)')
+    parser.add_argument('--pool-size', type=int, default=32,
+                        help='HTTP connection pool size for openai_compatible (default: 32)')
+    parser.add_argument('--keepalive', type=float, default=60.0,
+                        help='Keep-alive expiry in seconds for openai_compatible (default: 60)')
+    parser.add_argument('--execution-mode', choices=['sync', 'batch'], default='sync',
+                        help='sync: regular API calls (default). batch: submit independent calls '
+                             'of each phase through the provider Batch API (cheaper, slower)')
+    parser.add_argument('--batch-linger', type=float, default=2.0,
+                        help='Seconds to wait for more requests before submitting a batch (default: 2)')
+    parser.add_argument('--batch-poll', type=float, default=30.0,
+                        help='Batch status polling interval in seconds (default: 30)')
+    parser.add_argument('--batch-size', type=int, default=1000,
+                        help='Maximum requests per batch (default: 1000)')
+    parser.add_argument('--rule-engine', action='store_true',
+                        help='Also run the local rule engine (fixed constants / era vocabulary); '
+                             'its findings count as hallucinations')
+    parser.add_argument('--coalesce', choices=['off', 'deterministic', 'all'],
+                        default='deterministic',
+                        help='Share one in-flight API call among identical concurrent requests. '
+                             'deterministic: temperature 0 only (default), all: every request')
+    parser.add_argument('--sft-shard-size', type=int, default=0,
+                        help='Split SFT JSONL into shards of N examples (default: single file)')
+    parser.add_argument('--sft-shard-bytes', type=int, default=0,
+                        help='Split SFT JSONL into shards of at most N bytes (default: no limit)')
+    parser.add_argument('--sft-dedup', action='store_true',
+                        help='Drop near-identical SFT examples (normalized prompt/completion hash)')
+    parser.add_argument('--sft-hallucinations', choices=['keep', 'exclude', 'only'], default='keep',
+                        help='Filter SFT examples on has_hallucinations (default: keep)')
+    parser.add_argument('--sft-max-severity', choices=['low', 'medium', 'high', 'critical'],
+                        help='Drop SFT examples with a more severe hallucination than this')
+    parser.add_argument('--stage-schedule', choices=['fixed', 'adaptive'], default='fixed',
+                        help='fixed: split sessions evenly across evidence stages (default), '
+                             'adaptive: advance when the current stage has converged')
+    parser.add_argument('--stage-min', type=int, default=2,
+                        help='Adaptive: minimum sessions per stage (default: 2)')
+    parser.add_argument('--stage-max', type=int, default=None,
+                        help='Adaptive: maximum sessions per stage (default: 2x even share)')
+    parser.add_argument('--stage-clean', type=int, default=2,
+                        help='Adaptive: consecutive clean sessions needed to advance (default: 2)')
+    parser.add_argument('--stage-require-acceptance', action='store_true',
+                        help='Adaptive: also require an explicit student acceptance')
+    parser.add_argument('--turn-control', choices=['fixed', 'adaptive'], default='fixed',
+                        help='fixed: run conflicts up to max turns (default), adaptive: end '
+                             'sessions early on acceptance / low novelty, extend productive ones')
+    parser.add_argument('--turn-novelty', type=float, default=0.2,
+                        help='Adaptive: end the session below this student novelty (default: 0.2)')
+    parser.add_argument('--turn-extra', type=int, default=2,
+                        help='Adaptive: extra turns allowed for productive conflicts (default: 2)')
+    parser.add_argument('--turn-patience', type=int, default=2,
+                        help='Adaptive: unproductive conflict turns before ending (default: 2)')
+    parser.add_argument('--evidence-top-k', type=positive_int, default=10,
+                        help='Evidence items given to professors per question; larger stages '
+                             'are searched with a per-stage BM25 index (default: 10)')
+    parser.add_argument('--claim-match-threshold', type=float, default=0.8,
+                        help='Word overlap at which two referee findings count as the same '
+                             'claim when detecting conflicts (default: 0.8)')
+    parser.add_argument('--claim-cache', action='store_true',
+                        help='Cache referee verdicts per claim for the run and send only '
+                             'unseen professor statements to verification')
     parser.add_argument('--output', type=str,
                         help='Output filename (default: auto-generated)')
     parser.add_argument('--verbose', action='store_true',
                         help='Show full output (default: briefing only)')
+    parser.add_argument('--route', action='append', default=[], metavar='ROLE.FIELD=VALUE',
+                        help='Per-role model routing override, repeatable. '
+                             'ROLE: professor|student|referee|defense|validator, '
+                             'FIELD: model|max_tokens|timeout|temperature '
+                             '(overrides "model_routing" in the config file)')
+    parser.add_argument('--referee-provider', action='append', default=[],
+                        metavar='PROVIDER[:MODEL]',
+                        help='Referee panel member, repeatable (one per referee). '
+                             'Overrides --referees and "referee_panel" in the config file')
 
     args = parser.parse_args()
+    require_api_client_library()
 
     if len(sys.argv) == 1:
         interactive_mode()
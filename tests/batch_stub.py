@@ -0,0 +1,186 @@
+"""
+Local stand-in for the provider batch endpoints used by BatchDispatcher (PERF-07).
+
+StubBatchServer는 배치를 메모리에 보관하고, BatchDispatcher가 쓰는 SDK 표면만 흉내 낸다.
+  anthropic_client() : messages.create / messages.batches.create · retrieve · results
+  openai_client()    : chat.completions.create / files.create · content / batches.create · retrieve
+
+• 각 요청의 응답은 respond(params)가 만든다.
+    str 반환            → 성공 (응답 텍스트)
+    StubItemError raise → 해당 요청만 실패
+    None 반환           → 결과 누락 (provider가 결과를 돌려주지 않은 경우)
+• 배치는 retrieve()가 polls번 호출된 뒤 종료된다.
+• fail_batches=True 이면 OpenAI 배치 자체가 "failed"로 끝난다 (결과 파일 없음).
+• batch_sizes / sync_requests 로 어떤 호출이 배치 / sync로 나갔는지 확인한다.
+"""
+
+import json
+import threading
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+
+
+class StubItemError(Exception):
+    """respond()에서 raise하면 해당 요청이 provider 에러로 끝난다."""
+
+    def __init__(self, error_type: str, message: str = "", status_code: int = 400):
+        super().__init__(message or error_type)
+        self.error_type = error_type
+        self.message = message
+        self.status_code = status_code
+
+
+class StubBatchServer:
+
+    def __init__(self, respond: Callable[[Dict], Optional[str]], polls: int = 1):
+        self.respond = respond
+        self.polls = polls
+        self.fail_batches = False
+
+        self.batch_sizes: List[int] = []
+        self.batch_requests: List[List[Dict]] = []
+        self.sync_requests: List[Dict] = []
+        self.uploads: List[bytes] = []
+
+        self._lock = threading.Lock()
+        self._batches: Dict[str, Dict] = {}
+        self._files: Dict[str, str] = {}
+
+    # ------------------------------------------------------------------
+    def _new_batch(self, requests: List[Dict]) -> str:
+        with self._lock:
+            batch_id = f"batch-{len(self._batches) + 1}"
+            self._batches[batch_id] = {"requests": requests, "polls": 0}
+            self.batch_sizes.append(len(requests))
+            self.batch_requests.append(requests)
+        return batch_id
+
+    def _poll(self, batch_id: str) -> bool:
+        with self._lock:
+            state = self._batches[batch_id]
+            state["polls"] += 1
+            return state["polls"] >= self.polls
+
+    def _answer(self, params: Dict):
+        """(text, error) – text가 None이고 error도 None이면 결과 누락"""
+        try:
+            return self.respond(params), None
+        except StubItemError as e:
+            return None, e
+
+    def _new_file(self, content: str) -> str:
+        with self._lock:
+            file_id = f"file-{len(self._files) + 1}"
+            self._files[file_id] = content
+        return file_id
+
+    # ------------------------------------------------------------------
+    # Anthropic Message Batches API
+    # ------------------------------------------------------------------
+    def anthropic_client(self):
+        def create(**params):
+            params.pop("timeout", None)
+            with self._lock:
+                self.sync_requests.append(params)
+            text, error = self._answer(params)
+            if error is not None:
+                raise error
+            return SimpleNamespace(content=[SimpleNamespace(text=text)])
+
+        def batch_create(requests):
+            batch_id = self._new_batch(list(requests))
+            return SimpleNamespace(id=batch_id, processing_status="in_progress")
+
+        def batch_retrieve(batch_id):
+            status = "ended" if self._poll(batch_id) else "in_progress"
+            return SimpleNamespace(id=batch_id, processing_status=status)
+
+        def batch_results(batch_id):
+            for request in self._batches[batch_id]["requests"]:
+                text, error = self._answer(request["params"])
+                if error is not None and error.error_type in ("expired", "canceled"):
+                    result = SimpleNamespace(type=error.error_type)
+                elif error is not None:
+                    result = SimpleNamespace(type="errored", error=SimpleNamespace(
+                        type="error",
+                        error=SimpleNamespace(type=error.error_type, message=error.message),
+                    ))
+                elif text is None:
+                    continue
+                else:
+                    result = SimpleNamespace(type="succeeded", message=SimpleNamespace(
+                        content=[SimpleNamespace(text=text)]))
+                yield SimpleNamespace(custom_id=request["custom_id"], result=result)
+
+        batches = SimpleNamespace(create=batch_create, retrieve=batch_retrieve,
+                                  results=batch_results)
+        return SimpleNamespace(messages=SimpleNamespace(create=create, batches=batches))
+
+    # ------------------------------------------------------------------
+    # OpenAI Files + Batches API (/v1/chat/completions)
+    # ------------------------------------------------------------------
+    def openai_client(self):
+        def completion_create(**params):
+            params.pop("timeout", None)
+            with self._lock:
+                self.sync_requests.append(params)
+            text, error = self._answer(params)
+            if error is not None:
+                raise error
+            return SimpleNamespace(choices=[SimpleNamespace(
+                message=SimpleNamespace(content=text))])
+
+        def file_create(file, purpose):
+            _, content = file
+            with self._lock:
+                self.uploads.append(content)
+            return SimpleNamespace(id=self._new_file(content.decode("utf-8")),
+                                   purpose=purpose)
+
+        def file_content(file_id):
+            return SimpleNamespace(text=self._files[file_id])
+
+        def batch_create(input_file_id, endpoint, completion_window):
+            lines = self._files[input_file_id].splitlines()
+            batch_id = self._new_batch([json.loads(line) for line in lines if line.strip()])
+            return self._openai_batch(batch_id, "in_progress")
+
+        def batch_retrieve(batch_id):
+            if not self._poll(batch_id):
+                return self._openai_batch(batch_id, "in_progress")
+            if self.fail_batches:
+                return self._openai_batch(batch_id, "failed")
+            output, errors = [], []
+            for request in self._batches[batch_id]["requests"]:
+                text, error = self._answer(request["body"])
+                if error is not None:
+                    errors.append(json.dumps({
+                        "custom_id": request["custom_id"],
+                        "response": {"status_code": error.status_code, "body": {"error": {
+                            "type": error.error_type, "message": error.message}}},
+                        "error": None,
+                    }))
+                elif text is not None:
+                    output.append(json.dumps({
+                        "custom_id": request["custom_id"],
+                        "response": {"status_code": 200, "body": {
+                            "choices": [{"message": {"role": "assistant", "content": text}}]}},
+                        "error": None,
+                    }))
+            return self._openai_batch(
+                batch_id, "completed",
+                output_file_id=self._new_file("\n".join(output)) if output else None,
+                error_file_id=self._new_file("\n".join(errors)) if errors else None,
+            )
+
+        return SimpleNamespace(
+            chat=SimpleNamespace(completions=SimpleNamespace(create=completion_create)),
+            files=SimpleNamespace(create=file_create, content=file_content),
+            batches=SimpleNamespace(create=batch_create, retrieve=batch_retrieve),
+        )
+
+    @staticmethod
+    def _openai_batch(batch_id: str, status: str, output_file_id: Optional[str] = None,
+                      error_file_id: Optional[str] = None):
+        return SimpleNamespace(id=batch_id, status=status, output_file_id=output_file_id,
+                               error_file_id=error_file_id)
@@ -0,0 +1,202 @@
+"""
+PERF-07 BatchDispatcher tests against the local stand-in batch server (tests/batch_stub.py).
+
+    python -m unittest discover -s tests
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import proven_fact_system as pfs        # SDK 없이 import 가능 (stand-in 서버만 사용)
+from batch_stub import StubBatchServer, StubItemError
+
+
+def echo(params):
+    return "echo:" + params["messages"][-1]["content"]
+
+
+def submit_all(dispatcher, prompts):
+    """prompt마다 스레드 하나로 동시에 submit → [(result, exception), ...]"""
+    with ThreadPoolExecutor(max_workers=len(prompts)) as pool:
+        futures = [pool.submit(dispatcher.submit,
+                               {"messages": [{"role": "user", "content": p}]})
+                   for p in prompts]
+    return [(f.result() if f.exception() is None else None, f.exception())
+            for f in futures]
+
+
+def quiet():
+    return contextlib.redirect_stdout(io.StringIO())
+
+
+class AnthropicBatchTest(unittest.TestCase):
+
+    def dispatcher(self, server, **options):
+        options = dict({"linger_sec": 0.2, "poll_interval_sec": 0.01}, **options)
+        return pfs.BatchDispatcher(server.anthropic_client(), "anthropic", **options)
+
+    def test_concurrent_submits_form_one_batch(self):
+        server = StubBatchServer(echo, polls=3)
+        dispatcher = self.dispatcher(server)
+        with quiet():
+            outcomes = submit_all(dispatcher, ["a", "b", "c"])
+
+        self.assertEqual(server.batch_sizes, [3])
+        self.assertEqual([result for result, _ in outcomes],
+                         [{"text": "echo:a"}, {"text": "echo:b"}, {"text": "echo:c"}])
+        self.assertEqual(dispatcher.stats, {"batches": 1, "requests": 3, "errored": 0})
+        custom_ids = [r["custom_id"] for r in server.batch_requests[0]]
+        self.assertEqual(len(set(custom_ids)), 3)
+
+    def test_max_batch_size_splits_batches(self):
+        server = StubBatchServer(echo)
+        dispatcher = self.dispatcher(server, max_batch_size=2)
+        with quiet():
+            outcomes = submit_all(dispatcher, ["a", "b", "c"])
+
+        self.assertEqual(sorted(server.batch_sizes), [1, 2])
+        self.assertTrue(all(error is None for _, error in outcomes))
+
+    def test_errored_item_is_classified(self):
+        def respond(params):
+            if params["messages"][-1]["content"] == "bad":
+                raise StubItemError("rate_limit_error", "slow down")
+            return echo(params)
+
+        server = StubBatchServer(respond)
+        dispatcher = self.dispatcher(server)
+        with quiet():
+            (ok, ok_error), (_, error) = submit_all(dispatcher, ["good", "bad"])
+
+        self.assertIsNone(ok_error)
+        self.assertEqual(ok, {"text": "echo:good"})
+        self.assertIsInstance(error, pfs.BatchItemError)
+        self.assertEqual(error.error_type, "rate_limit_error")
+        self.assertEqual(pfs.classify_api_error(error), "rate_limit")
+        self.assertEqual(dispatcher.stats["errored"], 1)
+
+    def test_expired_and_missing_results(self):
+        def respond(params):
+            content = params["messages"][-1]["content"]
+            if content == "expired":
+                raise StubItemError("expired")
+            if content == "missing":
+                return None
+            return echo(params)
+
+        server = StubBatchServer(respond)
+        dispatcher = self.dispatcher(server)
+        with quiet():
+            outcomes = submit_all(dispatcher, ["expired", "missing"])
+
+        for _, error in outcomes:
+            self.assertIsInstance(error, pfs.BatchItemError)
+            self.assertEqual(error.error_type, "expired")
+            self.assertEqual(pfs.classify_api_error(error), "server")   # 재시도 대상
+
+
+class OpenAIBatchTest(unittest.TestCase):
+
+    def dispatcher(self, server):
+        return pfs.BatchDispatcher(server.openai_client(), "openai",
+                                   linger_sec=0.2, poll_interval_sec=0.01)
+
+    def test_upload_and_result_mapping(self):
+        server = StubBatchServer(echo, polls=2)
+        dispatcher = self.dispatcher(server)
+        with quiet():
+            outcomes = submit_all(dispatcher, ["x", "y"])
+
+        self.assertEqual(server.batch_sizes, [2])
+        lines = [json.loads(line) for line in server.uploads[0].decode("utf-8").splitlines()]
+        self.assertEqual({line["url"] for line in lines}, {"/v1/chat/completions"})
+        self.assertEqual({line["method"] for line in lines}, {"POST"})
+        self.assertEqual([line["body"]["messages"][-1]["content"] for line in lines],
+                         ["x", "y"])
+        self.assertEqual([result for result, _ in outcomes],
+                         [{"text": "echo:x"}, {"text": "echo:y"}])
+
+    def test_error_file_keeps_status_code(self):
+        def respond(params):
+            if params["messages"][-1]["content"] == "bad":
+                raise StubItemError("invalid_request_error", "bad input", status_code=400)
+            return echo(params)
+
+        server = StubBatchServer(respond)
+        dispatcher = self.dispatcher(server)
+        with quiet():
+            (ok, _), (_, error) = submit_all(dispatcher, ["good", "bad"])
+
+        self.assertEqual(ok, {"text": "echo:good"})
+        self.assertIsInstance(error, pfs.BatchItemError)
+        self.assertEqual(error.status_code, 400)
+        self.assertEqual(pfs.classify_api_error(error), "invalid_request")
+
+    def test_failed_batch_fails_every_item(self):
+        server = StubBatchServer(echo)
+        server.fail_batches = True
+        dispatcher = self.dispatcher(server)
+        with quiet():
+            outcomes = submit_all(dispatcher, ["a", "b"])
+
+        for _, error in outcomes:
+            self.assertIsInstance(error, pfs.BatchItemError)
+            self.assertEqual(error.error_type, "failed")
+        self.assertEqual(dispatcher.stats["errored"], 2)
+
+
+class BatchRoutingTest(unittest.TestCase):
+
+    DEFENSE = json.dumps({"acknowledges_error": False, "defense": "d",
+                          "sources": ["a", "b", "c"], "corrected_statement": ""})
+
+    def test_only_phase_calls_are_batched(self):
+        server = StubBatchServer(lambda params: self.DEFENSE)
+        client = server.openai_client()
+        professor = pfs.ProfessorAgent("Prof. A", "Physics", client,
+                                       routing=pfs.build_model_routing("openai"))
+        professor.batch_dispatcher = pfs.BatchDispatcher(
+            client, "openai", linger_sec=0.01, poll_interval_sec=0.01)
+
+        with quiet():
+            professor.defend_against_referee("statement", "reasoning", {})
+            self.assertEqual(server.batch_sizes, [])
+            self.assertEqual(len(server.sync_requests), 1)
+
+            professor.teach("Why is the Earth round?")
+        self.assertEqual(server.batch_sizes, [1])
+        self.assertEqual(len(server.sync_requests), 1)
+
+    def test_simulations_share_dispatchers(self):
+        provider = "openai"
+        shared = {}
+        servers = [StubBatchServer(echo) for _ in range(2)]
+        with quiet(), mock.patch.object(pfs, "build_api_client",
+                                        side_effect=[s.openai_client() for s in servers]):
+            systems = [pfs.ProvenFactSystem(api_provider=provider, api_key="test-key",
+                                            execution_mode="batch",
+                                            batch_dispatchers=shared)
+                       for _ in range(2)]
+            for system in systems:
+                system._create_personas("topic", "proven fact")
+
+        self.assertEqual(list(shared), [provider])
+        first, second = systems
+        self.assertIs(first.professors[0].batch_dispatcher, second.referees[0].batch_dispatcher)
+        self.assertIs(first.professors[0].batch_dispatcher, shared[provider])
+        for system in systems:
+            self.assertIsNone(system.student.batch_dispatcher)
+            self.assertIsNone(system.validator.batch_dispatcher)
+            self.assertIsNone(system.recorder.batch_dispatcher)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+PERF-24 ClaimAligner: referee findings are grouped per claim without transitive chaining.
+
+    python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import proven_fact_system as pfs
+
+ROTATION = "Earth rotates once every 24 hours around its axis"
+ORBIT = "Earth orbits the Sun once every 365 days around its star"
+SHORT = "Earth once every around"
+
+
+class ClaimAlignerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.aligner = pfs.ClaimAligner(threshold=0.8)
+
+    def test_partial_quote_merges(self):
+        groups = self.aligner.group([(0, ROTATION), (0, "Earth rotates once every 24 hours"),
+                                     (1, ROTATION)])
+        self.assertEqual(groups, [[0, 1], [2]])
+
+    def test_short_quote_does_not_chain_claims(self):
+        feats = [self.aligner.features(t) for t in (SHORT, ROTATION, ORBIT)]
+        self.assertGreaterEqual(self.aligner.similarity(feats[0], feats[1]), 0.8)
+        self.assertGreaterEqual(self.aligner.similarity(feats[0], feats[2]), 0.8)
+        self.assertLess(self.aligner.similarity(feats[1], feats[2]), 0.8)
+
+        for claims in ([(0, ROTATION), (0, SHORT), (0, ORBIT)],
+                       [(0, SHORT), (0, ROTATION), (0, ORBIT)]):
+            groups = self.aligner.group(claims)
+            texts = [{claims[i][1] for i in members} for members in groups]
+            self.assertFalse(any({ROTATION, ORBIT} <= t for t in texts), texts)
+
+    def test_different_numbers_stay_apart(self):
+        groups = self.aligner.group([(0, "Gravity accelerates objects at 9.8 m/s2 near the surface"),
+                                     (0, "Gravity accelerates objects at 9.81 m/s2 near the surface")])
+        self.assertEqual(len(groups), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
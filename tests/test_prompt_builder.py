@@ -0,0 +1,53 @@
+"""
+PERF-19 PromptBuilder: professor blocks are trimmed evenly and never dropped.
+
+    python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import proven_fact_system as pfs
+
+BLOCKS = [f"Professor {i + 1}:\nClaim {i + 1} holds because of the shadow angles. "
+          + "Further detail about the measurement. " * 40
+          for i in range(4)]
+
+
+def build(budget, required_words):
+    builder = pfs.PromptBuilder(budget)
+    builder.text("question", "word " * required_words)
+    builder.blocks("professors_explanation", BLOCKS, header="PROFESSORS' EXPLANATIONS:")
+    return builder.build(), builder.stats
+
+
+class PromptBuilderTest(unittest.TestCase):
+
+    def test_blocks_trimmed_evenly(self):
+        prompt, stats = build(budget=800, required_words=50)
+        self.assertEqual(stats["sections"]["professors_explanation"], "trimmed")
+        self.assertFalse(stats["over_budget"])
+        for i in range(4):
+            self.assertIn(f"Professor {i + 1}:\nClaim {i + 1} holds", prompt)
+
+    def test_exhausted_budget_keeps_block_floor(self):
+        prompt, stats = build(budget=100, required_words=400)
+        self.assertEqual(stats["sections"]["professors_explanation"], "floor")
+        self.assertEqual(stats["floored_blocks"], {"professors_explanation": 4})
+        self.assertTrue(stats["over_budget"])
+        for i in range(4):
+            self.assertIn(f"Professor {i + 1}:\nClaim {i + 1} holds because of the shadow "
+                          f"angles. [… truncated]", prompt)
+
+    def test_block_floor(self):
+        self.assertEqual(pfs.PromptBuilder._block_floor("Professor 1:\nOne. Two."),
+                         "Professor 1:\nOne. [… truncated]")
+        self.assertEqual(pfs.PromptBuilder._block_floor("Only one sentence."),
+                         "Only one sentence.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+"""
+PERF-16 referee reset schedules: O(1) indexing on bounded and unbounded schedules.
+
+    python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from referee_schedule import RefereeResetSchedule, RefereeResetScheduler
+
+
+class RefereeResetScheduleTest(unittest.TestCase):
+
+    def test_bounded_indexing(self):
+        schedule = RefereeResetSchedule(5, 2, max_sessions=20)
+        self.assertEqual(list(schedule), [2, 7, 12, 17])
+        self.assertEqual([schedule[i] for i in range(-4, 4)], [2, 7, 12, 17] * 2)
+        self.assertEqual(schedule[-2:], [12, 17])
+        for index in (4, -5):
+            with self.assertRaises(IndexError):
+                schedule[index]
+
+    def test_large_bounded_negative_index_is_arithmetic(self):
+        schedule = RefereeResetSchedule(9, 4, max_sessions=10 ** 15)
+        self.assertEqual(schedule[-1], 10 ** 15 - (10 ** 15 - 4) % 9)
+
+    def test_unbounded_indexing(self):
+        schedule = RefereeResetSchedule(5, 0)
+        self.assertEqual(schedule[3], 20)
+        self.assertEqual(schedule[:3], [5, 10, 15])
+        with self.assertRaises(ValueError):
+            schedule[-1]
+        with self.assertRaises(ValueError):
+            schedule[2:]
+
+    def test_scheduler_has_no_simultaneous_resets(self):
+        scheduler = RefereeResetScheduler(4)
+        for session in range(1, 200):
+            self.assertLessEqual(len(scheduler.resets_at(session)), 1)
+        self.assertEqual(scheduler.resets_at(2), [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
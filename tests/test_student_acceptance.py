@@ -0,0 +1,58 @@
+"""
+PERF-17 / PERF-18 acceptance detection: the student's error-correction wording must not
+count as accepting the proven fact.
+
+    python -m unittest discover -s tests
+"""
+
+import contextlib
+import io
+import os
+import re
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import proven_fact_system as pfs
+from batch_stub import StubBatchServer
+
+QUESTIONS = "1. Why do ships vanish hull-first?\n2. How was the shadow angle measured?"
+
+
+def error_correction_phrase() -> str:
+    """ask_question이 previous_errors와 함께 보내는 프롬프트에서 예시 문구를 꺼낸다."""
+    server = StubBatchServer(lambda params: QUESTIONS)
+    student = pfs.StudentAgent("Alex", server.openai_client(),
+                               routing=pfs.build_model_routing("openai"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        student.ask_question("Professor 1:\nShips vanish hull-first.",
+                             previous_errors=["The horizon is a wall"])
+    prompt = server.sync_requests[0]["messages"][-1]["content"]
+    return re.search(r'Use phrases like: "([^"]+)"', prompt).group(1)
+
+
+class AcceptanceTest(unittest.TestCase):
+
+    def test_error_correction_is_not_acceptance(self):
+        phrase = error_correction_phrase()
+        response = phrase.replace("…", " the horizon is a wall. ") + "\n" + QUESTIONS
+        self.assertFalse(pfs.StudentAgent.shows_acceptance(response))
+        self.assertFalse(pfs.StudentAgent.shows_acceptance(
+            "I was wrong about the wall. " + QUESTIONS))
+
+        controller = pfs.TurnController(max_turns=3, mode="adaptive")
+        controller.start_session(1)
+        self.assertIsNone(controller.after_conflict(1, response, novelty=1.0,
+                                                    resolved=[{"statement": "new finding"}]))
+
+    def test_explicit_acceptance(self):
+        for text in ("I am now convinced by the shadow measurements.",
+                     "I have no remaining doubts.",
+                     "I accept the evidence."):
+            self.assertTrue(pfs.StudentAgent.shows_acceptance(text), text)
+        self.assertFalse(pfs.StudentAgent.shows_acceptance("I'm not convinced yet."))
+
+
+if __name__ == "__main__":
+    unittest.main()